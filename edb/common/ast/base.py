@@ -21,9 +21,11 @@ from __future__ import annotations
 
 import copy
 import collections.abc
+import enum
 import functools
 import re
 import sys
+import uuid
 from typing import *
 
 import typing_inspect
@@ -177,6 +179,12 @@ class MetaAST(type):
                         field_child_traverse, field_hidden, field_meta)
 
         cls._fields = fields
+        # The traversal plan for visitors: non-meta fields that may
+        # hold AST nodes (directly or in a container).
+        cls._child_fields = tuple(
+            field for field in fields.values()
+            if not field.meta and _may_contain_ast(field.type)
+        )
 
     def get_field(cls, name):
         return cls._fields.get(name)
@@ -312,6 +320,44 @@ def iter_fields(node, *, include_meta=True, exclude_unset=False):
         yield field_name, field_val
 
 
+def iter_child_fields(node):
+    """Iterate over (field, value) of *node* fields that may hold nodes.
+
+    This is a faster version of iter_fields(node, include_meta=False)
+    that skips fields which are declared to hold scalars only (see
+    _may_contain_ast()).
+    """
+    for field in node._child_fields:
+        field_val = getattr(node, field.name, _marker)
+        if field_val is not _marker:
+            yield field, field_val
+
+
+# Values of these types (and their subclasses) are never AST nodes.
+_LEAF_TYPES = (str, bytes, int, float, enum.Enum, uuid.UUID, type(None))
+
+
+def _may_contain_ast(type_):
+    if type_ is None:
+        # Untyped field.
+        return True
+
+    if (typing_inspect.is_union_type(type_)
+            or typing_inspect.is_tuple_type(type_)
+            or typing_inspect.is_generic_type(type_)):
+        args = typing_inspect.get_args(type_, evaluate=True)
+        if not args:
+            return True
+        return any(
+            arg is not Ellipsis and _may_contain_ast(arg) for arg in args
+        )
+
+    if isinstance(type_, type):
+        return not issubclass(type_, _LEAF_TYPES)
+
+    return True
+
+
 def _is_optional(type_):
     return (typing_inspect.is_union_type(type_) and
             type(None) in typing_inspect.get_args(type_, evaluate=True))
@@ -60,16 +60,14 @@ class NodeTransformer(visitor.NodeVisitor):
     """
 
     def generic_visit(self, node):
-        for field, old_value in base.iter_fields(node, include_meta=False):
-            old_value = getattr(node, field, None)
-
+        for field, old_value in base.iter_child_fields(node):
             if typeutils.is_container(old_value):
                 new_values = old_value.__class__(self.visit(old_value))
-                setattr(node, field, old_value.__class__(new_values))
+                setattr(node, field.name, old_value.__class__(new_values))
 
             elif isinstance(old_value, base.AST):
                 new_node = self.visit(old_value)
                 if new_node is not old_value:
-                    setattr(node, field, new_node)
+                    setattr(node, field.name, new_node)
 
         return node
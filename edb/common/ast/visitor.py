@@ -40,9 +40,7 @@ def find_children(node, test_func, *args, force_traversal=False,
         else:
             visited.add(node)
 
-        for field, value in base.iter_fields(node, include_meta=False):
-            field_spec = node._fields[field]
-
+        for field_spec, value in base.iter_child_fields(node):
             if isinstance(value, (list, set, frozenset)):
                 for n in value:
                     if not base.is_ast_node(n):
@@ -167,7 +165,7 @@ class NodeVisitor:
     def generic_visit(self, node, *, combine_results=None):
         field_results = []
 
-        for _field, value in base.iter_fields(node, include_meta=False):
+        for _field, value in base.iter_child_fields(node):
             if typeutils.is_container(value):
                 for item in value:
                     if base.is_ast_node(item):
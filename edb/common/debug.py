@@ -126,6 +126,10 @@ class flags(metaclass=FlagsMeta):
     migrations_via_ddl = Flag(
         doc="Always use generated DDL when running migrations.")
 
+    sampling_profiler = Flag(
+        doc="Run the sampling profiler in the server and compiler workers "
+            "from startup. Send SIGUSR2 to the server to toggle it.")
+
 
 @contextlib.contextmanager
 def timeit(title='block'):
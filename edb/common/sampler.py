@@ -0,0 +1,137 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2020-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""A low-overhead statistical profiler for long-running processes.
+
+Unlike `profile()`, the sampler does not instrument every function call.
+Instead, a SIGPROF timer periodically interrupts the process and the
+current Python stack is recorded.  Stacks are written out in the
+"collapsed" format understood by `edb perfviz --suffix=.collapsed` (and
+by most third-party flame graph tools).
+
+See edb/tools/profiling/README.md for more details.
+"""
+
+from __future__ import annotations
+from typing import *
+
+import collections
+import os
+import pathlib
+import signal
+import tempfile
+import types
+
+
+PREFIX = "edgedb_"
+COLLAPSED_SUFFIX = ".collapsed"
+SAMPLING_INTERVAL = 0.005  # in seconds of CPU time
+
+
+if TYPE_CHECKING:
+    # (path, first line number, function name)
+    Frame = Tuple[str, int, str]
+    Stack = Tuple[Frame, ...]
+
+
+_samples: Counter[Stack] = collections.Counter()
+_running = False
+_prev_handler: Any = None
+
+
+def _sample(signum: int, frame: Optional[types.FrameType]) -> None:
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+        frame = frame.f_back
+    if stack:
+        stack.reverse()
+        _samples[tuple(stack)] += 1
+
+
+def is_running() -> bool:
+    return _running
+
+
+def start(*, interval: float = SAMPLING_INTERVAL) -> None:
+    """Start sampling the current process every `interval` seconds.
+
+    The timer measures CPU time consumed by the process, so an idle
+    process is not sampled at all.  Must be called from the main thread.
+    """
+    global _running, _prev_handler
+
+    if _running:
+        return
+
+    _prev_handler = signal.signal(signal.SIGPROF, _sample)
+    # Make sure system calls interrupted by the timer are restarted.
+    signal.siginterrupt(signal.SIGPROF, False)
+    signal.setitimer(signal.ITIMER_PROF, interval, interval)
+    _running = True
+
+
+def stop(
+    *,
+    dir: Optional[Union[pathlib.Path, str]] = None,
+    prefix: str = PREFIX,
+) -> Optional[str]:
+    """Stop sampling and write the collected stacks to a new file.
+
+    The file is created in `dir` (the temporary directory by default).
+    Returns the path to the file or None if nothing was collected.
+    """
+    global _running, _prev_handler
+
+    if not _running:
+        return None
+
+    signal.setitimer(signal.ITIMER_PROF, 0, 0)
+    signal.signal(signal.SIGPROF, _prev_handler or signal.SIG_DFL)
+    _prev_handler = None
+    _running = False
+
+    samples = dict(_samples)
+    _samples.clear()
+    if not samples:
+        return None
+
+    with tempfile.NamedTemporaryFile(
+        mode="w",
+        dir=dir,
+        prefix=f"{prefix}{os.getpid()}_",
+        suffix=COLLAPSED_SUFFIX,
+        delete=False,
+    ) as f:
+        for stack, count in samples.items():
+            frames = ";".join(
+                f"{path}:{lineno}:{name}" for path, lineno, name in stack
+            )
+            print(f"{frames} {count}", file=f)
+
+    return f.name
+
+
+def toggle() -> Optional[str]:
+    """Start sampling if it is stopped, otherwise stop and dump."""
+    if _running:
+        return stop()
+    else:
+        start()
+        return None
@@ -91,7 +91,6 @@ pub const UNRESERVED_KEYWORDS: &[&str] = &[
 
 pub const FUTURE_RESERVED_KEYWORDS: &[&str] = &[
     // Keep in sync with `tokenizer::is_keyword`
-    "analyze",
     "anyarray",
     "begin",
     "case",
@@ -101,7 +100,6 @@ pub const FUTURE_RESERVED_KEYWORDS: &[&str] = &[
     "do",
     "end",
     "execute",
-    "explain",
     "fetch",
     "get",
     "global",
@@ -134,6 +132,7 @@ pub const CURRENT_RESERVED_KEYWORDS: &[&str] = &[
     "__std__",
     "abort",
     "alter",
+    "analyze",
     "and",
     "anytuple",
     "anytype",
@@ -149,6 +148,7 @@ pub const CURRENT_RESERVED_KEYWORDS: &[&str] = &[
     "else",
     "empty",
     "exists",
+    "explain",
     "extending",
     "false",
     "filter",
@@ -811,6 +811,7 @@ pub fn is_keyword(s: &str) -> bool {
         | "__std__"
         | "abort"
         | "alter"
+        | "analyze"
         | "and"
         | "anytuple"
         | "anytype"
@@ -826,6 +827,7 @@ pub fn is_keyword(s: &str) -> bool {
         | "else"
         | "empty"
         | "exists"
+        | "explain"
         | "extending"
         | "false"
         | "filter"
@@ -861,7 +863,6 @@ pub fn is_keyword(s: &str) -> bool {
           // Keep in sync with keywords::CURRENT_RESERVED_KEYWORDS
         // # Future reserved keywords #
           // Keep in sync with keywords::FUTURE_RESERVED_KEYWORDS
-        | "analyze"
         | "anyarray"
         | "begin"
         | "case"
@@ -871,7 +872,6 @@ pub fn is_keyword(s: &str) -> bool {
         | "do"
         | "end"
         | "execute"
-        | "explain"
         | "fetch"
         | "get"
         | "global"
@@ -1077,6 +1077,16 @@ class DescribeStmt(Statement):
     options: Options
 
 
+#
+# Explain
+#
+
+class ExplainStmt(Statement):
+
+    query: Statement
+    analyze: bool = False
+
+
 #
 # SDL
 #
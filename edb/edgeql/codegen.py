@@ -122,6 +122,9 @@ class EdgeQLSourceGenerator(codegen.SourceGenerator):
         # function.
         return (
             node._parent is not None and (
+                # EXPLAIN takes a bare statement.
+                not isinstance(node._parent, qlast.ExplainStmt)
+            ) and (
                 not isinstance(node._parent, qlast.Base)
                 or not isinstance(node._parent, qlast.DDL)
                 or isinstance(node._parent, qlast.SetField)
@@ -1731,6 +1734,12 @@ class EdgeQLSourceGenerator(codegen.SourceGenerator):
             self.write(' ')
             self.visit(node.options)
 
+    def visit_ExplainStmt(self, node: qlast.ExplainStmt) -> None:
+        self.write('EXPLAIN ')
+        if node.analyze:
+            self.write('ANALYZE ')
+        self.visit(node.query)
+
     def visit_Options(self, node: qlast.Options) -> None:
         for i, opt in enumerate(node.options.values()):
             if i > 0:
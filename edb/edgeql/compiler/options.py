@@ -26,6 +26,7 @@ from typing import *
 from dataclasses import dataclass, field as dc_field
 
 if TYPE_CHECKING:
+    from edb.edgeql import ast as qlast
     from edb.schema import functions as s_func
     from edb.schema import objects as s_obj
     from edb.schema import name as s_name
@@ -66,6 +67,11 @@ class GlobalCompilerOptions:
     #: definitions.
     func_params: Optional[s_func.ParameterLikeList] = None
 
+    #: A mapping of schema-defined expression text (alias bodies,
+    #: computables) to its parsed AST.  May be shared between
+    #: compilations against the same database version.
+    schema_expr_cache: Optional[MutableMapping[str, qlast.Expr]] = None
+
 
 @dataclass
 class CompilerOptions(GlobalCompilerOptions):
@@ -24,11 +24,14 @@ from __future__ import annotations
 
 from typing import *
 
+import copy
+
 from edb import errors
 
 from edb.common import parsing
 
 from edb.schema import abc as s_abc
+from edb.schema import expr as s_expr
 from edb.schema import links as s_links
 from edb.schema import name as sn
 from edb.schema import objects as s_obj
@@ -41,6 +44,7 @@ from edb.schema import utils as s_utils
 
 from edb.edgeql import ast as qlast
 from edb.edgeql import qltypes
+from edb.edgeql import parser as qlparser
 
 from . import context
 from . import stmtctx
@@ -518,3 +522,27 @@ def is_type_compatible(
             )
 
     return compatible
+
+
+def get_schema_expr_ql(
+    expr: s_expr.Expression,
+    *,
+    ctx: context.ContextLevel,
+) -> qlast.Expr:
+    """Return a fresh EdgeQL AST for a schema-defined expression.
+
+    Parsed trees of alias bodies and computables are kept in
+    the ``schema_expr_cache`` compiler option (if provided), which
+    outlives a single compilation.  The compiler is free to annotate
+    the tree it gets, so the cached tree is never handed out directly.
+    """
+    cache = ctx.env.options.schema_expr_cache
+    if cache is None:
+        return cast(qlast.Expr, qlparser.parse(expr.text))
+
+    qltree = cache.get(expr.text)
+    if qltree is None:
+        qltree = cast(qlast.Expr, qlparser.parse(expr.text))
+        cache[expr.text] = qltree
+
+    return copy.deepcopy(qltree)
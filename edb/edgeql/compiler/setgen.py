@@ -1016,7 +1016,7 @@ def computable_ptr_set(
                 raise errors.InternalServerError(
                     f'{ptrcls_sn!r} is not a computable pointer')
 
-            schema_qlexpr = qlparser.parse(comp_expr.text)
+            schema_qlexpr = schemactx.get_schema_expr_ql(comp_expr, ctx=ctx)
 
         # NOTE: Validation of the expression type is not the concern
         # of this function. For any non-object pointer target type,
@@ -426,9 +426,14 @@ def trace_ConcreteConstraint(
 def trace_Index(
     node: qlast.CreateIndex, *, ctx: DepTraceContext
 ):
+    exprs = [node.expr]
+    predicate = qlast.get_ddl_field_value(node, 'predicate')
+    if predicate is not None:
+        exprs.append(predicate)
+
     _register_item(
         node,
-        hard_dep_exprs=[node.expr],
+        hard_dep_exprs=exprs,
         source=ctx.depstack[-1][1],
         subject=ctx.depstack[-1][1],
         ctx=ctx,
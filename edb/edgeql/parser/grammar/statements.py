@@ -41,6 +41,10 @@ class Stmt(Nonterm):
         # DESCRIBE
         self.val = kids[0].val
 
+    def reduce_ExplainStmt(self, *kids):
+        # EXPLAIN
+        self.val = kids[0].val
+
     def reduce_ExprStmt(self, *kids):
         self.val = kids[0].val
 
@@ -242,3 +246,14 @@ class DescribeStmt(Nonterm):
         self.val = qlast.DescribeCurrentMigration(
             language=lang,
         )
+
+
+class ExplainStmt(Nonterm):
+
+    def reduce_EXPLAIN_ExprStmt(self, *kids):
+        """%reduce EXPLAIN ExprStmt"""
+        self.val = qlast.ExplainStmt(query=kids[1].val)
+
+    def reduce_EXPLAIN_ANALYZE_ExprStmt(self, *kids):
+        """%reduce EXPLAIN ANALYZE ExprStmt"""
+        self.val = qlast.ExplainStmt(query=kids[2].val, analyze=True)
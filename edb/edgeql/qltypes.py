@@ -136,6 +136,14 @@ class Volatility(s_enum.StrEnum):
     VOLATILE = 'VOLATILE'
 
 
+class IndexKind(s_enum.StrEnum):
+    BTREE = 'BTREE'
+    HASH = 'HASH'
+    GIN = 'GIN'
+    GIST = 'GIST'
+    BRIN = 'BRIN'
+
+
 class DescribeLanguage(s_enum.StrEnum):
     DDL = 'DDL'
     SDL = 'SDL'
@@ -127,12 +127,17 @@ class Var(NamedTuple):
     val: Any
     defn: gql_ast.VariableDefinitionNode
     critical: bool
+    # Whether the variable is used as a pagination cursor, in which
+    # case the query depends on the kind of its value only (see
+    # get_cursor_cache_key()).
+    cursor: bool = False
 
 
 class Operation(NamedTuple):
     name: Any
     stmt: Any
     critvars: Dict[str, Any]
+    cursorvars: FrozenSet[str]
     vars: Dict[str, Any]
 
 
@@ -141,6 +146,7 @@ class TranspiledOperation(NamedTuple):
     edgeql_ast: qlast.Base
     cacheable: bool
     cache_deps_vars: Optional[FrozenSet[str]]
+    cache_deps_cursor_vars: Optional[FrozenSet[str]]
     variables_desc: dict
 
 
@@ -151,6 +157,14 @@ class Ordering(NamedTuple):
     nulls: qlast.NonesOrder
 
 
+class Cursor(NamedTuple):
+
+    # Values of the sort keys of the boundary row, followed by its id.
+    values: List[Any]
+    # The cursor as a JSON array expression.
+    expr: qlast.Expr
+
+
 class BookkeepDict(dict):
 
     def __init__(self, values):
@@ -324,6 +338,9 @@ class GraphQLTranslator:
         # of the query
         critvars = {name: var.val for name, var
                     in self._context.vars.items() if var.critical}
+        cursorvars = frozenset(
+            name for name, var in self._context.vars.items()
+            if var.cursor and not var.critical)
         # variables that were defined in this operation
         defvars = {name: var.val for name, var in self._context.vars.items()
                    if var.defn is not None}
@@ -332,6 +349,7 @@ class GraphQLTranslator:
             name=opname,
             stmt=stmt,
             critvars=critvars,
+            cursorvars=cursorvars,
             vars=defvars,
         )
 
@@ -436,8 +454,7 @@ class GraphQLTranslator:
                 variables[varname] = Var(val=val, defn=node, critical=False)
         else:
             # we have the variable, but we still need to update the defn field
-            variables[varname] = Var(
-                val=var.val, defn=node, critical=var.critical)
+            variables[varname] = var._replace(defn=node)
 
     def visit_SelectionSetNode(self, node):
         elements = []
@@ -767,11 +784,16 @@ class GraphQLTranslator:
             elif arg.name.value == 'before':
                 before = self._visit_pagination_arg(
                     arg, 'String',
-                    expected='a string castable to an int')
+                    expected='a string castable to an int or a cursor')
             elif arg.name.value == 'after':
                 after = self._visit_pagination_arg(
                     arg, 'String',
-                    expected='a string castable to an int')
+                    expected='a string castable to an int or a cursor')
+
+        if isinstance(after, Cursor) or isinstance(before, Cursor):
+            where, orderby = self._get_keyset_filter(
+                where, orderby, after, before)
+            after = before = None
 
         # convert before, after, first and last into offset and limit
         offset, limit = self.get_offset_limit(after, before, first, last)
@@ -786,6 +808,20 @@ class GraphQLTranslator:
         if isinstance(node.value, gql_ast.VariableNode):
             # variables will be type-checked by this point, so assume
             # the type is valid
+            if argtype == 'String':
+                # A String can be either an index or a cursor, which
+                # compile into different queries, so the kind of the
+                # value of the variable determines the shape of the query.
+                varname = node.value.name.value
+                var = self._context.vars[varname]
+                if not var.cursor:
+                    self._context.vars[varname] = var._replace(cursor=True)
+                if var.val is not None and not _is_int_str(var.val):
+                    # The cursor values are passed in the variable.
+                    return self._parse_cursor(
+                        node, var.val, expected,
+                        expr=self.visit(node.value))
+
             return self.visit(node.value)
 
         elif not isinstance(node.value, ARG_TYPES[argtype]):
@@ -797,12 +833,143 @@ class GraphQLTranslator:
         try:
             return int(node.value.value)
         except (TypeError, ValueError):
+            if argtype == 'String':
+                return self._parse_cursor(
+                    node, node.value.value, expected,
+                    expr=qlast.StringConstant.from_python(node.value.value))
             raise g_errors.GraphQLValidationError(
                 f"invalid value for {node.name.value!r}: "
                 f"expected {expected}, "
                 f"got {node.value.value!r}",
                 loc=self.get_loc(node.value)) from None
 
+    def _parse_cursor(self, node, value, expected, expr):
+        values = _parse_cursor_values(value)
+        if values is None:
+            raise g_errors.GraphQLValidationError(
+                f"invalid value for {node.name.value!r}: "
+                f"expected {expected}, "
+                f"got {value!r}",
+                loc=self.get_loc(node.value)) from None
+
+        return Cursor(
+            values=values,
+            expr=qlast.FunctionCall(func='to_json', args=[expr]),
+        )
+
+    def _get_keyset_filter(self, where, orderby, after, before):
+        if (after is not None and not isinstance(after, Cursor) or
+                before is not None and not isinstance(before, Cursor)):
+            raise g_errors.GraphQLValidationError(
+                f"cannot mix indices and cursors in 'after' and 'before'")
+
+        # The id is used as the tie-breaker to make the ordering total,
+        # so that a cursor unambiguously identifies the boundary.
+        orderby = list(orderby)
+        if not orderby or not self._is_id_sort(orderby[-1]):
+            orderby.append(qlast.SortExpr(
+                path=qlast.Path(
+                    steps=[qlast.Ptr(ptr=qlast.ObjectRef(name='id'))],
+                    partial=True,
+                ),
+                direction=qlast.SortAsc,
+            ))
+
+        for cursor, forward in [(after, True), (before, False)]:
+            if cursor is None:
+                continue
+
+            if len(cursor.values) != len(orderby):
+                raise g_errors.GraphQLValidationError(
+                    f"invalid cursor: expected {len(orderby)} values "
+                    f"(one per ordering field and the id), "
+                    f"got {len(cursor.values)}")
+
+            cond = self._get_keyset_cond(orderby, cursor, forward)
+            if where is None:
+                where = cond
+            else:
+                where = qlast.BinOp(left=where, op='AND', right=cond)
+
+        return where, orderby
+
+    def _is_id_sort(self, sortexpr):
+        steps = sortexpr.path.steps
+        return len(steps) == 1 and steps[0].ptr.name == 'id'
+
+    def _get_keyset_cond(self, orderby, cursor, forward):
+        # Objects strictly after (or before, if not *forward*) the
+        # boundary object in the given order:
+        #
+        #   k1 > v1 OR (k1 ?= v1 AND (k2 > v2 OR (k2 ?= v2 AND ...)))
+        #
+        # Every operand must be a non-empty set, as OR and AND are
+        # empty if either of their operands is.
+        cond = None
+        for i in reversed(range(len(orderby))):
+            sortexpr = orderby[i]
+            value = cursor.values[i]
+            past = self._get_keyset_past(sortexpr, cursor, i, forward)
+            if cond is None:
+                cond = past
+                continue
+
+            if value is None:
+                equal = qlast.UnaryOp(
+                    op='NOT',
+                    operand=qlast.UnaryOp(op='EXISTS', operand=sortexpr.path),
+                )
+            else:
+                equal = qlast.BinOp(
+                    left=sortexpr.path,
+                    op='?=',
+                    right=self._get_keyset_value(sortexpr, cursor, i),
+                )
+
+            cond = qlast.BinOp(
+                left=past,
+                op='OR',
+                right=qlast.BinOp(left=equal, op='AND', right=cond),
+            )
+
+        return cond
+
+    def _get_keyset_past(self, sortexpr, cursor, i, forward):
+        value = cursor.values[i]
+        ascending = sortexpr.direction is not qlast.SortDesc
+        # Whether empty values come after the boundary value.
+        nones_past = (sortexpr.nones_order is qlast.NonesLast) == forward
+
+        if value is None:
+            if nones_past:
+                return qlast.BooleanConstant(value='false')
+            else:
+                return qlast.UnaryOp(op='EXISTS', operand=sortexpr.path)
+
+        return qlast.BinOp(
+            left=qlast.BinOp(
+                left=sortexpr.path,
+                op='>' if ascending == forward else '<',
+                right=self._get_keyset_value(sortexpr, cursor, i),
+            ),
+            op='??',
+            right=qlast.BooleanConstant(
+                value='true' if nones_past else 'false'),
+        )
+
+    def _get_keyset_value(self, sortexpr, cursor, i):
+        # The cursor values are cast to the type of the corresponding
+        # ordering field.
+        return qlast.TypeCast(
+            type=qlast.TypeOf(expr=sortexpr.path),
+            expr=qlast.Indirection(
+                arg=cursor.expr,
+                indirection=[
+                    qlast.Index(index=qlast.IntegerConstant(value=str(i))),
+                ],
+            ),
+        )
+
     def get_offset_limit(self, after, before, first, last):
         # if all the parameters here are constants we can compute and
         # compile shorter and simpler OFFSET/LIMIT values
@@ -1761,6 +1928,7 @@ def translate_ast(
         edgeql_ast=op.stmt,
         cacheable=True,
         cache_deps_vars=frozenset(op.critvars) if op.critvars else None,
+        cache_deps_cursor_vars=op.cursorvars or None,
         variables_desc=op.vars,
     )
 
@@ -1797,3 +1965,46 @@ def convert_default(
         raise errors.QueryError(
             f"Only scalar defaults are allowed. "
             f"Variable {varname!r} has non-scalar default value.")
+
+
+def get_cursor_cache_key(value: Any) -> Any:
+    """Return the part of a pagination argument the query depends on.
+
+    An index and a cursor compile into different queries, and so do
+    cursors with a different number of values or with empty values in
+    different positions.  The rest is passed as a query parameter.
+    """
+    if value is None:
+        return None
+    elif _is_int_str(value):
+        return 'index'
+
+    values = _parse_cursor_values(value)
+    if values is None:
+        # Invalid value, compilation fails.
+        return value
+    else:
+        return tuple(v is None for v in values)
+
+
+def _parse_cursor_values(value: Any) -> Optional[List[Any]]:
+    # A cursor is a JSON array of the values of the "order" fields
+    # of the boundary object followed by its id.
+    try:
+        values = json.loads(value)
+    except (TypeError, ValueError):
+        return None
+
+    if not isinstance(values, list) or not values:
+        return None
+
+    return values
+
+
+def _is_int_str(value: Any) -> bool:
+    try:
+        int(value)
+    except (TypeError, ValueError):
+        return False
+    else:
+        return True
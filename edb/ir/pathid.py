@@ -698,6 +698,15 @@ class PathId:
         """The namespace of this ``PathId``"""
         return self._namespace
 
+    @property
+    def namespace_free_key(self) -> Hashable:
+        """A hashable key that ignores the namespace of this ``PathId``.
+
+        Path ids that are equal after stripping some or all of their
+        namespaces are guaranteed to have equal keys.
+        """
+        return (self._norm_path, self._is_ptr)
+
     def _get_prefix(self, size: int) -> PathId:
         if size < 0:
             size = len(self._path) + size
@@ -76,6 +76,12 @@ class ScopeTreeNode:
     children: Set[ScopeTreeNode]
     """A set of child nodes."""
 
+    path_children_index: Dict[Hashable, Set[ScopeTreeNodeWithPathId]]
+    """Child path nodes indexed by PathId.namespace_free_key.
+
+    Path ids of attached nodes may be changed in place, but only
+    by adding or stripping namespaces, which does not affect the key."""
+
     namespaces: Set[pathid.AnyNamespace]
     """A set of namespaces used by paths in this branch.
 
@@ -101,6 +107,7 @@ class ScopeTreeNode:
         self.factoring_allowlist = set()
         self.optional = False
         self.children = set()
+        self.path_children_index = {}
         self.namespaces = set()
         self._parent: Optional[weakref.ReferenceType[ScopeTreeNode]] = None
 
@@ -318,11 +325,11 @@ class ScopeTreeNode:
         performed.  For safe tree modification, use attach_subtree()""
         """
         if node.path_id is not None:
-            for child in self.children:
-                if child.path_id == node.path_id:
+            for existing in self._index_lookup(node.path_id):
+                if existing.path_id == node.path_id:
                     raise InvalidScopeConfiguration(
                         f'{node.path_id} is already present in {self!r}',
-                        existing_node=child,
+                        existing_node=existing,
                         offending_node=node,
                     )
 
@@ -680,17 +687,7 @@ class ScopeTreeNode:
         found = None
 
         for node, ans in self.ancestors_and_namespaces:
-            if (node.path_id is not None
-                    and _paths_equal(node.path_id, path_id, namespaces)):
-                found = node
-                break
-
-            for child in node.children:
-                if (child.path_id is not None
-                        and _paths_equal(child.path_id, path_id, namespaces)):
-                    found = child
-                    break
-
+            found = node._find_visible_at(path_id, namespaces)
             if found is not None:
                 break
 
@@ -714,6 +711,30 @@ class ScopeTreeNode:
 
         return found, finfo
 
+    def _find_visible_at(
+        self,
+        path_id: pathid.PathId,
+        namespaces: AbstractSet[pathid.AnyNamespace],
+    ) -> Optional[ScopeTreeNode]:
+        """Find *path_id* in this node or in its immediate children."""
+        if (self.path_id is not None
+                and _paths_equal(self.path_id, path_id, namespaces)):
+            return self
+
+        for child in self._index_lookup(path_id):
+            if _paths_equal(child.path_id, path_id, namespaces):
+                return child
+
+        return None
+
+    def _index_lookup(
+        self,
+        path_id: pathid.PathId,
+    ) -> AbstractSet[ScopeTreeNodeWithPathId]:
+        """Return the children that might match *path_id*."""
+        return self.path_children_index.get(
+            path_id.namespace_free_key, frozenset())
+
     def find_visible(self, path_id: pathid.PathId) -> Optional[ScopeTreeNode]:
         node, _ = self.find_visible_ex(path_id)
         return node
@@ -722,9 +743,17 @@ class ScopeTreeNode:
         return self.find_visible(path_id) is not None
 
     def is_any_prefix_visible(self, path_id: pathid.PathId) -> bool:
-        for prefix in reversed(list(path_id.iter_prefixes())):
-            if self.find_visible(prefix) is not None:
-                return True
+        prefixes = list(path_id.iter_prefixes())
+        namespaces: Set[pathid.AnyNamespace] = set()
+
+        # Walk the ancestors once rather than calling find_visible()
+        # for every prefix.
+        for node, ans in self.ancestors_and_namespaces:
+            for prefix in prefixes:
+                if node._find_visible_at(prefix, namespaces) is not None:
+                    return True
+
+            namespaces |= ans
 
         return False
 
@@ -735,9 +764,14 @@ class ScopeTreeNode:
         in_branches: bool = False,
         pfx_with_invariant_card: bool = False,
     ) -> Optional[ScopeTreeNode]:
+        for indexed in self._index_lookup(path_id):
+            if indexed.path_id == path_id:
+                return indexed
+
+        if not in_branches and not pfx_with_invariant_card:
+            return None
+
         for child in self.children:
-            if child.path_id == path_id:
-                return child
             if (
                 in_branches and child.path_id is None and not child.fenced
                 or (
@@ -862,13 +896,27 @@ class ScopeTreeNode:
         if parent is current_parent:
             return
 
+        key: Optional[Hashable] = None
+        if self.path_id is not None:
+            key = self.path_id.namespace_free_key
+        path_node = cast(ScopeTreeNodeWithPathId, self)
+
         if current_parent is not None:
             # Make sure no other node refers to us.
             current_parent.children.remove(self)
+            if key is not None:
+                index = current_parent.path_children_index
+                siblings = index[key]
+                siblings.remove(path_node)
+                if not siblings:
+                    del index[key]
 
         if parent is not None:
             self._parent = weakref.ref(parent)
             parent.children.add(self)
+            if key is not None:
+                parent.path_children_index.setdefault(key, set()).add(
+                    path_node)
         else:
             self._parent = None
 
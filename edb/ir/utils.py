@@ -61,6 +61,16 @@ def get_parameters(ir: irast.Base) -> Set[irast.Parameter]:
     return result
 
 
+def get_calls(
+    ir: irast.Base,
+) -> Set[Union[irast.Call, irast.TypeCast]]:
+    """Return all function and operator calls and casts found in *ir*."""
+    result: Set[Union[irast.Call, irast.TypeCast]] = set()
+    flt = lambda n: isinstance(n, (irast.Call, irast.TypeCast))
+    result.update(ast.find_children(ir, flt))
+    return result
+
+
 def is_const(ir: irast.Base) -> bool:
     """Return True if the given *ir* expression is constant."""
     flt = lambda n: isinstance(n, irast.Set) and n.expr is None
@@ -23,6 +23,7 @@ from typing import *
 
 from edb import errors
 
+from edb.common import ast
 from edb.common import debug
 from edb.common import exceptions as edgedb_error
 
@@ -118,6 +119,103 @@ def compile_ir_to_sql(
     argmap = qtree.argnames
 
     # Generate query text
+    sql_text = _generate_sql(qtree, pretty=pretty)
+
+    return sql_text, argmap
+
+
+def compile_ir_to_explain_sql(
+    ir_expr: irast.Base, *,
+    analyze: bool=False,
+    output_format: Optional[OutputFormat]=None,
+    expected_cardinality_one: bool=False,
+    pretty: bool=True
+) -> Tuple[str, Dict[str, pgast.Param], Dict[str, irast.PathId]]:
+    """Compile *ir_expr* into an EXPLAIN (FORMAT JSON) statement.
+
+    Besides the SQL text and the argument map, return a map of range
+    variable and CTE names to the path ids they were compiled from.
+    The names are what Postgres reports as "Alias" and "CTE Name" in
+    the nodes of the resulting plan.
+    """
+
+    qtree = compile_ir_to_sql_tree(
+        ir_expr,
+        output_format=output_format,
+        expected_cardinality_one=expected_cardinality_one)
+
+    if debug.flags.edgeql_compile:  # pragma: no cover
+        debug.header('SQL Tree')
+        debug.dump(qtree)
+
+    assert isinstance(qtree, pgast.Query), "expected instance of ast.Query"
+    argmap = qtree.argnames
+
+    options = ['FORMAT JSON']
+    if analyze:
+        options.extend(['ANALYZE', 'BUFFERS'])
+
+    sql_text = _generate_sql(qtree, pretty=pretty)
+    sql_text = f'EXPLAIN ({", ".join(options)}) {sql_text}'
+
+    collector = _RangeVarPathCollector()
+    collector.visit(qtree)
+
+    return sql_text, argmap, collector.paths
+
+
+class _RangeVarPathCollector(ast.NodeVisitor):
+    """Map range variable and CTE names to path ids.
+
+    Range variables over relations that don't represent a path
+    themselves (e.g. a table scanned inside a path subquery) are
+    attributed to the path of the nearest enclosing relation.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.paths: Dict[str, irast.PathId] = {}
+        self._path_id: Optional[irast.PathId] = None
+
+    def _visit_with_path(
+        self,
+        node: pgast.Base,
+        path_id: Optional[irast.PathId],
+    ) -> None:
+        outer_path_id = self._path_id
+        if path_id is not None:
+            self._path_id = path_id
+        try:
+            self.generic_visit(node)
+        finally:
+            self._path_id = outer_path_id
+
+    def _add(
+        self,
+        name: Optional[str],
+        path_id: Optional[irast.PathId],
+    ) -> None:
+        if name and path_id is not None:
+            self.paths.setdefault(name, path_id)
+
+    def visit_BaseRelation(self, node: pgast.BaseRelation) -> None:
+        self._visit_with_path(node, node.path_id)
+
+    def visit_CommonTableExpr(self, node: pgast.CommonTableExpr) -> None:
+        path_id = node.query.path_id or self._path_id
+        self._add(node.name, path_id)
+        self._visit_with_path(node, path_id)
+
+    def visit_BaseRangeVar(self, node: pgast.BaseRangeVar) -> None:
+        path_id = self._path_id
+        if isinstance(node, (pgast.RelRangeVar, pgast.RangeSubselect)):
+            path_id = node.query.path_id or path_id
+        if node.alias is not None:
+            self._add(node.alias.aliasname, path_id)
+        self.generic_visit(node)
+
+
+def _generate_sql(qtree: pgast.Base, *, pretty: bool=True) -> str:
     codegen = _run_codegen(qtree, pretty=pretty)
     sql_text = ''.join(codegen.result)
 
@@ -125,7 +223,7 @@ def compile_ir_to_sql(
         debug.header('SQL')
         debug.dump_code(sql_text, lexer='sql')
 
-    return sql_text, argmap
+    return sql_text
 
 
 def _run_codegen(
@@ -122,6 +122,11 @@ class CompilerContextLevel(compiler.ContextLevel):
     #: Paths, for which semi-join is banned in this context.
     disable_semi_join: Set[irast.PathId]
 
+    #: Whether multi shape elements may be aggregated for all objects
+    #: of the source type at once (see shapecomp), i.e. whether the
+    #: source set is expected to be large.
+    batch_multi_shapes: bool
+
     #: Paths, which need to be explicitly wrapped into SQL
     #: optionality scaffolding.
     force_optional: Set[irast.PathId]
@@ -197,6 +202,7 @@ class CompilerContextLevel(compiler.ContextLevel):
             self.group_by_rels = {}
 
             self.disable_semi_join = set()
+            self.batch_multi_shapes = False
             self.force_optional = set()
             self.join_target_type_filter = {}
 
@@ -226,6 +232,7 @@ class CompilerContextLevel(compiler.ContextLevel):
             self.group_by_rels = prevlevel.group_by_rels
 
             self.disable_semi_join = prevlevel.disable_semi_join.copy()
+            self.batch_multi_shapes = prevlevel.batch_multi_shapes
             self.force_optional = prevlevel.force_optional.copy()
             self.join_target_type_filter = prevlevel.join_target_type_filter
 
@@ -706,6 +706,23 @@ def rel_join(
             type=join_type, larg=larg, rarg=rarg, quals=condition)
 
 
+def rel_left_join(
+        query: pgast.SelectStmt, right_rvar: pgast.PathRangeVar, *,
+        quals: Optional[pgast.BaseExpr]=None,
+        ctx: context.CompilerContextLevel) -> None:
+    """LEFT JOIN *right_rvar* to the FROM clause of *query*.
+
+    If *quals* is not specified, the join condition is expected to be
+    expressed by the lateral references in *right_rvar* itself.
+    """
+    if quals is None:
+        quals = pgast.BooleanConstant(val='true')
+
+    larg = query.from_clause[0]
+    query.from_clause[0] = pgast.JoinExpr(
+        type='left', larg=larg, rarg=right_rvar, quals=quals)
+
+
 def range_for_material_objtype(
     typeref: irast.TypeRef,
     path_id: irast.PathId,
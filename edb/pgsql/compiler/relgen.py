@@ -271,6 +271,9 @@ def _get_set_rvar(
                 rvars = process_set_as_func_enumerate(ir_set, stmt, ctx=ctx)
             else:
                 rvars = process_set_as_enumerate(ir_set, stmt, ctx=ctx)
+        elif (ir_set.expr.func_shortname == 'std::approximate_count'
+                and _can_approximate_count(ir_set, ctx=ctx)):
+            rvars = process_set_as_approximate_count(ir_set, stmt, ctx=ctx)
         elif any(pm is qltypes.TypeModifier.SET_OF
                  for pm in ir_set.expr.params_typemods):
             # Call to an aggregate function.
@@ -371,18 +374,36 @@ def set_to_array(
     result = pgast.SelectStmt()
     relctx.include_rvar(result, subrvar, path_id=ir_set.path_id, ctx=ctx)
 
+    array_agg, pg_type = get_set_array_agg(ir_set, result, ctx=ctx)
+    agg_expr = coalesce_to_empty_array(array_agg, pg_type)
+
+    result.target_list = [
+        pgast.ResTarget(
+            val=agg_expr,
+            ser_safe=array_agg.ser_safe,
+        )
+    ]
+
+    return result
+
+
+def get_set_array_agg(
+        ir_set: irast.Set, rel: pgast.SelectStmt, *,
+        ctx: context.CompilerContextLevel,
+) -> Tuple[pgast.FuncCall, Tuple[str, ...]]:
+    """Return an array_agg() of *ir_set* in *rel* and its element type."""
     val: Optional[pgast.BaseExpr] = (
         pathctx.maybe_get_path_serialized_var(
-            result, ir_set.path_id, env=ctx.env)
+            rel, ir_set.path_id, env=ctx.env)
     )
 
     if val is None:
         value_var = pathctx.get_path_value_var(
-            result, ir_set.path_id, env=ctx.env)
+            rel, ir_set.path_id, env=ctx.env)
         val = output.serialize_expr(
             value_var, path_id=ir_set.path_id, env=ctx.env)
         pathctx.put_path_serialized_var(
-            result, ir_set.path_id, val, force=True, env=ctx.env)
+            rel, ir_set.path_id, val, force=True, env=ctx.env)
 
     pg_type = output.get_pg_type(ir_set.typeref, ctx=ctx)
     orig_val = val
@@ -406,27 +427,24 @@ def set_to_array(
         ser_safe=val.ser_safe,
     )
 
-    agg_expr = pgast.CoalesceExpr(
+    return array_agg, pg_type
+
+
+def coalesce_to_empty_array(
+        expr: pgast.BaseExpr,
+        pg_type: Tuple[str, ...]) -> pgast.CoalesceExpr:
+    return pgast.CoalesceExpr(
         args=[
-            array_agg,
+            expr,
             pgast.TypeCast(
                 arg=pgast.ArrayExpr(elements=[]),
                 type_name=pgast.TypeName(name=pg_type, array_bounds=[-1])
             )
         ],
-        ser_safe=array_agg.ser_safe,
+        ser_safe=expr.ser_safe,
         nullable=False,
     )
 
-    result.target_list = [
-        pgast.ResTarget(
-            val=agg_expr,
-            ser_safe=array_agg.ser_safe,
-        )
-    ]
-
-    return result
-
 
 def prepare_optional_rel(
         *, ir_set: irast.Set, stmt: pgast.SelectStmt,
@@ -2300,6 +2318,69 @@ def process_set_as_agg_expr(
     return new_stmt_set_rvar(ir_set, stmt, ctx=ctx)
 
 
+def _can_approximate_count(
+        ir_set: irast.Set, *,
+        ctx: context.CompilerContextLevel) -> bool:
+    expr = ir_set.expr
+    assert isinstance(expr, irast.FunctionCall)
+
+    ir_arg = expr.args[0].expr
+    arg = irutils.unwrap_set(ir_arg)
+
+    # Only a plain reference to an object type, i.e. the set of all
+    # of its objects, can be estimated from the table statistics.
+    if (arg.expr is not None or arg.rptr is not None
+            or not irtyputils.is_object(arg.typeref)
+            or arg.path_id.is_type_intersection_path()):
+        return False
+
+    typeref = arg.typeref
+    if typeref.material_type is not None:
+        typeref = typeref.material_type
+
+    if (typeref.union or typeref.intersection
+            or typeref.name_hint.module in {'cfg', 'sys'}
+            or relctx.get_type_rel_overlays(typeref, ctx=ctx)):
+        return False
+
+    # If the type is bound in an enclosing scope, the argument
+    # is a singleton and not the set of all objects.
+    path_scope = relctx.get_scope(ir_arg, ctx=ctx)
+    return (
+        path_scope is None
+        or path_scope.parent is None
+        or not path_scope.parent.is_any_prefix_visible(arg.path_id)
+    )
+
+
+def process_set_as_approximate_count(
+        ir_set: irast.Set, stmt: pgast.SelectStmt, *,
+        ctx: context.CompilerContextLevel) -> SetRVars:
+    expr = ir_set.expr
+    assert isinstance(expr, irast.FunctionCall)
+
+    typeref = irutils.unwrap_set(expr.args[0].expr).typeref
+    if typeref.material_type is not None:
+        typeref = typeref.material_type
+
+    inhview_name = common.get_objtype_backend_name(
+        typeref.id, typeref.module_id, aspect='inhview')
+
+    set_expr = pgast.FuncCall(
+        name=('edgedb', '_approximate_count'),
+        args=[
+            pgast.TypeCast(
+                arg=pgast.StringConstant(val=inhview_name),
+                type_name=pgast.TypeName(name=('regclass',)),
+            ),
+        ],
+        nullable=False,
+    )
+
+    pathctx.put_path_value_var(stmt, ir_set.path_id, set_expr, env=ctx.env)
+    return new_stmt_set_rvar(ir_set, stmt, ctx=ctx)
+
+
 def process_set_as_exists_expr(
         ir_set: irast.Set, stmt: pgast.SelectStmt, *,
         ctx: context.CompilerContextLevel) -> SetRVars:
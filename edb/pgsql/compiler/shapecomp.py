@@ -32,6 +32,8 @@ from . import astutils
 from . import context
 from . import dispatch
 from . import expr as expr_compiler  # NOQA
+from . import pathctx
+from . import relctx
 from . import relgen
 
 
@@ -62,13 +64,22 @@ def compile_shape(
                 for iterator in iterators:
                     shapectx.path_scope[iterator.path_id] = ctx.rel
 
+        # Only the shape of the top-level source is batched: the
+        # elements are compiled into subqueries, which are evaluated
+        # once per source object (or, if batched, for all of them).
+        batch = shapectx.batch_multi_shapes
+        shapectx.batch_multi_shapes = False
+
         for el in shape:
             rptr = el.rptr
             ptrref = rptr.ptrref
             is_singleton = ptrref.dir_cardinality.is_single()
             value: pgast.BaseExpr
 
-            if (irutils.is_subquery_set(el) or
+            if batch and not is_singleton and _can_batch_element(
+                    ir_set, el, ctx=shapectx):
+                value = _batch_element(ir_set, el, ctx=shapectx)
+            elif (irutils.is_subquery_set(el) or
                     el.path_id.is_objtype_path() or
                     not is_singleton or
                     not ptrref.required):
@@ -77,6 +88,14 @@ def compile_shape(
                 if not is_singleton:
                     value = relgen.set_to_array(
                         ir_set=el, query=wrapper, ctx=shapectx)
+                elif (not irutils.is_subquery_set(el)
+                        and _can_join_element(ctx.rel)):
+                    # A single link or an optional single property
+                    # yields at most one row per source, so instead
+                    # of a correlated subquery in the target list
+                    # compile it as a LEFT JOIN, which Postgres can
+                    # flatten into a plain join of the target table.
+                    value = _join_element(wrapper, ctx=shapectx)
                 else:
                     value = wrapper
             else:
@@ -89,3 +108,115 @@ def compile_shape(
             elements.append(tuple_el)
 
     return pgast.TupleVar(elements=elements, named=True)
+
+
+def _can_join_element(stmt: pgast.Query) -> bool:
+    # The lateral subquery may refer to any range var of *stmt*, so
+    # they all must be to the left of it in a single join tree.
+    # Grouping would also require the joined column in GROUP BY.
+    return (
+        isinstance(stmt, pgast.SelectStmt)
+        and not astutils.is_set_op_query(stmt)
+        and len(stmt.from_clause) == 1
+        and not stmt.group_clause
+        and not stmt.distinct_clause
+    )
+
+
+def _join_element(
+        wrapper: pgast.Query, *,
+        ctx: context.CompilerContextLevel) -> pgast.ColumnRef:
+    colname = ctx.env.aliases.get('v')
+    rvar = relctx.rvar_for_rel(
+        wrapper, lateral=True, colnames=[colname], ctx=ctx)
+    relctx.rel_left_join(ctx.rel, rvar, ctx=ctx)
+    return astutils.get_column(rvar, colname, nullable=True)
+
+
+def _can_batch_element(
+        ir_set: irast.Set, el: irast.Set, *,
+        ctx: context.CompilerContextLevel) -> bool:
+    return (
+        ir_set.path_id.is_objtype_path()
+        and not irutils.is_subquery_set(ir_set)
+        and not ctx.dml_stmts
+        and irutils.get_nearest_dml_stmt(ir_set) is None
+        and _is_plain_path_element(el)
+        and _can_join_element(ctx.rel)
+    )
+
+
+def _is_plain_path_element(el: irast.Set) -> bool:
+    # The batched aggregate is computed for all objects of the source
+    # type, so the element and its subshape must depend on nothing
+    # but the source object: only stored pointers are allowed.
+    if (el.expr is not None
+            or el.rptr is None
+            or el.rptr.ptrref.is_computable
+            or el.path_id.is_type_intersection_path()):
+        return False
+
+    return all(_is_plain_path_element(sub) for sub, _ in el.shape)
+
+
+def _batch_element(
+        ir_set: irast.Set, el: irast.Set, *,
+        ctx: context.CompilerContextLevel) -> pgast.BaseExpr:
+    # Instead of aggregating the element in a subquery correlated
+    # with every source row, aggregate it for all objects of the
+    # source type at once, and join the result back by identity:
+    #
+    #     SELECT ..., coalesce(b.v, '{}')
+    #     FROM <src> LEFT JOIN LATERAL (
+    #         SELECT s.id AS s, array_agg(<el>) AS v
+    #         FROM <all src> AS s, LATERAL (<el of s>)
+    #         GROUP BY s.id
+    #     ) AS b ON (b.s = <src>.id)
+    #
+    # The element subquery is simple enough for Postgres to flatten it
+    # into a join, and the aggregate does not refer to the outer query,
+    # so it is computed once with a single pass over the link table.
+    with ctx.newscope() as scopectx, scopectx.subrel() as aggctx:
+        aggrel = aggctx.rel
+        src_rvar = relctx.new_root_rvar(ir_set, ctx=aggctx)
+        relctx.include_rvar(
+            aggrel, src_rvar, path_id=ir_set.path_id, ctx=aggctx)
+        aggctx.path_scope[ir_set.path_id] = aggrel
+
+        wrapper = relgen.set_as_subquery(el, as_value=True, ctx=aggctx)
+        wrapper_rvar = relctx.rvar_for_rel(wrapper, lateral=True, ctx=aggctx)
+        relctx.include_rvar(
+            aggrel, wrapper_rvar, path_id=el.path_id, ctx=aggctx)
+
+        array_agg, pg_type = relgen.get_set_array_agg(
+            el, aggrel, ctx=aggctx)
+        src_id = pathctx.get_path_identity_var(
+            aggrel, ir_set.path_id, env=aggctx.env)
+
+        src_col = ctx.env.aliases.get('s')
+        agg_col = ctx.env.aliases.get('v')
+        aggrel.target_list = [
+            pgast.ResTarget(val=src_id, name=src_col),
+            pgast.ResTarget(val=array_agg, name=agg_col),
+        ]
+        aggrel.group_clause = [src_id]
+
+    agg_rvar = relctx.rvar_for_rel(
+        aggrel, lateral=True, colnames=[src_col, agg_col], ctx=ctx)
+    relctx.rel_left_join(
+        ctx.rel, agg_rvar,
+        quals=astutils.new_binop(
+            astutils.get_column(agg_rvar, src_col, nullable=False),
+            pathctx.get_path_identity_var(
+                ctx.rel, ir_set.path_id, env=ctx.env),
+            '=',
+        ),
+        ctx=ctx,
+    )
+
+    agg_ref = pgast.ColumnRef(
+        name=[agg_rvar.alias.aliasname, agg_col],
+        nullable=True,
+        ser_safe=array_agg.ser_safe,
+    )
+    return relgen.coalesce_to_empty_array(agg_ref, pg_type)
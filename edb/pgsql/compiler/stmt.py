@@ -64,6 +64,17 @@ def compile_SelectStmt(
                         env=ctx.env,
                     )
 
+        # Without a FILTER or a LIMIT the result is likely to be
+        # large enough to benefit from batched shape aggregation.
+        # Nested statements are evaluated once per row of the
+        # enclosing query, so they must not batch.
+        ctx.batch_multi_shapes = (
+            query is ctx.toplevel_stmt
+            and stmt.where is None
+            and stmt.limit is None
+            and stmt.offset is None
+        )
+
         # Process the result expression;
         outvar = clauses.compile_output(stmt.result, ctx=ctx)
 
@@ -34,7 +34,7 @@ class Function(base.DBObject):
     def __init__(self, name, *, args=None, returns, text,
                  volatility='volatile', language='sql',
                  has_variadic=None, strict=False,
-                 set_returning=False):
+                 parallel='unsafe', set_returning=False):
         self.name = name
         self.args = args
         self.returns = returns
@@ -43,6 +43,7 @@ class Function(base.DBObject):
         self.language = language
         self.has_variadic = has_variadic
         self.strict = strict
+        self.parallel = parallel
         self.set_returning = set_returning
 
     def __repr__(self):
@@ -118,7 +119,8 @@ class CreateFunction(ddl.DDLOperation, FunctionOperation):
             AS $____funcbody____$
             {text}
             $____funcbody____$
-            LANGUAGE {lang} {volatility} {strict};
+            LANGUAGE {lang} {volatility} {strict}
+            PARALLEL {parallel};
         ''').format_map({
             'replace': 'OR REPLACE' if self.or_replace else '',
             'name': qn(*self.function.name),
@@ -128,6 +130,7 @@ class CreateFunction(ddl.DDLOperation, FunctionOperation):
             'volatility': self.function.volatility.upper(),
             'text': textwrap.dedent(self.function.text).strip(),
             'strict': 'STRICT' if self.function.strict else '',
+            'parallel': self.function.parallel.upper(),
             'setof': 'SETOF' if self.function.set_returning else '',
         })
         return code.strip()
@@ -152,7 +155,8 @@ class CreateOrReplaceFunction(ddl.DDLOperation, FunctionOperation):
             AS $____funcbody____$
             {text}
             $____funcbody____$
-            LANGUAGE {lang} {volatility} {strict};
+            LANGUAGE {lang} {volatility} {strict}
+            PARALLEL {parallel};
         ''').format_map({
             'name': qn(*self.function.name),
             'args': args,
@@ -161,6 +165,7 @@ class CreateOrReplaceFunction(ddl.DDLOperation, FunctionOperation):
             'volatility': self.function.volatility.upper(),
             'text': textwrap.dedent(self.function.text).strip(),
             'strict': 'STRICT' if self.function.strict else '',
+            'parallel': self.function.parallel.upper(),
             'setof': 'SETOF' if self.function.set_returning else '',
         })
         return code.strip()
@@ -59,7 +59,7 @@ class TextSearchIndexColumn(IndexColumn):
 class Index(tables.InheritableTableObject):
     def __init__(
             self, name, table_name, unique=True, expr=None, predicate=None,
-            inherit=False, metadata=None, columns=None):
+            inherit=False, metadata=None, columns=None, method=None):
         super().__init__(inherit=inherit, metadata=metadata)
 
         assert table_name[1] != 'feature'
@@ -72,6 +72,7 @@ class Index(tables.InheritableTableObject):
         self.predicate = predicate
         self.unique = unique
         self.expr = expr
+        self.method = method
 
         if self.name_in_catalog != self.name:
             self.add_metadata('fullname', self.name)
@@ -151,19 +152,26 @@ class Index(tables.InheritableTableObject):
                 ;
         ''')
 
-    def creation_code(self, block: base.PLBlock) -> str:
+    def creation_code(
+        self,
+        block: base.PLBlock,
+        *,
+        concurrently: bool = False,
+    ) -> str:
         if self.expr:
             expr = self.expr
         else:
             expr = ', '.join(qi(c) for c in self.columns)
 
         code = '''
-            CREATE {unique} INDEX {name}
-                ON {table} ({expr}) {predicate}'''.format(
+            CREATE {unique} INDEX {concurrently} {name}
+                ON {table} {method} ({expr}) {predicate}'''.format(
 
             unique='UNIQUE' if self.unique else '',
+            concurrently='CONCURRENTLY' if concurrently else '',
             name=qn(self.name_in_catalog),
             table=qn(*self.table_name),
+            method=f'USING {self.method}' if self.method else '',
             expr=expr,
             predicate=('WHERE {}'.format(self.predicate)
                        if self.predicate else '')
@@ -223,7 +231,7 @@ class Index(tables.InheritableTableObject):
         return self.__class__(
             name=self.name, table_name=self.table_name, unique=self.unique,
             expr=self.expr, predicate=self.predicate, columns=self.columns,
-            metadata=self.metadata.copy()
+            method=self.method, metadata=self.metadata.copy()
             if self.metadata is not None else None)
 
     def __repr__(self):
@@ -244,11 +252,17 @@ class TextSearchIndex(Index):
         super().__init__(name, table_name)
         self.add_columns(columns)
 
-    def creation_code(self, block: base.PLBlock) -> str:
+    def creation_code(
+        self,
+        block: base.PLBlock,
+        *,
+        concurrently: bool = False,
+    ) -> str:
         code = \
-            'CREATE INDEX %(name)s ON %(table)s ' \
+            'CREATE INDEX %(concurrently)s %(name)s ON %(table)s ' \
             'USING gin((%(cols)s)) %(predicate)s' % \
-            {'name': qn(self.name),
+            {'concurrently': 'CONCURRENTLY' if concurrently else '',
+             'name': qn(self.name),
              'table': qn(*self.table_name),
              'cols': ' || '.join(c.code(block) for c in self.columns),
              'predicate': ('WHERE %s' % self.predicate
@@ -277,15 +291,21 @@ class IndexExists(base.Condition):
 
 
 class CreateIndex(ddl.CreateObject):
-    def __init__(self, index, *, conditional=False, **kwargs):
+    def __init__(
+        self, index, *, conditional=False, concurrently=False, **kwargs
+    ):
         super().__init__(index, **kwargs)
         self.index = index
+        # CONCURRENTLY builds cannot run inside a transaction block,
+        # so such operations must be executed as standalone statements.
+        self.concurrently = concurrently
         if conditional:
             self.neg_conditions.add(
                 IndexExists((index.table_name[0], index.name_in_catalog)))
 
     def code(self, block: base.PLBlock) -> str:
-        return self.index.creation_code(block)
+        return self.index.creation_code(
+            block, concurrently=self.concurrently)
 
     @classmethod
     def pl_code(cls, index_desc_var: str, block: base.PLBlock) -> str:
@@ -337,15 +357,22 @@ class RenameIndexSimple(ddl.DDLOperation):
 
 
 class DropIndex(ddl.DropObject):
-    def __init__(self, index, *, conditional=False, **kwargs):
+    def __init__(
+        self, index, *, conditional=False, concurrently=False,
+        if_exists=False, **kwargs
+    ):
         super().__init__(index, **kwargs)
+        self.concurrently = concurrently
+        self.if_exists = if_exists
         if conditional:
             self.conditions.add(
                 IndexExists((index.table_name[0], index.name_in_catalog)))
 
     def code(self, block: base.PLBlock) -> str:
         name = qn(self.object.table_name[0], self.object.name_in_catalog)
-        return f'DROP INDEX {name}'
+        concurrently = ' CONCURRENTLY' if self.concurrently else ''
+        if_exists = ' IF EXISTS' if self.if_exists else ''
+        return f'DROP INDEX{concurrently}{if_exists} {name}'
 
     @classmethod
     def pl_code(cls, index_desc_var: str, block: base.PLBlock) -> str:
@@ -22,6 +22,7 @@ from __future__ import annotations
 import collections.abc
 import dataclasses
 import itertools
+import re
 import textwrap
 from typing import *
 
@@ -59,6 +60,7 @@ from edb.common import markup
 from edb.common import ordered
 from edb.common import topological
 
+from edb.ir import ast as irast
 from edb.ir import typeutils as irtyputils
 from edb.ir import utils as irutils
 
@@ -455,6 +457,48 @@ class DeleteParameter(ParameterCommand, DeleteObject,
     pass
 
 
+# References to backend helpers that must not run in a parallel
+# worker: the ones reading the session state from the "_edgecon_state"
+# temporary table (parallel restricted), and the ones changing settings
+# (parallel unsafe).  See metaschema.
+_PARALLEL_RESTRICTED_REFS = re.compile(r'''
+    \b(?:
+        _edgecon_state
+        | edgedb\._read_sys_config
+        | edgedb\._sys_version
+        | edgedb\._read_query_stats
+        | edgedb\._config_insert_all_\w+
+        | edgedb\._describe_system_config_as_ddl
+    )\b
+''', re.X)
+
+_PARALLEL_UNSAFE_REFS = re.compile(r'''
+    \b(?:
+        set_config
+        | edgedb\._to_timestamptz_check
+        | edgedb\.to_datetime
+        | edgedb\.to_local_datetime
+    )\b
+''', re.X)
+
+_PARALLEL_SAFETY_LEVELS = ('safe', 'restricted', 'unsafe')
+
+
+def _get_code_parallel_safety(code: Optional[str]) -> str:
+    if not code:
+        return 'safe'
+    elif _PARALLEL_UNSAFE_REFS.search(code):
+        return 'unsafe'
+    elif _PARALLEL_RESTRICTED_REFS.search(code):
+        return 'restricted'
+    else:
+        return 'safe'
+
+
+def _least_parallel_safe(labels: Iterable[str]) -> str:
+    return max(labels, key=_PARALLEL_SAFETY_LEVELS.index, default='safe')
+
+
 class FunctionCommand:
 
     def get_pgname(self, func: s_funcs.Function, schema):
@@ -522,15 +566,113 @@ class FunctionCommand:
 
         return args
 
-    def make_function(self, func: s_funcs.Function, code, schema):
+    def get_parallel_safety(self, func, code, schema) -> str:
+        """Infer the Postgres PARALLEL label of a backend function."""
+        if func.get_volatility(schema) is ql_ft.Volatility.VOLATILE:
+            # Volatile functions may modify the database.
+            return 'unsafe'
+        else:
+            return _get_code_parallel_safety(code)
+
+    def get_edgeql_parallel_safety(self, func, code, ir, schema, *,
+                                   seen=None) -> str:
+        """Infer the Postgres PARALLEL label of a compiled EdgeQL function.
+
+        Compiled EdgeQL refers to other functions by their backend
+        names, which the patterns in get_parallel_safety() can't match,
+        so the labels of everything the function calls are taken into
+        account instead.
+        """
+        labels = [self.get_parallel_safety(func, code, schema)]
+        if func.get_volatility(schema) is ql_ft.Volatility.STABLE:
+            # Stable functions may read session state (e.g. the
+            # config), immutable ones cannot.
+            labels.append('restricted')
+        if seen is None:
+            seen = {}
+        labels.extend(self._get_calls_parallel_safety(ir, schema, seen))
+        return _least_parallel_safe(labels)
+
+    def _get_calls_parallel_safety(self, ir, schema, seen) -> List[str]:
+        labels = []
+        for call in irutils.get_calls(ir):
+            if isinstance(call, irast.TypeCast):
+                if call.cast_name is None:
+                    continue
+                cast = schema.get(call.cast_name, default=None)
+                if cast is not None:
+                    labels.append(_get_code_parallel_safety(
+                        cast.get_code(schema)
+                        or cast.get_from_function(schema)))
+            elif isinstance(call, irast.OperatorCall):
+                for oper in schema.get_operators(
+                        call.func_shortname, default=()):
+                    labels.append(self.get_parallel_safety(
+                        oper,
+                        oper.get_code(schema)
+                        or oper.get_from_function(schema),
+                        schema))
+            else:
+                # The overload that is called is not recorded in the
+                # IR, so assume the least safe one.
+                for func in schema.get_functions(
+                        call.func_shortname, default=()):
+                    labels.append(
+                        self._get_callee_parallel_safety(func, schema, seen))
+        return labels
+
+    def _get_callee_parallel_safety(self, func, schema, seen) -> str:
+        label = seen.get(func.id)
+        if label is not None:
+            return label
+        # Guard against cycles.
+        seen[func.id] = 'unsafe'
+
+        if func.get_language(schema) is ql_ast.Language.EdgeQL:
+            nativecode = func.get_nativecode(schema)
+            if nativecode is None:
+                label = 'unsafe'
+            else:
+                if nativecode.irast is None:
+                    params = func.get_params(schema)
+                    nativecode = type(nativecode).compiled(
+                        nativecode,
+                        schema,
+                        options=qlcompiler.CompilerOptions(
+                            anchors=s_funcs.get_params_symtable(
+                                params,
+                                schema,
+                                inlined_defaults=bool(
+                                    params.find_named_only(schema)),
+                            ),
+                            func_params=params,
+                            session_mode=func.get_session_only(schema),
+                        ),
+                    )
+                label = self.get_edgeql_parallel_safety(
+                    func, None, nativecode.irast, schema, seen=seen)
+        else:
+            label = self.get_parallel_safety(
+                func,
+                func.get_code(schema) or func.get_from_function(schema),
+                schema)
+
+        seen[func.id] = label
+        return label
+
+    def make_function(self, func: s_funcs.Function, code, schema, *,
+                      parallel: Optional[str] = None):
         func_return_typemod = func.get_return_typemod(schema)
         func_params = func.get_params(schema)
+        if parallel is None:
+            parallel = self.get_parallel_safety(func, code, schema)
         return dbops.Function(
             name=self.get_pgname(func, schema),
             args=self.compile_args(func, schema),
             has_variadic=func_params.find_variadic(schema) is not None,
             set_returning=func_return_typemod is ql_ft.TypeModifier.SET_OF,
             volatility=func.get_volatility(schema),
+            parallel=parallel,
             returns=self.get_pgtype(
                 func, func.get_return_type(schema), schema),
             text=code)
@@ -551,7 +693,10 @@ class FunctionCommand:
             output_format=compiler.OutputFormat.NATIVE,
             use_named_params=True)
 
-        return self.make_function(func, sql_text, schema)
+        return self.make_function(
+            func, sql_text, schema,
+            parallel=self.get_edgeql_parallel_safety(
+                func, sql_text, nativecode.irast, schema))
 
     def make_op(
         self,
@@ -702,14 +847,16 @@ class OperatorCommand(FunctionCommand):
         return args
 
     def make_operator_function(self, oper: s_opers.Operator, schema):
+        code = oper.get_code(schema)
         return dbops.Function(
             name=common.get_backend_name(
                 schema, oper, catenate=False, aspect='function'),
             args=self.compile_args(oper, schema),
             volatility=oper.get_volatility(schema),
+            parallel=self.get_parallel_safety(oper, code, schema),
             returns=self.get_pgtype(
                 oper, oper.get_return_type(schema), schema),
-            text=oper.get_code(schema))
+            text=code)
 
 
 class CreateOperator(OperatorCommand, CreateObject,
@@ -780,6 +927,7 @@ class CreateOperator(OperatorCommand, CreateObject,
                         schema, oper, catenate=False, aspect='function'),
                     args=[(None, a) for a in args if a],
                     volatility=oper.get_volatility(schema),
+                    parallel=self.get_parallel_safety(oper, op, schema),
                     returns=rtype,
                     text=f'SELECT ({op})::{qt(rtype)}',
                 )
@@ -878,11 +1026,13 @@ class CastCommand:
 
         returns = types.pg_type_from_object(schema, cast.get_to_type(schema))
 
+        code = cast.get_code(schema)
         return dbops.Function(
             name=name,
             args=args,
             returns=returns,
-            text=cast.get_code(schema),
+            parallel=_get_code_parallel_safety(code),
+            text=code,
         )
 
 
@@ -1684,23 +1834,14 @@ class CompositeObjectMetaCommand(ObjectMetaCommand):
 
 
 class IndexCommand(sd.ObjectCommand, metaclass=ReferencedObjectCommandMeta):
-    pass
-
 
-class CreateIndex(IndexCommand, CreateObject, adapts=s_indexes.CreateIndex):
-
-    def apply(
+    def _compile_index_expr(
         self,
+        expr: s_expr.Expression,
+        subject: s_sources.Source,
         schema: s_schema.Schema,
         context: sd.CommandContext,
-    ) -> s_schema.Schema:
-        schema = CreateObject.apply(self, schema, context)
-        index = self.scls
-
-        parent_ctx = context.get_ancestor(
-            s_indexes.IndexSourceCommandContext, self)
-        subject_name = parent_ctx.op.classname
-        subject = schema.get(subject_name, default=None)
+    ) -> str:
         if not isinstance(subject, s_pointers.Pointer):
             singletons = [subject]
             path_prefix_anchor = ql_ast.Subject().name
@@ -1708,11 +1849,10 @@ class CreateIndex(IndexCommand, CreateObject, adapts=s_indexes.CreateIndex):
             singletons = []
             path_prefix_anchor = None
 
-        index_expr = index.get_expr(schema)
-        ir = index_expr.irast
+        ir = expr.irast
         if ir is None:
-            index_expr = type(index_expr).compiled(
-                index_expr,
+            expr = type(expr).compiled(
+                expr,
                 schema=schema,
                 options=qlcompiler.CompilerOptions(
                     modaliases=context.modaliases,
@@ -1722,10 +1862,7 @@ class CreateIndex(IndexCommand, CreateObject, adapts=s_indexes.CreateIndex):
                     singletons=singletons,
                 ),
             )
-            ir = index_expr.irast
-
-        table_name = common.get_backend_name(
-            schema, subject, catenate=False)
+            ir = expr.irast
 
         sql_tree = compiler.compile_ir_to_sql_tree(
             ir.expr, singleton_mode=True)
@@ -1737,14 +1874,101 @@ class CreateIndex(IndexCommand, CreateObject, adapts=s_indexes.CreateIndex):
             # list.
             sql_expr = sql_expr[1:-1]
 
+        return sql_expr
+
+    def _create_index(
+        self,
+        index: s_indexes.Index,
+        subject: s_sources.Source,
+        schema: s_schema.Schema,
+        context: sd.CommandContext,
+    ) -> dbops.CreateIndex:
+        table_name = common.get_backend_name(
+            schema, subject, catenate=False)
+
+        sql_expr = self._compile_index_expr(
+            index.get_expr(schema), subject, schema, context)
+
+        predicate = index.get_predicate(schema)
+        if predicate is not None:
+            sql_predicate = self._compile_index_expr(
+                predicate, subject, schema, context)
+        else:
+            sql_predicate = None
+
+        kind = index.get_kind(schema)
+        if kind is ql_ft.IndexKind.BTREE:
+            method = None
+        else:
+            method = kind.lower()
+
         module = schema.get_global(s_mod.Module, index.get_name(schema).module)
         index_name = common.get_index_backend_name(
             index.id, module.id, catenate=False)
         pg_index = dbops.Index(
             name=index_name[1], table_name=table_name, expr=sql_expr,
+            predicate=sql_predicate, method=method,
             unique=False, inherit=True,
             metadata={'schemaname': index.get_name(schema)})
-        self.pgops.add(dbops.CreateIndex(pg_index, priority=3))
+        return dbops.CreateIndex(pg_index, priority=3)
+
+    def _drop_index(
+        self,
+        index: s_indexes.Index,
+        subject: s_sources.Source,
+        schema: s_schema.Schema,
+        orig_schema: s_schema.Schema,
+    ) -> dbops.DropIndex:
+        table_name = common.get_backend_name(
+            schema, subject, catenate=False)
+        module = schema.get_global(
+            s_mod.Module, index.get_name(orig_schema).module)
+        orig_idx_name = common.get_index_backend_name(
+            index.id, module.id, catenate=False)
+        pg_index = dbops.Index(
+            name=orig_idx_name[1], table_name=table_name, inherit=True)
+        index_exists = dbops.IndexExists(
+            (table_name[0], pg_index.name_in_catalog))
+        return dbops.DropIndex(
+            pg_index, priority=3, conditions=(index_exists, ))
+
+
+class CreateIndex(IndexCommand, CreateObject, adapts=s_indexes.CreateIndex):
+
+    def apply(
+        self,
+        schema: s_schema.Schema,
+        context: sd.CommandContext,
+    ) -> s_schema.Schema:
+        schema = CreateObject.apply(self, schema, context)
+        index = self.scls
+
+        parent_ctx = context.get_ancestor(
+            s_indexes.IndexSourceCommandContext, self)
+        subject_name = parent_ctx.op.classname
+        subject = schema.get(subject_name, default=None)
+
+        create_index = self._create_index(index, subject, schema, context)
+
+        if self.get_attribute_value('build_concurrently'):
+            if isinstance(parent_ctx.op, sd.CreateObject):
+                raise errors.SchemaDefinitionError(
+                    f'cannot build an index concurrently on '
+                    f'{subject.get_verbosename(schema)}, which is '
+                    f'being created by the same command',
+                    context=self.source_context,
+                )
+
+            # The index is built by the compiler outside of the DDL
+            # transaction, ahead of the schema change; here we only
+            # need to record its metadata.
+            pg_index = create_index.index
+            root = context.get(sd.DeltaRootContext).op
+            root.concurrent_index_builds.append(pg_index)
+            self.pgops.add(
+                dbops.SetMetadata(pg_index, pg_index.metadata, priority=3))
+        else:
+            self.pgops.add(create_index)
 
         return schema
 
@@ -1795,7 +2019,29 @@ class AlterIndexOwned(
 
 
 class AlterIndex(IndexCommand, AlterObject, adapts=s_indexes.AlterIndex):
-    pass
+
+    def apply(
+        self,
+        schema: s_schema.Schema,
+        context: sd.CommandContext,
+    ) -> s_schema.Schema:
+        orig_schema = schema
+        schema = super().apply(schema, context)
+        index = self.scls
+
+        if (
+            self.has_attribute_value('kind')
+            or self.has_attribute_value('predicate')
+        ):
+            # Neither the access method nor the predicate of a Postgres
+            # index can be altered in place, so rebuild the index.
+            subject = index.get_subject(schema)
+            self.pgops.add(
+                self._drop_index(index, subject, schema, orig_schema))
+            self.pgops.add(
+                self._create_index(index, subject, schema, context))
+
+        return schema
 
 
 class DeleteIndex(IndexCommand, DeleteObject, adapts=s_indexes.DeleteIndex):
@@ -1817,19 +2063,8 @@ class DeleteIndex(IndexCommand, DeleteObject, adapts=s_indexes.DeleteIndex):
             # We should not drop indexes when the host is being dropped since
             # the indexes are dropped automatically in this case.
             #
-            table_name = common.get_backend_name(
-                schema, source.scls, catenate=False)
-            module = schema.get_global(
-                s_mod.Module, index.get_name(orig_schema).module)
-            orig_idx_name = common.get_index_backend_name(
-                index.id, module.id, catenate=False)
-            index = dbops.Index(
-                name=orig_idx_name[1], table_name=table_name, inherit=True)
-            index_exists = dbops.IndexExists(
-                (table_name[0], index.name_in_catalog))
             self.pgops.add(
-                dbops.DropIndex(
-                    index, priority=3, conditions=(index_exists, )))
+                self._drop_index(index, source.scls, schema, orig_schema))
 
         return schema
 
@@ -3100,39 +3335,61 @@ class UpdateEndpointDeleteActions(MetaCommand):
         super().__init__(**kwargs)
         self.link_ops = []
 
-    def _get_link_table_union(self, schema, links) -> str:
+    #: Name of the transition table holding the rows deleted by
+    #: the statement in statement-level link action triggers.
+    deleted_rel = 'deleted_objects'
+
+    def _get_endpoint_cond(self, endpoint, *, statement) -> str:
+        if statement:
+            return (
+                f'{endpoint} IN '
+                f'(SELECT {qi("id")} FROM {qi(self.deleted_rel)})'
+            )
+        else:
+            return f'{endpoint} = OLD.{qi("id")}'
+
+    def _get_link_table_union(
+            self, schema, links, *, near_endpoint, statement) -> str:
         selects = []
         for link in links:
             selects.append(textwrap.dedent('''\
                 (SELECT ptr_item_id, {src} as source, {tgt} as target
-                FROM {table})
+                FROM {table}
+                WHERE {cond})
             ''').format(
                 src=common.quote_ident('source'),
                 tgt=common.quote_ident('target'),
                 table=common.get_backend_name(
                     schema, link),
+                cond=self._get_endpoint_cond(
+                    common.quote_ident(near_endpoint),
+                    statement=statement),
             ))
 
         return '(' + '\nUNION ALL\n    '.join(selects) + ') as q'
 
-    def _get_inline_link_table_union(self, schema, links) -> str:
+    def _get_inline_link_table_union(
+            self, schema, links, *, statement) -> str:
         selects = []
         for link in links:
+            tgt = common.quote_ident(link.get_shortname(schema).name)
             selects.append(textwrap.dedent('''\
                 (SELECT
                     {id}::uuid AS ptr_item_id,
                     {src} as source,
                     {tgt} as target
-                FROM {table})
+                FROM {table}
+                WHERE {cond})
             ''').format(
                 id=ql(str(link.id)),
                 src=common.quote_ident('id'),
-                tgt=common.quote_ident(link.get_shortname(schema).name),
+                tgt=tgt,
                 table=common.get_backend_name(
                     schema,
                     link.get_source(schema),
                     aspect='inhview',
                 ),
+                cond=self._get_endpoint_cond(tgt, statement=statement),
             ))
 
         return '(' + '\nUNION ALL\n    '.join(selects) + ') as q'
@@ -3182,16 +3439,74 @@ class UpdateEndpointDeleteActions(MetaCommand):
             schema, target, catenate=False, aspect=aspect)
 
     def get_trigger_proc_text(self, target, links, *,
-                              disposition, inline, schema):
+                              disposition, inline, deferred, schema):
+        # Deferred constraint triggers can only be defined as row-level
+        # triggers, everything else is enforced by statement-level
+        # triggers over the transition table of the deleted rows.
+        statement = not deferred
         if inline:
             return self._get_inline_link_trigger_proc_text(
-                target, links, disposition=disposition, schema=schema)
+                target, links, disposition=disposition,
+                statement=statement, schema=schema)
         else:
             return self._get_outline_link_trigger_proc_text(
-                target, links, disposition=disposition, schema=schema)
+                target, links, disposition=disposition,
+                statement=statement, schema=schema)
+
+    def _get_restrict_check_text(
+            self, target, tables, *, far_endpoint, schema) -> str:
+        return textwrap.dedent('''\
+            SELECT
+                q.ptr_item_id, q.source, q.target
+                INTO link_type_id, srcid, tgtid
+            FROM
+                {tables}
+            LIMIT 1;
+
+            IF FOUND THEN
+                SELECT
+                    edgedb.shortname_from_fullname(link.name),
+                    edgedb._get_schema_object_name(link.{far_endpoint})
+                    INTO linkname, endname
+                FROM
+                    edgedb."_SchemaLink" AS link
+                WHERE
+                    link.id = link_type_id;
+                RAISE foreign_key_violation
+                    USING
+                        TABLE = TG_TABLE_NAME,
+                        SCHEMA = TG_TABLE_SCHEMA,
+                        MESSAGE = 'deletion of {tgtname} (' || tgtid
+                            || ') is prohibited by link target policy',
+                        DETAIL = 'Object is still referenced in link '
+                            || linkname || ' of ' || endname || ' ('
+                            || srcid || ').';
+            END IF;
+        ''').format(
+            tables=tables,
+            tgtname=target.get_displayname(schema),
+            far_endpoint=far_endpoint,
+        )
+
+    def _get_trigger_proc_body(self, chunks, *, statement) -> str:
+        return textwrap.dedent('''\
+            DECLARE
+                link_type_id uuid;
+                srcid uuid;
+                tgtid uuid;
+                linkname text;
+                endname text;
+            BEGIN
+                {chunks}
+                RETURN {retval};
+            END;
+        ''').format(
+            chunks='\n\n'.join(chunks),
+            retval='NULL' if statement else 'OLD',
+        )
 
     def _get_outline_link_trigger_proc_text(
-            self, target, links, *, disposition, schema):
+            self, target, links, *, disposition, statement, schema):
 
         chunks = []
 
@@ -3207,46 +3522,13 @@ class UpdateEndpointDeleteActions(MetaCommand):
 
         for action, links in groups:
             if action is DA.RESTRICT or action is DA.DEFERRED_RESTRICT:
-                tables = self._get_link_table_union(schema, links)
-
-                text = textwrap.dedent('''\
-                    SELECT
-                        q.ptr_item_id, q.source, q.target
-                        INTO link_type_id, srcid, tgtid
-                    FROM
-                        {tables}
-                    WHERE
-                        q.{near_endpoint} = OLD.{id}
-                    LIMIT 1;
-
-                    IF FOUND THEN
-                        SELECT
-                            edgedb.shortname_from_fullname(link.name),
-                            edgedb._get_schema_object_name(link.{far_endpoint})
-                            INTO linkname, endname
-                        FROM
-                            edgedb."_SchemaLink" AS link
-                        WHERE
-                            link.id = link_type_id;
-                        RAISE foreign_key_violation
-                            USING
-                                TABLE = TG_TABLE_NAME,
-                                SCHEMA = TG_TABLE_SCHEMA,
-                                MESSAGE = 'deletion of {tgtname} (' || tgtid
-                                    || ') is prohibited by link target policy',
-                                DETAIL = 'Object is still referenced in link '
-                                    || linkname || ' of ' || endname || ' ('
-                                    || srcid || ').';
-                    END IF;
-                ''').format(
-                    tables=tables,
-                    id='id',
-                    tgtname=target.get_displayname(schema),
-                    near_endpoint=near_endpoint,
-                    far_endpoint=far_endpoint,
-                )
+                tables = self._get_link_table_union(
+                    schema, links, near_endpoint=near_endpoint,
+                    statement=statement)
 
-                chunks.append(text)
+                chunks.append(self._get_restrict_check_text(
+                    target, tables, far_endpoint=far_endpoint,
+                    schema=schema))
 
             elif action == s_links.LinkTargetDeleteAction.ALLOW:
                 for link in links:
@@ -3257,11 +3539,12 @@ class UpdateEndpointDeleteActions(MetaCommand):
                         DELETE FROM
                             {link_table}
                         WHERE
-                            {endpoint} = OLD.{id};
+                            {cond};
                     ''').format(
                         link_table=link_table,
-                        endpoint=common.quote_ident(near_endpoint),
-                        id='id'
+                        cond=self._get_endpoint_cond(
+                            common.quote_ident(near_endpoint),
+                            statement=statement),
                     )
 
                     chunks.append(text)
@@ -3272,7 +3555,9 @@ class UpdateEndpointDeleteActions(MetaCommand):
                     sources[link.get_source(schema)].append(link)
 
                 for source, source_links in sources.items():
-                    tables = self._get_link_table_union(schema, source_links)
+                    tables = self._get_link_table_union(
+                        schema, source_links, near_endpoint=near_endpoint,
+                        statement=statement)
 
                     text = textwrap.dedent('''\
                         DELETE FROM
@@ -3281,7 +3566,6 @@ class UpdateEndpointDeleteActions(MetaCommand):
                             {source_table}.{id} IN (
                                 SELECT source
                                 FROM {tables}
-                                WHERE target = OLD.{id}
                             );
                     ''').format(
                         source_table=common.get_backend_name(schema, source),
@@ -3291,23 +3575,10 @@ class UpdateEndpointDeleteActions(MetaCommand):
 
                     chunks.append(text)
 
-        text = textwrap.dedent('''\
-            DECLARE
-                link_type_id uuid;
-                srcid uuid;
-                tgtid uuid;
-                linkname text;
-                endname text;
-            BEGIN
-                {chunks}
-                RETURN OLD;
-            END;
-        ''').format(chunks='\n\n'.join(chunks))
-
-        return text
+        return self._get_trigger_proc_body(chunks, statement=statement)
 
     def _get_inline_link_trigger_proc_text(
-            self, target, links, *, disposition, schema):
+            self, target, links, *, disposition, statement, schema):
 
         if disposition == 'source':
             raise RuntimeError(
@@ -3321,55 +3592,22 @@ class UpdateEndpointDeleteActions(MetaCommand):
         groups = itertools.groupby(
             links, lambda l: l.get_on_target_delete(schema))
 
-        near_endpoint, far_endpoint = 'target', 'source'
+        far_endpoint = 'source'
 
         for action, links in groups:
             if action is DA.RESTRICT or action is DA.DEFERRED_RESTRICT:
-                tables = self._get_inline_link_table_union(schema, links)
-
-                text = textwrap.dedent('''\
-                    SELECT
-                        q.ptr_item_id, q.source, q.target
-                        INTO link_type_id, srcid, tgtid
-                    FROM
-                        {tables}
-                    WHERE
-                        q.{near_endpoint} = OLD.{id}
-                    LIMIT 1;
-
-                    IF FOUND THEN
-                        SELECT
-                            edgedb.shortname_from_fullname(link.name),
-                            edgedb._get_schema_object_name(link.{far_endpoint})
-                            INTO linkname, endname
-                        FROM
-                            edgedb."_SchemaLink" AS link
-                        WHERE
-                            link.id = link_type_id;
-                        RAISE foreign_key_violation
-                            USING
-                                TABLE = TG_TABLE_NAME,
-                                SCHEMA = TG_TABLE_SCHEMA,
-                                MESSAGE = 'deletion of {tgtname} (' || tgtid
-                                    || ') is prohibited by link target policy',
-                                DETAIL = 'Object is still referenced in link '
-                                    || linkname || ' of ' || endname || ' ('
-                                    || srcid || ').';
-                    END IF;
-                ''').format(
-                    tables=tables,
-                    id='id',
-                    tgtname=target.get_displayname(schema),
-                    near_endpoint=near_endpoint,
-                    far_endpoint=far_endpoint,
-                )
+                tables = self._get_inline_link_table_union(
+                    schema, links, statement=statement)
 
-                chunks.append(text)
+                chunks.append(self._get_restrict_check_text(
+                    target, tables, far_endpoint=far_endpoint,
+                    schema=schema))
 
             elif action == s_links.LinkTargetDeleteAction.ALLOW:
                 for link in links:
                     source_table = common.get_backend_name(
                         schema, link.get_source(schema))
+                    endpoint = qi(link.get_shortname(schema).name)
 
                     text = textwrap.dedent('''\
                         UPDATE
@@ -3377,11 +3615,12 @@ class UpdateEndpointDeleteActions(MetaCommand):
                         SET
                             {endpoint} = NULL
                         WHERE
-                            {endpoint} = OLD.{id};
+                            {cond};
                     ''').format(
                         source_table=source_table,
-                        endpoint=qi(link.get_shortname(schema).name),
-                        id='id'
+                        endpoint=endpoint,
+                        cond=self._get_endpoint_cond(
+                            endpoint, statement=statement),
                     )
 
                     chunks.append(text)
@@ -3393,7 +3632,7 @@ class UpdateEndpointDeleteActions(MetaCommand):
 
                 for source, source_links in sources.items():
                     tables = self._get_inline_link_table_union(
-                        schema, source_links)
+                        schema, source_links, statement=statement)
 
                     text = textwrap.dedent('''\
                         DELETE FROM
@@ -3402,7 +3641,6 @@ class UpdateEndpointDeleteActions(MetaCommand):
                             {source_table}.{id} IN (
                                 SELECT source
                                 FROM {tables}
-                                WHERE target = OLD.{id}
                             );
                     ''').format(
                         source_table=common.get_backend_name(schema, source),
@@ -3412,21 +3650,7 @@ class UpdateEndpointDeleteActions(MetaCommand):
 
                     chunks.append(text)
 
-        text = textwrap.dedent('''\
-            DECLARE
-                link_type_id uuid;
-                srcid uuid;
-                tgtid uuid;
-                linkname text;
-                endname text;
-                links text[];
-            BEGIN
-                {chunks}
-                RETURN OLD;
-            END;
-        ''').format(chunks='\n\n'.join(chunks))
-
-        return text
+        return self._get_trigger_proc_body(chunks, statement=statement)
 
     def apply(
         self,
@@ -3604,15 +3828,22 @@ class UpdateEndpointDeleteActions(MetaCommand):
                 schema, objtype, disposition=disposition,
                 deferred=deferred, inline=inline)
 
-            trigger = dbops.Trigger(
-                name=trigger_name, table_name=table_name,
-                events=('delete',), procedure=proc_name,
-                is_constraint=True, inherit=True, deferred=deferred)
+            if deferred:
+                trigger = dbops.Trigger(
+                    name=trigger_name, table_name=table_name,
+                    events=('delete',), procedure=proc_name,
+                    is_constraint=True, inherit=True, deferred=True)
+            else:
+                trigger = dbops.Trigger(
+                    name=trigger_name, table_name=table_name,
+                    events=('delete',), procedure=proc_name,
+                    granularity='statement', old_table=self.deleted_rel,
+                    inherit=True)
 
             if links:
                 proc_text = self.get_trigger_proc_text(
                     objtype, links, disposition=disposition,
-                    inline=inline, schema=schema)
+                    inline=inline, deferred=deferred, schema=schema)
 
                 trig_func = dbops.Function(
                     name=proc_name, text=proc_text, volatility='volatile',
@@ -4015,6 +4246,7 @@ class DeltaRoot(MetaCommand, adapts=sd.DeltaRoot):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self._renames = {}
+        self.concurrent_index_builds: List[dbops.Index] = []
 
     def apply(
         self,
@@ -123,6 +123,7 @@ class StrToBigint(dbops.Function):
             returns=('edgedb', 'bigint_t'),
             # Stable because it's raising exceptions.
             volatility='stable',
+            parallel='safe',
             text=self.text)
 
 
@@ -155,6 +156,7 @@ class StrToDecimal(dbops.Function):
             returns=('numeric',),
             # Stable because it's raising exceptions.
             volatility='stable',
+            parallel='safe',
             text=self.text,
         )
 
@@ -183,6 +185,7 @@ class StrToInt64NoInline(dbops.Function):
             args=[('val', ('text',))],
             returns=('bigint',),
             volatility='stable',
+            parallel='safe',
             text=self.text,
         )
 
@@ -203,6 +206,7 @@ class StrToInt32NoInline(dbops.Function):
             args=[('val', ('text',))],
             returns=('int',),
             volatility='stable',
+            parallel='safe',
             text=self.text,
         )
 
@@ -223,6 +227,7 @@ class StrToInt16NoInline(dbops.Function):
             args=[('val', ('text',))],
             returns=('smallint',),
             volatility='stable',
+            parallel='safe',
             text=self.text,
         )
 
@@ -243,6 +248,7 @@ class StrToFloat64NoInline(dbops.Function):
             args=[('val', ('text',))],
             returns=('float8',),
             volatility='stable',
+            parallel='safe',
             text=self.text,
         )
 
@@ -263,6 +269,7 @@ class StrToFloat32NoInline(dbops.Function):
             args=[('val', ('text',))],
             returns=('float4',),
             volatility='stable',
+            parallel='safe',
             text=self.text,
         )
 
@@ -287,6 +294,7 @@ class GetObjectMetadata(dbops.Function):
             args=[('objoid', ('oid',)), ('objclass', ('text',))],
             returns=('jsonb',),
             volatility='stable',
+            parallel='safe',
             text=self.text)
 
 
@@ -310,6 +318,7 @@ class GetSharedObjectMetadata(dbops.Function):
             args=[('objoid', ('oid',)), ('objclass', ('text',))],
             returns=('jsonb',),
             volatility='stable',
+            parallel='safe',
             text=self.text)
 
 
@@ -334,6 +343,7 @@ class RaiseExceptionFunction(dbops.Function):
             # exception regardless of whether the first argument is
             # NULL or not.
             volatility='stable',
+            parallel='safe',
             language='plpgsql',
             text=self.text)
 
@@ -358,6 +368,7 @@ class RaiseSpecificExceptionFunction(dbops.Function):
             # See NOTE for the _raise_exception for reason why this is
             # stable and not immutable.
             volatility='stable',
+            parallel='safe',
             language='plpgsql',
             text=self.text)
 
@@ -382,6 +393,7 @@ class RaiseSpecificExceptionFunctionArray(dbops.Function):
             # See NOTE for the _raise_exception for reason why this is
             # stable and not immutable.
             volatility='stable',
+            parallel='safe',
             language='plpgsql',
             text=self.text)
 
@@ -401,6 +413,7 @@ class RaiseExceptionOnNullFunction(dbops.Function):
             returns=('anyelement',),
             # Same volatility as _raise_specific_exception
             volatility='stable',
+            parallel='safe',
             text=self.text)
 
 
@@ -423,6 +436,7 @@ class RaiseExceptionOnEmptyStringFunction(dbops.Function):
             returns=('anyelement',),
             # Same volatility as _raise_specific_exception
             volatility='stable',
+            parallel='safe',
             text=self.text)
 
 
@@ -455,6 +469,7 @@ class AssertJSONTypeFunction(dbops.Function):
             # Max volatility of _raise_specific_exception and
             # array_to_string (stable)
             volatility='stable',
+            parallel='safe',
             text=self.text)
 
 
@@ -475,6 +490,7 @@ class ExtractJSONScalarFunction(dbops.Function):
                   ('msg', ('text',), 'NULL'), ('det', ('text',), "''")],
             returns=('text',),
             volatility='stable',
+            parallel='safe',
             text=self.text)
 
 
@@ -506,6 +522,7 @@ class DeriveUUIDFunction(dbops.Function):
             args=[('id', ('uuid',)), ('variant', ('smallint',))],
             returns=('uuid',),
             volatility='immutable',
+            parallel='safe',
             text=self.text)
 
 
@@ -529,6 +546,7 @@ class GetSchemaObjectNameFunction(dbops.Function):
             # Max volatility of _raise_exception and a SELECT from a
             # table (stable).
             volatility='stable',
+            parallel='safe',
             text=self.text,
             strict=True,
         )
@@ -564,6 +582,7 @@ class EdgeDBNameToPGNameFunction(dbops.Function):
             args=[('name', 'text')],
             returns='text',
             volatility='immutable',
+            parallel='safe',
             text=self.__class__.text)
 
 
@@ -582,6 +601,7 @@ class ConvertNameFunction(dbops.Function):
                   ('prefix', 'text', "'edgedb_'")],
             returns='text',
             volatility='immutable',
+            parallel='safe',
             text=self.__class__.text)
 
 
@@ -597,6 +617,7 @@ class ObjectTypeNameToTableNameFunction(dbops.Function):
                   ('prefix', 'text', "'edgedb_'")],
             returns='text',
             volatility='immutable',
+            parallel='safe',
             text=self.__class__.text)
 
 
@@ -612,6 +633,7 @@ class LinkNameToTableNameFunction(dbops.Function):
                   ('prefix', 'text', "'edgedb_'")],
             returns='text',
             volatility='immutable',
+            parallel='safe',
             text=self.__class__.text)
 
 
@@ -635,6 +657,7 @@ class IssubclassFunction(dbops.Function):
             args=[('clsid', 'uuid'), ('classes', 'uuid[]')],
             returns='bool',
             volatility='stable',
+            parallel='safe',
             text=self.__class__.text)
 
 
@@ -658,6 +681,7 @@ class IssubclassFunction2(dbops.Function):
             args=[('clsid', 'uuid'), ('pclsid', 'uuid')],
             returns='bool',
             volatility='stable',
+            parallel='safe',
             text=self.__class__.text)
 
 
@@ -693,6 +717,7 @@ class IsinstanceFunction(dbops.Function):
             args=[('objid', 'uuid'), ('pclsid', 'uuid')],
             returns='bool',
             volatility='stable',
+            parallel='safe',
             language='plpgsql',
             text=self.__class__.text)
 
@@ -722,6 +747,7 @@ class NormalizeNameFunction(dbops.Function):
             args=[('name', 'text')],
             returns='text',
             volatility='immutable',
+            parallel='safe',
             language='sql',
             text=self.__class__.text)
 
@@ -734,6 +760,7 @@ class NullIfArrayNullsFunction(dbops.Function):
             args=[('a', 'anyarray')],
             returns='anyarray',
             volatility='stable',
+            parallel='safe',
             language='sql',
             text='''
                 SELECT CASE WHEN array_position(a, NULL) IS NULL
@@ -839,6 +866,7 @@ class IntrospectIndexesFunction(dbops.Function):
             returns=('edgedb', 'intro_index_desc_t'),
             set_returning=True,
             volatility='stable',
+            parallel='safe',
             language='sql',
             text=self.__class__.text)
 
@@ -974,6 +1002,7 @@ class IntrospectTriggersFunction(dbops.Function):
             returns=('edgedb', 'intro_trigger_desc_t'),
             set_returning=True,
             volatility='stable',
+            parallel='safe',
             language='sql',
             text=self.__class__.text)
 
@@ -1053,6 +1082,54 @@ class GetTableDescendantsFunction(dbops.Function):
             returns=('edgedb', 'intro_tab_inh_t'),
             set_returning=True,
             volatility='stable',
+            parallel='safe',
+            language='sql',
+            text=self.__class__.text)
+
+
+class ApproximateCountFunction(dbops.Function):
+    """Estimate the number of rows in the tables of an inheritance view."""
+
+    # The view is a UNION ALL over the tables of a type and all its
+    # descendants, which the view depends on.  Row counts are estimated
+    # like the planner does it: the tuple density recorded by the last
+    # VACUUM or ANALYZE is applied to the current size of the table.
+    text = '''
+        SELECT
+            coalesce(sum(
+                CASE WHEN c.relpages > 0
+                THEN c.reltuples / c.relpages * (
+                    pg_relation_size(c.oid)
+                    / current_setting('block_size')::int
+                )
+                ELSE greatest(c.reltuples, 0)
+                END
+            ), 0)::bigint
+        FROM
+            pg_class c
+        WHERE
+            c.relkind = 'r'
+            AND c.oid IN (
+                SELECT
+                    d.refobjid
+                FROM
+                    pg_rewrite r
+                    INNER JOIN pg_depend d
+                        ON d.classid = 'pg_rewrite'::regclass
+                        AND d.objid = r.oid
+                        AND d.refclassid = 'pg_class'::regclass
+                WHERE
+                    r.ev_class = $1
+            )
+    '''
+
+    def __init__(self) -> None:
+        super().__init__(
+            name=('edgedb', '_approximate_count'),
+            args=[('inhview', ('regclass',))],
+            returns=('bigint',),
+            volatility='stable',
+            parallel='safe',
             language='sql',
             text=self.__class__.text)
 
@@ -1108,6 +1185,7 @@ class ParseTriggerConditionFunction(dbops.Function):
             ],
             returns='text',
             volatility='stable',
+            parallel='safe',
             language='plpgsql',
             text=self.__class__.text)
 
@@ -1130,6 +1208,7 @@ class NormalizeArrayIndexFunction(dbops.Function):
             args=[('index', ('bigint',)), ('length', ('int',))],
             returns=('int',),
             volatility='immutable',
+            parallel='safe',
             strict=True,
             text=self.text)
 
@@ -1153,6 +1232,7 @@ class ArrayIndexWithBoundsFunction(dbops.Function):
             returns=('anyelement',),
             # Same volatility as _raise_exception_on_null
             volatility='stable',
+            parallel='safe',
             strict=True,
             text=self.text)
 
@@ -1183,6 +1263,7 @@ class ArraySliceFunction(dbops.Function):
                   ('stop', ('bigint',))],
             returns=('anyarray',),
             volatility='immutable',
+            parallel='safe',
             text=self.text)
 
 
@@ -1208,6 +1289,7 @@ class StringIndexWithBoundsFunction(dbops.Function):
             returns=('text',),
             # Same volatility as _raise_exception_on_empty
             volatility='stable',
+            parallel='safe',
             strict=True,
             text=self.text)
 
@@ -1234,6 +1316,7 @@ class BytesIndexWithBoundsFunction(dbops.Function):
             returns=('bytea',),
             # Same volatility as _raise_exception_on_empty
             volatility='stable',
+            parallel='safe',
             strict=True,
             text=self.text)
 
@@ -1255,6 +1338,7 @@ class SubstrProxyFunction(dbops.Function):
                   ('length', ('int',))],
             returns=('anyelement',),
             volatility='immutable',
+            parallel='safe',
             strict=True,
             text=self.text)
 
@@ -1271,6 +1355,7 @@ class LengthStringProxyFunction(dbops.Function):
             args=[('val', ('text',))],
             returns=('int',),
             volatility='immutable',
+            parallel='safe',
             strict=True,
             text=self.text)
 
@@ -1287,6 +1372,7 @@ class LengthBytesProxyFunction(dbops.Function):
             args=[('val', ('bytea',))],
             returns=('int',),
             volatility='immutable',
+            parallel='safe',
             strict=True,
             text=self.text)
 
@@ -1331,6 +1417,7 @@ class StringSliceImplFunction(dbops.Function):
             ],
             returns=('anyelement',),
             volatility='immutable',
+            parallel='safe',
             text=self.text)
 
 
@@ -1349,6 +1436,7 @@ class StringSliceFunction(dbops.Function):
             ],
             returns=('text',),
             volatility='immutable',
+            parallel='safe',
             text=self.text)
 
 
@@ -1367,6 +1455,7 @@ class BytesSliceFunction(dbops.Function):
             ],
             returns=('bytea',),
             volatility='immutable',
+            parallel='safe',
             text=self.text)
 
 
@@ -1412,6 +1501,7 @@ class JSONIndexByTextFunction(dbops.Function):
             returns=('jsonb',),
             # Same volatility as exception helpers
             volatility='stable',
+            parallel='safe',
             strict=True,
             text=self.text)
 
@@ -1457,6 +1547,7 @@ class JSONIndexByIntFunction(dbops.Function):
             returns=('jsonb',),
             # Min volatility of exception helpers and pg_typeof (stable).
             volatility='stable',
+            parallel='safe',
             strict=True,
             text=self.text)
 
@@ -1482,6 +1573,7 @@ class JSONSliceFunction(dbops.Function):
             returns=('jsonb',),
             # Same volatility as to_jsonb (stable)
             volatility='stable',
+            parallel='safe',
             text=self.text)
 
 
@@ -1527,6 +1619,7 @@ class DatetimeInFunction(dbops.Function):
             returns=('timestamptz',),
             # Same volatility as _raise_specific_exception (stable)
             volatility='stable',
+            parallel='safe',
             text=self.text)
 
 
@@ -1562,6 +1655,7 @@ class DurationInFunction(dbops.Function):
             returns=('interval',),
             # Same volatility as _raise_specific_exception (stable)
             volatility='stable',
+            parallel='safe',
             text=self.text)
 
 
@@ -1598,6 +1692,7 @@ class LocalDatetimeInFunction(dbops.Function):
             returns=('timestamp',),
             # Same volatility as _raise_specific_exception (stable)
             volatility='stable',
+            parallel='safe',
             text=self.text)
 
 
@@ -1632,6 +1727,7 @@ class LocalDateInFunction(dbops.Function):
             returns=('date',),
             # Same volatility as _raise_specific_exception (stable)
             volatility='stable',
+            parallel='safe',
             text=self.text)
 
 
@@ -1666,6 +1762,7 @@ class LocalTimeInFunction(dbops.Function):
             returns=('time',),
             # Same volatility as _raise_specific_exception (stable)
             volatility='stable',
+            parallel='safe',
             text=self.text)
 
 
@@ -1730,6 +1827,9 @@ class ToTimestampTZCheck(dbops.Function):
             returns=('timestamptz',),
             # We're relying on changing settings, so it's volatile.
             volatility='volatile',
+            # Changes the TimeZone setting, which cannot be done
+            # in a parallel worker.
+            parallel='unsafe',
             language='plpgsql',
             text=self.text)
 
@@ -1767,6 +1867,7 @@ class ToDatetimeFunction(dbops.Function):
             returns=('timestamptz',),
             # Same as _to_timestamptz_check.
             volatility='volatile',
+            parallel='unsafe',
             text=self.text)
 
 
@@ -1801,6 +1902,7 @@ class ToLocalDatetimeFunction(dbops.Function):
             returns=('timestamp',),
             # Same as _to_timestamptz_check.
             volatility='volatile',
+            parallel='unsafe',
             text=self.text)
 
 
@@ -1835,6 +1937,7 @@ class StrToBool(dbops.Function):
             returns=('bool',),
             # Stable because it's raising exceptions.
             volatility='stable',
+            parallel='safe',
             text=self.text)
 
 
@@ -1854,6 +1957,7 @@ class QuoteLiteralFunction(dbops.Function):
             args=[('val', ('text',))],
             returns=('str',),
             volatility='immutable',
+            parallel='safe',
             text=self.text)
 
 
@@ -1904,6 +2008,8 @@ class ConfigObjectAsDDLFunction(dbops.Function):
             returns=('text'),
             # Stable because it's raising exceptions.
             volatility='stable',
+            # Reads the configuration via _read_sys_config.
+            parallel='restricted',
             text=text)
 
 
@@ -1951,6 +2057,8 @@ class DescribeSystemConfigAsDDLFunction(dbops.Function):
             returns=('text'),
             # Stable because it's raising exceptions.
             volatility='stable',
+            # Reads the configuration via _read_sys_config.
+            parallel='restricted',
             text=text)
 
 
@@ -1968,6 +2076,7 @@ class QuoteIdentFunction(dbops.Function):
             returns=('text',),
             # Stable because it's raising exceptions.
             volatility='stable',
+            parallel='safe',
             text=self.text,
         )
 
@@ -2055,6 +2164,7 @@ class DescribeRolesAsDDLFunction(dbops.Function):
             returns=('text'),
             # Stable because it's raising exceptions.
             volatility='stable',
+            parallel='safe',
             text=text)
 
 
@@ -2188,6 +2298,8 @@ class SysConfigFunction(dbops.Function):
             set_returning=True,
             language='plpgsql',
             volatility='volatile',
+            # Temporary tables are not accessible to parallel workers.
+            parallel='restricted',
             text=self.text,
         )
 
@@ -2211,6 +2323,36 @@ class SysVersionFunction(dbops.Function):
             returns=('jsonb',),
             language='plpgsql',
             volatility='stable',
+            # Same as _read_sys_config.
+            parallel='restricted',
+            text=self.text,
+        )
+
+
+class SysQueryStatsFunction(dbops.Function):
+
+    # The statistics are collected by the server, which stores them in
+    # "_edgecon_state" before running a query that reads sys::QueryStats.
+
+    text = f'''
+        BEGIN
+        RETURN (
+            SELECT value::jsonb
+            FROM _edgecon_state
+            WHERE name = 'query_stats' AND type = 'R'
+        );
+        END;
+    '''
+
+    def __init__(self) -> None:
+        super().__init__(
+            name=('edgedb', '_read_query_stats'),
+            args=[],
+            returns=('jsonb',),
+            language='plpgsql',
+            volatility='stable',
+            # Same as _read_sys_config.
+            parallel='restricted',
             text=self.text,
         )
 
@@ -2230,6 +2372,7 @@ class SysGetTransactionIsolation(dbops.Function):
             returns=('text',),
             # This function only reads from a table.
             volatility='stable',
+            parallel='safe',
             text=self.text)
 
 
@@ -2254,6 +2397,7 @@ class GetCachedReflection(dbops.Function):
             set_returning=True,
             # This function only reads from a table.
             volatility='stable',
+            parallel='safe',
             text=self.text,
         )
 
@@ -2281,6 +2425,7 @@ class GetBaseScalarTypeMap(dbops.Function):
             returns=('record',),
             set_returning=True,
             volatility='immutable',
+            parallel='safe',
             text=self.text,
         )
 
@@ -2325,6 +2470,7 @@ async def bootstrap(conn):
         dbops.CreateFunction(StrToFloat64NoInline()),
         dbops.CreateFunction(StrToFloat32NoInline()),
         dbops.CreateFunction(GetTableDescendantsFunction()),
+        dbops.CreateFunction(ApproximateCountFunction()),
         dbops.CreateFunction(ParseTriggerConditionFunction()),
         dbops.CreateFunction(NormalizeArrayIndexFunction()),
         dbops.CreateFunction(ArrayIndexWithBoundsFunction()),
@@ -2352,6 +2498,7 @@ async def bootstrap(conn):
         dbops.CreateCompositeType(SysConfigValueType()),
         dbops.CreateFunction(SysConfigFunction()),
         dbops.CreateFunction(SysVersionFunction()),
+        dbops.CreateFunction(SysQueryStatsFunction()),
         dbops.CreateFunction(SysGetTransactionIsolation()),
         dbops.CreateFunction(GetCachedReflection()),
         dbops.CreateFunction(GetBaseScalarTypeMap()),
@@ -2487,6 +2634,54 @@ def _generate_database_views(schema):
     return views
 
 
+def _generate_query_stats_views(schema):
+    QueryStats = schema.get('sys::QueryStats')
+
+    view_query = f'''
+        SELECT
+            edgedbext.uuid_generate_v5(
+                '{DATABASE_ID_NAMESPACE}'::uuid,
+                s.query
+            )                                           AS id,
+            (SELECT id FROM edgedb."_SchemaObjectType"
+                 WHERE name = 'sys::QueryStats')        AS __type__,
+            s.query                                     AS query,
+            s.calls                                     AS calls,
+            s.rows                                      AS rows,
+            make_interval(secs => s.total_exec_time)    AS total_exec_time,
+            make_interval(
+                secs => s.total_exec_time / greatest(s.calls, 1)
+            )                                           AS mean_exec_time,
+            make_interval(secs => s.max_exec_time)      AS max_exec_time,
+            s.compiles                                  AS compiles,
+            make_interval(secs => s.total_compile_time)
+                                                        AS total_compile_time,
+            s.compile_phase_times                       AS compile_phase_times,
+            s.cache_hits                                AS cache_hits,
+            (s.cache_hits::float8 /
+                greatest(s.cache_hits + s.compiles, 1)) AS cache_hit_ratio
+        FROM
+            jsonb_to_recordset(
+                coalesce(edgedb._read_query_stats(), '[]'::jsonb)
+            ) AS s(
+                query text,
+                calls bigint,
+                rows bigint,
+                total_exec_time float8,
+                max_exec_time float8,
+                compiles bigint,
+                total_compile_time float8,
+                compile_phase_times jsonb,
+                cache_hits bigint
+            )
+    '''
+
+    return [
+        dbops.View(name=tabname(schema, QueryStats), query=view_query),
+        dbops.View(name=inhviewname(schema, QueryStats), query=view_query),
+    ]
+
+
 def _generate_role_views(schema, *, superuser_role):
     Role = schema.get('sys::Role')
 
@@ -2698,6 +2893,9 @@ async def generate_support_views(cluster, conn, schema):
     for roleview in _generate_role_views(schema, superuser_role=su_role):
         commands.add_command(dbops.CreateView(roleview, or_replace=True))
 
+    for statsview in _generate_query_stats_views(schema):
+        commands.add_command(dbops.CreateView(statsview, or_replace=True))
+
     block = dbops.PLTopBlock()
     commands.generate(block)
     await _execute_block(conn, block)
@@ -25,6 +25,7 @@ from edb import errors
 from edb.common import ast
 from edb.edgeql import ast as qlast
 from edb.edgeql import compiler as qlcompiler
+from edb.edgeql import qltypes
 
 from . import abc as s_abc
 from . import annos as s_anno
@@ -37,6 +38,7 @@ from . import referencing
 
 
 if TYPE_CHECKING:
+    from . import scalars as s_scalars
     from . import schema as s_schema
     from . import types as s_types
 
@@ -62,6 +64,33 @@ class Index(referencing.ReferencedInheritingObject, s_anno.AnnotationSubject):
         ephemeral=True,
     )
 
+    # Backend index access method.
+    kind = so.SchemaField(
+        qltypes.IndexKind,
+        default=qltypes.IndexKind.BTREE,
+        coerce=True,
+        compcoef=0.909,
+        allow_ddl_set=True,
+    )
+
+    # Optional filter expression for a partial index.
+    predicate = so.SchemaField(
+        s_expr.Expression,
+        default=None,
+        coerce=True,
+        compcoef=0.909,
+        allow_ddl_set=True,
+    )
+
+    # Build the backend index without locking out writes to the
+    # indexed table.  Only affects the DDL command creating the index.
+    build_concurrently = so.SchemaField(
+        bool,
+        default=False,
+        allow_ddl_set=True,
+        ephemeral=True,
+    )
+
     def __repr__(self) -> str:
         cls = self.__class__
         return '<{}.{} {!r} at 0x{:x}>'.format(
@@ -260,6 +289,70 @@ class IndexCommand(
         else:
             return None
 
+    def compile_expr_field(
+        self,
+        schema: s_schema.Schema,
+        context: sd.CommandContext,
+        field: so.Field[Any],
+        value: s_expr.Expression,
+    ) -> s_expr.Expression:
+        from . import objtypes as s_objtypes
+
+        singletons: List[s_types.Type]
+        if field.name in {'expr', 'predicate'}:
+            # type ignore below, for the class is used as mixin
+            parent_ctx = context.get_ancestor(
+                IndexSourceCommandContext,  # type: ignore
+                self
+            )
+            assert parent_ctx is not None
+            assert isinstance(parent_ctx.op, sd.ObjectCommand)
+            subject_name = parent_ctx.op.classname
+            subject = schema.get(subject_name, default=None)
+
+            if isinstance(subject, s_abc.Pointer):
+                singletons = []
+                path_prefix_anchor = None
+            else:
+                assert isinstance(subject, s_objtypes.ObjectType)
+                singletons = [subject]
+                path_prefix_anchor = qlast.Subject().name
+
+            expr = type(value).compiled(
+                value,
+                schema=schema,
+                options=qlcompiler.CompilerOptions(
+                    modaliases=context.modaliases,
+                    schema_object_context=self.get_schema_metaclass(),
+                    anchors={qlast.Subject().name: subject},
+                    path_prefix_anchor=path_prefix_anchor,
+                    singletons=frozenset(singletons),
+                ),
+            )
+
+            if field.name == 'predicate':
+                bool_t: s_scalars.ScalarType = schema.get('std::bool')
+                expr_type = expr.irast.stype
+                if not expr_type.issubclass(expr.irast.schema, bool_t):
+                    raise errors.SchemaDefinitionError(
+                        f'index predicate expected to return a bool '
+                        f'value, got '
+                        f'{expr_type.get_verbosename(expr.irast.schema)}',
+                        context=self.get_attribute_source_context(
+                            'predicate'),
+                    )
+
+            # Check that the inferred cardinality is no more than 1
+            if expr.irast.cardinality.is_multi():
+                raise errors.ResultCardinalityMismatchError(
+                    f'possibly more than one element returned by '
+                    f'the index {field.name} where only singletons '
+                    f'are allowed')
+
+            return expr
+        else:
+            return super().compile_expr_field(schema, context, field, value)
+
 
 class CreateIndex(
     IndexCommand,
@@ -290,6 +383,23 @@ class CreateIndex(
 
         return cmd
 
+    def _propagate_ref_creation(
+        self,
+        schema: s_schema.Schema,
+        context: sd.CommandContext,
+        referrer: so.InheritingObject,
+    ) -> s_schema.Schema:
+        schema = super()._propagate_ref_creation(schema, context, referrer)
+
+        if self.get_attribute_value('build_concurrently'):
+            # The copies of the index on the descendants of the
+            # referrer must not lock their tables either.
+            for alter in self.get_subcommands(type=sd.AlterObject):
+                for create in alter.get_subcommands(type=CreateIndex):
+                    create.set_attribute_value('build_concurrently', True)
+
+        return schema
+
     @classmethod
     def as_inherited_ref_ast(
         cls,
@@ -313,58 +423,6 @@ class CreateIndex(
             expr=expr_ql,
         )
 
-    def compile_expr_field(
-        self,
-        schema: s_schema.Schema,
-        context: sd.CommandContext,
-        field: so.Field[Any],
-        value: s_expr.Expression,
-    ) -> s_expr.Expression:
-        from . import objtypes as s_objtypes
-
-        singletons: List[s_types.Type]
-        if field.name == 'expr':
-            # type ignore below, for the class is used as mixin
-            parent_ctx = context.get_ancestor(
-                IndexSourceCommandContext,  # type: ignore
-                self
-            )
-            assert parent_ctx is not None
-            assert isinstance(parent_ctx.op, sd.ObjectCommand)
-            subject_name = parent_ctx.op.classname
-            subject = schema.get(subject_name, default=None)
-
-            if isinstance(subject, s_abc.Pointer):
-                singletons = []
-                path_prefix_anchor = None
-            else:
-                assert isinstance(subject, s_objtypes.ObjectType)
-                singletons = [subject]
-                path_prefix_anchor = qlast.Subject().name
-
-            expr = type(value).compiled(
-                value,
-                schema=schema,
-                options=qlcompiler.CompilerOptions(
-                    modaliases=context.modaliases,
-                    schema_object_context=self.get_schema_metaclass(),
-                    anchors={qlast.Subject().name: subject},
-                    path_prefix_anchor=path_prefix_anchor,
-                    singletons=frozenset(singletons),
-                ),
-            )
-
-            # Check that the inferred cardinality is no more than 1
-            if expr.irast.cardinality.is_multi():
-                raise errors.ResultCardinalityMismatchError(
-                    f'possibly more than one element returned by '
-                    f'the index expression where only singletons '
-                    f'are allowed')
-
-            return expr
-        else:
-            return super().compile_expr_field(schema, context, field, value)
-
 
 class RenameIndex(
     IndexCommand,
@@ -477,6 +477,9 @@ class ObjectMeta(type):
     _hashable_fields: Set[Field[Any]]  # if f.is_schema_field and f.hashable
     _sorted_fields: collections.OrderedDict[str, Field[Any]]
     _object_fields: FrozenSet[Field[Any]]
+    # Maps schema field names to positions in the tuple that holds
+    # object data in the schema (see Schema._id_to_data).
+    _schema_field_slots: Dict[str, int]
     _refdicts: collections.OrderedDict[str, RefDict]
     _refdicts_by_refclass: Dict[type, RefDict]
     _refdicts_by_field: Dict[str, RefDict]  # key is rd.attr
@@ -557,6 +560,12 @@ class ObjectMeta(type):
             sorted(fields.items(), key=lambda e: e[0]))
         # Populated lazily
         cls._object_fields = _EMPTY_FIELD_FROZENSET
+        cls._schema_field_slots = {
+            fn: i for i, fn in enumerate(
+                fn for fn, f in cls._sorted_fields.items()
+                if f.is_schema_field
+            )
+        }
 
         fa = '{}.{}_fields'.format(cls.__module__, cls.__name__)
         setattr(cls, fa, myfields)
@@ -636,6 +645,21 @@ class ObjectMeta(type):
             )
         return cls._object_fields
 
+    def get_schema_field_slots(cls) -> Mapping[str, int]:
+        return cls._schema_field_slots
+
+    def make_schema_data(cls, data: Mapping[str, Any]) -> Tuple[Any, ...]:
+        """Convert a mapping of schema field values into a data tuple.
+
+        The tuple has a slot for every schema field of the class, unset
+        fields are None.
+        """
+        slots = cls._schema_field_slots
+        result = [None] * len(slots)
+        for field_name, value in data.items():
+            result[slots[field_name]] = value
+        return tuple(result)
+
     def has_field(cls, name: str) -> bool:
         return name in cls._fields
 
@@ -927,7 +951,7 @@ class Object(s_abc.Object, s_abc.ObjectContainer, metaclass=ObjectMeta):
         *,
         allow_default: bool = True,
     ) -> Any:
-        val = schema._get_obj_field(self.id, field_name)
+        val = schema._get_obj_field(self, field_name)
         if val is not None:
             return val
 
@@ -972,7 +996,7 @@ class Object(s_abc.Object, s_abc.ObjectContainer, metaclass=ObjectMeta):
         field = type(self).get_field(field_name)
 
         if field.is_schema_field:
-            val = schema._get_obj_field(self.id, field_name)
+            val = schema._get_obj_field(self, field_name)
             if val is not None:
                 return val
             elif default is not NoDefault:
@@ -1034,7 +1058,7 @@ class Object(s_abc.Object, s_abc.ObjectContainer, metaclass=ObjectMeta):
         sig: List[Union[Type[Object_T], Tuple[str, Any]]] = [cls]
         for f in cls._hashable_fields:
             fn = f.name
-            val = schema._get_obj_field(self.id, fn)
+            val = schema._get_obj_field(self, fn)
             if val is None:
                 continue
             sig.append((fn, val))
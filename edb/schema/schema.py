@@ -45,6 +45,10 @@ if TYPE_CHECKING:
     import uuid
     from edb.common import parsing
 
+    # Schema field values of an object, laid out according to
+    # ObjectMeta.get_schema_field_slots().
+    ObjectData = Tuple[Any, ...]
+
     Refs_T = immu.Map[
         uuid.UUID,
         immu.Map[
@@ -62,7 +66,7 @@ _void = object()
 
 class Schema(s_abc.Schema):
 
-    _id_to_data: immu.Map[uuid.UUID, immu.Map[str, Any]]
+    _id_to_data: immu.Map[uuid.UUID, ObjectData]
     _id_to_type: immu.Map[uuid.UUID, so.Object]
     _name_to_id: immu.Map[str, uuid.UUID]
     _shortname_to_id: immu.Map[
@@ -85,7 +89,7 @@ class Schema(s_abc.Schema):
     def _replace(
         self,
         *,
-        id_to_data: Optional[immu.Map[uuid.UUID, immu.Map[str, Any]]] = None,
+        id_to_data: Optional[immu.Map[uuid.UUID, ObjectData]] = None,
         id_to_type: Optional[immu.Map[uuid.UUID, so.Object]] = None,
         name_to_id: Optional[immu.Map[str, uuid.UUID]] = None,
         shortname_to_id: Optional[
@@ -206,35 +210,33 @@ class Schema(s_abc.Schema):
         if not updates:
             return self
 
+        scls = self._id_to_type[obj_id]
+        slots = type(scls).get_schema_field_slots()
+
         try:
             data = self._id_to_data[obj_id]
         except KeyError:
-            data = immu.Map()
+            data = (None,) * len(slots)
 
         name_to_id = None
         shortname_to_id = None
         globalname_to_id = None
-        with data.mutate() as mm:
-            for field, value in updates.items():
-                if field == 'name':
-                    name_to_id, shortname_to_id, globalname_to_id = (
-                        self._update_obj_name(
-                            obj_id,
-                            self._id_to_type[obj_id],
-                            mm.get('name'),
-                            value
-                        )
+        new_data = list(data)
+        for field, value in updates.items():
+            idx = slots[field]
+            if field == 'name':
+                name_to_id, shortname_to_id, globalname_to_id = (
+                    self._update_obj_name(
+                        obj_id,
+                        scls,
+                        new_data[idx],
+                        value
                     )
+                )
 
-                if value is None:
-                    mm.pop(field, None)
-                else:
-                    mm[field] = value
-
-            new_data = mm.finish()
+            new_data[idx] = value
 
-        id_to_data = self._id_to_data.set(obj_id, new_data)
-        scls = self._id_to_type[obj_id]
+        id_to_data = self._id_to_data.set(obj_id, tuple(new_data))
         refs_to = self._update_refs_to(scls, data, new_data)
         return self._replace(name_to_id=name_to_id,
                              shortname_to_id=shortname_to_id,
@@ -244,17 +246,17 @@ class Schema(s_abc.Schema):
 
     def _get_obj_field(
         self,
-        obj_id: uuid.UUID,
+        obj: so.Object,
         field: str,
     ) -> Any:
         try:
-            d = self._id_to_data[obj_id]
+            d = self._id_to_data[obj.id]
         except KeyError:
-            err = (f'cannot get {field!r} value: item {str(obj_id)!r} '
+            err = (f'cannot get {field!r} value: item {str(obj.id)!r} '
                    f'is not present in the schema {self!r}')
             raise errors.SchemaError(err) from None
 
-        return d.get(field)
+        return d[type(obj)._schema_field_slots[field]]
 
     def _set_obj_field(
         self,
@@ -269,30 +271,26 @@ class Schema(s_abc.Schema):
                    f'is not present in the schema {self!r}')
             raise errors.SchemaError(err) from None
 
+        scls = self._id_to_type[obj_id]
+        idx = type(scls).get_schema_field_slots()[field]
+
         name_to_id = None
         shortname_to_id = None
         globalname_to_id = None
         if field == 'name':
-            old_name = data.get('name')
+            old_name = data[idx]
             name_to_id, shortname_to_id, globalname_to_id = (
                 self._update_obj_name(
                     obj_id,
-                    self._id_to_type[obj_id],
+                    scls,
                     old_name,
                     value
                 )
             )
 
-        new_data = data.set(field, value)
+        new_data = data[:idx] + (value,) + data[idx + 1:]
         id_to_data = self._id_to_data.set(obj_id, new_data)
-        scls = self._id_to_type[obj_id]
-
-        if field in data:
-            orig_field_data = {field: data[field]}
-        else:
-            orig_field_data = {}
-
-        refs_to = self._update_refs_to(scls, orig_field_data, {field: value})
+        refs_to = self._update_refs_to(scls, data, new_data)
 
         return self._replace(name_to_id=name_to_id,
                              shortname_to_id=shortname_to_id,
@@ -310,29 +308,27 @@ class Schema(s_abc.Schema):
         except KeyError:
             return self
 
+        scls = self._id_to_type[obj_id]
+        idx = type(scls).get_schema_field_slots()[field]
+        if data[idx] is None:
+            return self
+
         name_to_id = None
         shortname_to_id = None
         globalname_to_id = None
-        name = data.get('name')
-        if field == 'name' and name is not None:
+        if field == 'name':
             name_to_id, shortname_to_id, globalname_to_id = (
                 self._update_obj_name(
                     obj_id,
-                    self._id_to_type[obj_id],
-                    name,
+                    scls,
+                    data[idx],
                     None
                 )
             )
-            new_data = data.delete(field)
-        else:
-            try:
-                new_data = data.delete(field)
-            except KeyError:
-                return self
 
+        new_data = data[:idx] + (None,) + data[idx + 1:]
         id_to_data = self._id_to_data.set(obj_id, new_data)
-        scls = self._id_to_type[obj_id]
-        refs_to = self._update_refs_to(scls, {field: data[field]}, None)
+        refs_to = self._update_refs_to(scls, data, new_data)
 
         return self._replace(name_to_id=name_to_id,
                              shortname_to_id=shortname_to_id,
@@ -343,51 +339,27 @@ class Schema(s_abc.Schema):
     def _update_refs_to(
         self,
         scls: so.Object,
-        orig_data: Optional[Mapping[str, Any]],
-        new_data: Optional[Mapping[str, Any]],
+        orig_data: Optional[Sequence[Any]],
+        new_data: Optional[Sequence[Any]],
     ) -> Refs_T:
         scls_type = type(scls)
         objfields = scls_type.get_object_fields()
         if not objfields:
             return self._refs_to
 
+        slots = scls_type.get_schema_field_slots()
+
         with self._refs_to.mutate() as mm:
             for field in objfields:
-                if not new_data:
-                    ids = None
-                else:
-                    try:
-                        ref = new_data[field.name]
-                    except KeyError:
-                        ids = None
-                    else:
-                        if isinstance(ref, so.ObjectCollection):
-                            ids = frozenset(ref.ids(self))
-                        elif isinstance(ref, s_expr.Expression):
-                            if ref.refs:
-                                ids = frozenset(ref.refs.ids(self))
-                            else:
-                                ids = frozenset()
-                        else:
-                            ids = frozenset((ref.id,))
+                idx = slots[field.name]
+                ref = new_data[idx] if new_data else None
+                orig_ref = orig_data[idx] if orig_data else None
 
-                if not orig_data:
-                    orig_ids = None
-                else:
-                    try:
-                        ref = orig_data[field.name]
-                    except KeyError:
-                        orig_ids = None
-                    else:
-                        if isinstance(ref, so.ObjectCollection):
-                            orig_ids = frozenset(ref.ids(self))
-                        elif isinstance(ref, s_expr.Expression):
-                            if ref.refs:
-                                orig_ids = frozenset(ref.refs.ids(self))
-                            else:
-                                orig_ids = frozenset()
-                        else:
-                            orig_ids = frozenset((ref.id,))
+                if ref is orig_ref:
+                    continue
+
+                ids = self._get_ref_ids(ref)
+                orig_ids = self._get_ref_ids(orig_ref)
 
                 if not ids and not orig_ids:
                     continue
@@ -435,6 +407,19 @@ class Schema(s_abc.Schema):
 
             return mm.finish()
 
+    def _get_ref_ids(self, ref: Any) -> Optional[FrozenSet[uuid.UUID]]:
+        if ref is None:
+            return None
+        elif isinstance(ref, so.ObjectCollection):
+            return frozenset(ref.ids(self))
+        elif isinstance(ref, s_expr.Expression):
+            if ref.refs:
+                return frozenset(ref.refs.ids(self))
+            else:
+                return frozenset()
+        else:
+            return frozenset((ref.id,))
+
     def _add(
         self,
         id: uuid.UUID,
@@ -448,18 +433,18 @@ class Schema(s_abc.Schema):
                 f'{type(scls).__name__} {name!r} is already present '
                 f'in the schema {self!r}')
 
-        data = immu.Map(data)
+        obj_data = type(scls).make_schema_data(data)
 
         name_to_id, shortname_to_id, globalname_to_id = self._update_obj_name(
             id, scls, None, name)
 
         updates = dict(
-            id_to_data=self._id_to_data.set(id, data),
+            id_to_data=self._id_to_data.set(id, obj_data),
             id_to_type=self._id_to_type.set(id, scls),
             name_to_id=name_to_id,
             shortname_to_id=shortname_to_id,
             globalname_to_id=globalname_to_id,
-            refs_to=self._update_refs_to(scls, None, data),
+            refs_to=self._update_refs_to(scls, None, obj_data),
         )
 
         if (isinstance(scls, so.QualifiedObject)
@@ -475,14 +460,14 @@ class Schema(s_abc.Schema):
             raise errors.InvalidReferenceError(
                 f'cannot delete {obj!r}: not in this schema')
 
-        name = data['name']
+        name = data[type(obj).get_schema_field_slots()['name']]
 
         updates = {}
 
         name_to_id, shortname_to_id, globalname_to_id = self._update_obj_name(
             obj.id, self._id_to_type[obj.id], name, None)
 
-        refs_to = self._update_refs_to(obj, self._id_to_data[obj.id], None)
+        refs_to = self._update_refs_to(obj, data, None)
 
         updates.update(dict(
             name_to_id=name_to_id,
@@ -0,0 +1,239 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2020-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Admission control for backend (Postgres) connections.
+
+Every backend connection opened by the server, regardless of the port
+it is opened for, occupies a slot in a single AdmissionController.
+When all slots are taken, requests for new connections are queued.
+Queued requests are granted in a round-robin fashion: first across
+databases, then across roles within a database, so that a burst of
+requests from one tenant cannot starve the others.  A request that
+could not be granted within the queue timeout, or that arrives when
+the queue is full, is rejected with BackendUnavailableError, which
+clients are expected to retry.
+
+Compiler workers run in separate processes and cannot use the
+AdmissionController.  The server reserves a few of its backend
+connections for them instead (see COMPILER_BACKEND_CONNECTIONS in
+defines.py), and the workers share those through a set of
+BackendConnectionSlots.
+"""
+
+
+from __future__ import annotations
+from typing import *
+
+import asyncio
+import collections
+import contextlib
+import fcntl
+import os
+
+from edb import errors
+
+
+# How often a process waiting for a BackendConnectionSlots slot
+# checks whether one has been freed.
+_SLOT_POLL_INTERVAL = 0.05
+
+
+class AdmissionController:
+
+    _waiters: Dict[str, Dict[str, Deque[asyncio.Future]]]
+
+    def __init__(self, *, capacity: int, queue_timeout: float,
+                 max_queue_size: int):
+        if capacity <= 0:
+            raise ValueError('backend connection capacity must be positive')
+
+        self._capacity = capacity
+        self._queue_timeout = queue_timeout
+        self._max_queue_size = max_queue_size
+
+        self._used = 0
+        self._queued = 0
+
+        # dbname -> role -> waiters; both levels are kept in the
+        # order in which they are to be served.
+        self._waiters = collections.OrderedDict()
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def used(self) -> int:
+        return self._used
+
+    @property
+    def queued(self) -> int:
+        return self._queued
+
+    async def acquire(self, dbname: str, user: str, *,
+                      timeout: Optional[float] = None) -> None:
+        """Wait for a free backend connection slot.
+
+        The slot must be returned with release() once the backend
+        connection is closed.
+        """
+        if self._used < self._capacity and not self._queued:
+            self._used += 1
+            return
+
+        if self._queued >= self._max_queue_size:
+            raise errors.BackendUnavailableError(
+                'too many clients are waiting for a backend connection')
+
+        if timeout is None:
+            timeout = self._queue_timeout
+
+        waiter = asyncio.get_running_loop().create_future()
+        roles = self._waiters.get(dbname)
+        if roles is None:
+            roles = self._waiters[dbname] = collections.OrderedDict()
+        queue = roles.get(user)
+        if queue is None:
+            queue = roles[user] = collections.deque()
+        queue.append(waiter)
+        self._queued += 1
+
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            self._remove_waiter(dbname, user, waiter)
+            raise errors.BackendUnavailableError(
+                f'timed out after {timeout:g}s waiting for '
+                f'a backend connection') from None
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was granted, but the waiting task has been
+                # cancelled; pass the slot on.
+                self.release()
+            else:
+                self._remove_waiter(dbname, user, waiter)
+            raise
+
+    def release(self) -> None:
+        """Return a slot obtained with acquire()."""
+        waiter = self._next_waiter()
+        if waiter is None:
+            if self._used <= 0:
+                raise RuntimeError('backend connection slot released '
+                                   'more times than acquired')
+            self._used -= 1
+        else:
+            # Hand the slot over to the waiter directly, so that
+            # it cannot be taken by a newly arriving request.
+            waiter.set_result(None)
+
+    def _next_waiter(self) -> Optional[asyncio.Future]:
+        while self._waiters:
+            dbname, roles = next(iter(self._waiters.items()))
+            user, queue = next(iter(roles.items()))
+            waiter = queue.popleft()
+            self._queued -= 1
+
+            if queue:
+                roles.move_to_end(user)
+            else:
+                del roles[user]
+            if roles:
+                self._waiters.move_to_end(dbname)
+            else:
+                del self._waiters[dbname]
+
+            if not waiter.done():
+                return waiter
+
+        return None
+
+    def _remove_waiter(self, dbname: str, user: str,
+                       waiter: asyncio.Future) -> None:
+        roles = self._waiters.get(dbname)
+        if roles is None:
+            return
+        queue = roles.get(user)
+        if queue is None:
+            return
+        try:
+            queue.remove(waiter)
+        except ValueError:
+            return
+        self._queued -= 1
+        if not queue:
+            del roles[user]
+            if not roles:
+                del self._waiters[dbname]
+
+
+class BackendConnectionSlots:
+    """Backend connection slots shared by several processes.
+
+    A slot is an exclusive flock() on one of *size* files in
+    *dirname*.  The kernel drops the lock when its holder exits,
+    so a killed process never leaks a slot.  Instances are picklable
+    and are passed to compiler workers as is.
+    """
+
+    def __init__(self, *, dirname: str, size: int, timeout: float):
+        if size <= 0:
+            raise ValueError('backend connection slot count must be positive')
+
+        self._dirname = dirname
+        self._size = size
+        self._timeout = timeout
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @contextlib.asynccontextmanager
+    async def acquire(self) -> AsyncIterator[None]:
+        """Hold a slot for the duration of the async with block."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._timeout
+
+        fd = self._try_lock()
+        while fd is None:
+            if loop.time() >= deadline:
+                raise errors.BackendUnavailableError(
+                    f'timed out after {self._timeout:g}s waiting for '
+                    f'a backend connection')
+            await asyncio.sleep(_SLOT_POLL_INTERVAL)
+            fd = self._try_lock()
+
+        try:
+            yield
+        finally:
+            os.close(fd)
+
+    def _try_lock(self) -> Optional[int]:
+        for i in range(self._size):
+            path = os.path.join(self._dirname, f'backend-slot-{i}')
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+            except BaseException:
+                os.close(fd)
+                raise
+            else:
+                return fd
+        return None
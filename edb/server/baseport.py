@@ -64,6 +64,9 @@ class Port:
             'backend_instance_params': (
                 self.get_server().get_backend_instance_params()
             ),
+            'backend_connection_slots': (
+                self.get_server().get_compiler_backend_connection_slots()
+            ),
         }
 
     def get_compiler_worker_name(self):
@@ -72,23 +75,30 @@ class Port:
     async def new_compiler(self, dbname, dbver):
         compiler_worker = await self._compiler_manager.spawn_worker()
         try:
-            await compiler_worker.call('connect', dbname, dbver)
+            await compiler_worker.init('connect', dbname, dbver)
         except Exception:
             await compiler_worker.close()
             raise
         return compiler_worker
 
+    def signal_compiler_workers(self, signum):
+        if self._compiler_manager is not None:
+            self._compiler_manager.signal_workers(signum)
+
     async def start(self):
         if self._serving:
             raise RuntimeError('already serving')
         self._serving = True
 
+        max_requests, max_rss = self.get_server().get_compiler_worker_limits()
         self._compiler_manager = await procpool.create_manager(
             runstate_dir=self._internal_runstate_dir,
             worker_args=self.get_compiler_worker_args(),
             worker_cls=self.get_compiler_worker_cls(),
             name=self.get_compiler_worker_name(),
             pool_size=self._compiler_pool_size,
+            max_worker_requests=max_requests,
+            max_worker_rss=max_rss,
         )
 
     async def stop(self):
@@ -234,7 +234,7 @@ async def _store_static_bin_cache(cluster, key: str, data: bytes) -> None:
         RETURNS bytea
         AS $$
             SELECT {pg_common.quote_bytea_literal(data)};
-        $$ LANGUAGE SQL IMMUTABLE;
+        $$ LANGUAGE SQL IMMUTABLE PARALLEL SAFE;
     """
 
     dbconn = await cluster.connect(
@@ -254,7 +254,7 @@ async def _store_static_json_cache(cluster, key: str, data: str) -> None:
         RETURNS jsonb
         AS $$
             SELECT {pg_common.quote_literal(data)}::jsonb;
-        $$ LANGUAGE SQL IMMUTABLE;
+        $$ LANGUAGE SQL IMMUTABLE PARALLEL SAFE;
     """
 
     dbconn = await cluster.connect(
@@ -825,22 +825,22 @@ async def _compile_sys_queries(schema, compiler, cluster):
 
     queries['config'] = sql
 
-    role_query = '''
+    roles_query = '''
         SELECT sys::Role {
             name,
             is_superuser,
             password,
-        } FILTER .name = <str>$name;
+        };
     '''
     schema, sql = compile_bootstrap_script(
         compiler,
         schema,
-        role_query,
-        expected_cardinality_one=True,
+        roles_query,
+        expected_cardinality_one=False,
         single_statement=True,
     )
 
-    queries['role'] = sql
+    queries['roles'] = sql
 
     tids_query = '''
         SELECT schema::ScalarType {
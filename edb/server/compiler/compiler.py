@@ -21,10 +21,12 @@ from __future__ import annotations
 from typing import *
 
 import collections
+import contextlib
 import dataclasses
 import json
 import hashlib
 import pickle
+import time
 import uuid
 
 import asyncpg
@@ -33,6 +35,7 @@ import immutables
 from edb import errors
 from edb import _edgeql_rust
 
+from edb.server import admission
 from edb.server import defines
 from edb.server import tokenizer
 from edb.pgsql import compiler as pg_compiler
@@ -45,6 +48,7 @@ from edb.common import uuidgen
 from edb.edgeql import ast as qlast
 from edb.edgeql import codegen as qlcodegen
 from edb.edgeql import compiler as qlcompiler
+from edb.edgeql import parser as ql_parser
 from edb.edgeql import qltypes
 from edb.edgeql import quote as qlquote
 
@@ -75,6 +79,7 @@ from edb.server import config
 from . import dbstate
 from . import enums
 from . import errormech
+from . import explain
 from . import sertypes
 from . import status
 
@@ -86,6 +91,11 @@ class CompilerDatabaseState:
     schema: s_schema.Schema
     cached_reflection: immutables.Map[str, Tuple[str, ...]]
 
+    #: Parsed schema alias and computable expressions, shared
+    #: by all compilations against this database version.
+    schema_expr_cache: Dict[str, qlast.Expr] = dataclasses.field(
+        default_factory=dict)
+
 
 @dataclasses.dataclass(frozen=True)
 class BackendInstanceParams:
@@ -109,6 +119,24 @@ class CompileContext:
     first_extracted_var: Optional[int] = None
     backend_instance_params: BackendInstanceParams = BackendInstanceParams()
     compat_ver: Optional[verutils.Version] = None
+    #: Time spent in each compiler phase while compiling the current
+    #: statement, keyed by CompilePhase value.
+    phase_timings: Dict[str, float] = dataclasses.field(
+        default_factory=dict, compare=False)
+
+
+@contextlib.contextmanager
+def _timed_phase(
+    ctx: CompileContext,
+    phase: dbstate.CompilePhase,
+) -> Iterator[None]:
+    started_at = time.monotonic()
+    try:
+        yield
+    finally:
+        timings = ctx.phase_timings
+        timings[phase.value] = (
+            timings.get(phase.value, 0.0) + time.monotonic() - started_at)
 
 
 EMPTY_MAP = immutables.Map()
@@ -240,6 +268,8 @@ class BaseCompiler:
         *,
         backend_instance_params: BackendInstanceParams = (
             BackendInstanceParams()),
+        backend_connection_slots: Optional[
+            admission.BackendConnectionSlots] = None,
     ):
         self._connect_args = connect_args
         self._dbname = None
@@ -250,6 +280,9 @@ class BaseCompiler:
         self._schema_class_layout = None
         self._intro_query = None
         self._backend_instance_params = backend_instance_params
+        # None means that the number of backend connections is
+        # not limited (e.g. when bootstrapping).
+        self._backend_connection_slots = backend_connection_slots
 
     def _hash_sql(self, sql: bytes, **kwargs: bytes):
         h = hashlib.sha1(sql)
@@ -270,15 +303,34 @@ class BaseCompiler:
             cached_reflection=cached_reflection,
         )
 
-    async def new_connection(self):
-        con_args = self._connect_args.copy()
-        con_args['database'] = self._dbname
-        try:
-            return await asyncpg.connect(**con_args)
-        except asyncpg.InvalidCatalogNameError as ex:
-            raise errors.AuthenticationError(str(ex)) from ex
-        except Exception as ex:
-            raise errors.InternalServerError(str(ex)) from ex
+    @contextlib.asynccontextmanager
+    async def new_connection(
+        self,
+        dbname: Optional[str] = None,
+    ) -> AsyncIterator[asyncpg.Connection]:
+        """Connect to the backend for the duration of the block.
+
+        The connection holds one of the backend connection slots
+        shared by compiler workers until it is closed.
+        """
+        async with contextlib.AsyncExitStack() as stack:
+            if self._backend_connection_slots is not None:
+                await stack.enter_async_context(
+                    self._backend_connection_slots.acquire())
+
+            con_args = self._connect_args.copy()
+            con_args['database'] = dbname or self._dbname
+            try:
+                con = await asyncpg.connect(**con_args)
+            except asyncpg.InvalidCatalogNameError as ex:
+                raise errors.AuthenticationError(str(ex)) from ex
+            except Exception as ex:
+                raise errors.InternalServerError(str(ex)) from ex
+
+            try:
+                yield con
+            finally:
+                await con.close()
 
     async def introspect(
         self,
@@ -314,16 +366,13 @@ class BaseCompiler:
 
         self._cached_db = None
 
-        con = await self.new_connection()
-        try:
+        async with self.new_connection() as con:
             await self.ensure_initialized(con)
             schema = await self.introspect(con)
             cached_reflection = await self._load_reflection_cache(con)
             db = self._wrap_schema(dbver, schema, cached_reflection)
             self._cached_db = db
             return db
-        finally:
-            await con.close()
 
     async def ensure_initialized(self, con: asyncpg.Connection) -> None:
         if self._std_schema is None:
@@ -343,6 +392,18 @@ class BaseCompiler:
                 self._std_schema)
             config.set_settings(self._config_spec)
 
+    async def preload(self) -> None:
+        """Load the standard library and the parser specs ahead of time.
+
+        This is called once in the template process that compiler
+        workers are forked from (see procpool/template.py), so that
+        all workers share the loaded data copy-on-write.
+        """
+        ql_parser.preload()
+
+        async with self.new_connection(defines.EDGEDB_SUPERUSER_DB) as con:
+            await self.ensure_initialized(con)
+
     def get_std_schema(self) -> s_schema.Schema:
         if self._std_schema is None:
             raise AssertionError('compiler is not initialized')
@@ -368,10 +429,13 @@ class Compiler(BaseCompiler):
         *,
         backend_instance_params: BackendInstanceParams = (
             BackendInstanceParams()),
+        backend_connection_slots: Optional[
+            admission.BackendConnectionSlots] = None,
     ):
         super().__init__(
             connect_args,
             backend_instance_params=backend_instance_params,
+            backend_connection_slots=backend_connection_slots,
         )
 
         self._current_db_state = None
@@ -435,7 +499,7 @@ class Compiler(BaseCompiler):
         subblock = block.add_block()
         self._compile_schema_storage_in_delta(ctx, delta, subblock)
 
-        return block, new_types
+        return block, new_types, delta.concurrent_index_builds
 
     def _compile_schema_storage_in_delta(
         self,
@@ -589,23 +653,39 @@ class Compiler(BaseCompiler):
         # commands indicates that session mode is available
         session_mode = ctx.state.capability & (enums.Capability.TRANSACTION |
                                                enums.Capability.SESSION)
-        ir = qlcompiler.compile_ast_to_ir(
-            ql,
-            schema=current_tx.get_schema(),
-            options=qlcompiler.CompilerOptions(
-                modaliases=current_tx.get_modaliases(),
-                implicit_tid_in_shapes=implicit_fields,
-                implicit_id_in_shapes=implicit_fields,
-                constant_folding=not disable_constant_folding,
-                json_parameters=ctx.json_parameters,
-                implicit_limit=ctx.implicit_limit,
-                session_mode=session_mode,
-                allow_writing_protected_pointers=ctx.schema_reflection_mode,
-                introspection_schema_rewrites=not ctx.schema_reflection_mode,
-            ),
-        )
 
-        if ir.cardinality.is_single():
+        cached_db = self._cached_db
+        if cached_db is not None and cached_db.dbver == ctx.state.dbver:
+            schema_expr_cache = cached_db.schema_expr_cache
+        else:
+            schema_expr_cache = None
+
+        explain_stmt = None
+        if isinstance(ql, qlast.ExplainStmt):
+            explain_stmt = ql
+            ql = ql.query
+
+        with _timed_phase(ctx, dbstate.CompilePhase.QL_TO_IR):
+            ir = qlcompiler.compile_ast_to_ir(
+                ql,
+                schema=current_tx.get_schema(),
+                options=qlcompiler.CompilerOptions(
+                    modaliases=current_tx.get_modaliases(),
+                    implicit_tid_in_shapes=implicit_fields,
+                    implicit_id_in_shapes=implicit_fields,
+                    constant_folding=not disable_constant_folding,
+                    json_parameters=ctx.json_parameters,
+                    implicit_limit=ctx.implicit_limit,
+                    session_mode=session_mode,
+                    allow_writing_protected_pointers=(
+                        ctx.schema_reflection_mode),
+                    introspection_schema_rewrites=(
+                        not ctx.schema_reflection_mode),
+                    schema_expr_cache=schema_expr_cache,
+                ),
+            )
+
+        if ir.cardinality.is_single() or explain_stmt is not None:
             result_cardinality = enums.ResultCardinality.ONE
         else:
             result_cardinality = enums.ResultCardinality.MANY
@@ -614,23 +694,47 @@ class Compiler(BaseCompiler):
                     f'the query has cardinality {result_cardinality} '
                     f'which does not match the expected cardinality ONE')
 
-        sql_text, argmap = pg_compiler.compile_ir_to_sql(
-            ir,
-            pretty=debug.flags.edgeql_compile or debug.flags.delta_execute,
-            expected_cardinality_one=ctx.expected_cardinality_one,
-            output_format=_convert_format(ctx.output_format),
-        )
+        explain_map = None
+        with _timed_phase(ctx, dbstate.CompilePhase.IR_TO_SQL):
+            if explain_stmt is not None:
+                sql_text, argmap, rvar_paths = (
+                    pg_compiler.compile_ir_to_explain_sql(
+                        ir,
+                        analyze=explain_stmt.analyze,
+                        pretty=(
+                            debug.flags.edgeql_compile or
+                            debug.flags.delta_execute),
+                        output_format=_convert_format(ctx.output_format),
+                    )
+                )
+                explain_map = explain.build_alias_map(ir, rvar_paths)
+            else:
+                sql_text, argmap = pg_compiler.compile_ir_to_sql(
+                    ir,
+                    pretty=(
+                        debug.flags.edgeql_compile or
+                        debug.flags.delta_execute),
+                    expected_cardinality_one=ctx.expected_cardinality_one,
+                    output_format=_convert_format(ctx.output_format),
+                )
 
         sql_bytes = sql_text.encode(defines.EDGEDB_ENCODING)
 
         if single_stmt_mode:
-            if native_out_format:
-                out_type_data, out_type_id = sertypes.TypeSerializer.describe(
-                    ir.schema, ir.stype,
-                    ir.view_shapes, ir.view_shapes_metadata)
-            else:
-                out_type_data, out_type_id = \
-                    sertypes.TypeSerializer.describe_json()
+            with _timed_phase(ctx, dbstate.CompilePhase.DESCRIBE):
+                if native_out_format and explain_stmt is not None:
+                    # The plan is returned as a single JSON document.
+                    out_type_data, out_type_id = \
+                        sertypes.TypeSerializer.describe(
+                            ir.schema, ir.schema.get('std::str'), {}, {})
+                elif native_out_format:
+                    out_type_data, out_type_id = \
+                        sertypes.TypeSerializer.describe(
+                            ir.schema, ir.stype,
+                            ir.view_shapes, ir.view_shapes_metadata)
+                else:
+                    out_type_data, out_type_id = \
+                        sertypes.TypeSerializer.describe_json()
 
             in_type_args = None
 
@@ -675,8 +779,9 @@ class Compiler(BaseCompiler):
                 ir.schema, params_type = s_types.Tuple.create(
                     ir.schema, element_types={}, named=False)
 
-            in_type_data, in_type_id = sertypes.TypeSerializer.describe(
-                ir.schema, params_type, {}, {})
+            with _timed_phase(ctx, dbstate.CompilePhase.DESCRIBE):
+                in_type_data, in_type_id = sertypes.TypeSerializer.describe(
+                    ir.schema, params_type, {}, {})
 
             sql_hash = self._hash_sql(
                 sql_bytes,
@@ -694,6 +799,16 @@ class Compiler(BaseCompiler):
                 out_type_id=out_type_id.bytes,
                 out_type_data=out_type_data,
                 cacheable=cacheable,
+                explain_map=explain_map,
+                reads_query_stats=(
+                    ir.schema.get('sys::QueryStats', None)
+                    in ir.schema_refs
+                ),
+                resets_query_stats=any(
+                    func in ir.schema_refs
+                    for func in ir.schema.get_functions(
+                        'sys::reset_query_stats', ())
+                ),
             )
 
         else:
@@ -707,6 +822,14 @@ class Compiler(BaseCompiler):
         self,
         ctx: CompileContext,
         stmt: qlast.DDLOperation,
+    ) -> dbstate.DDLQuery:
+        with _timed_phase(ctx, dbstate.CompilePhase.DDL):
+            return self._compile_and_apply_ddl_stmt_impl(ctx, stmt)
+
+    def _compile_and_apply_ddl_stmt_impl(
+        self,
+        ctx: CompileContext,
+        stmt: qlast.DDLOperation,
     ) -> dbstate.DDLQuery:
         current_tx = ctx.state.current_tx()
         schema = current_tx.get_schema()
@@ -749,10 +872,35 @@ class Compiler(BaseCompiler):
 
         # Apply and adapt delta, build native delta plan, which
         # will also update the schema.
-        block, new_types = self._process_delta(ctx, delta)
+        block, new_types, index_builds = self._process_delta(ctx, delta)
 
+        cleanup_sql: Tuple[bytes, ...] = ()
         is_transactional = block.is_transactional()
-        if not is_transactional:
+        if index_builds:
+            if not current_tx.is_implicit():
+                raise errors.QueryError(
+                    'cannot build an index concurrently in a '
+                    'transaction block')
+
+            # CREATE INDEX CONCURRENTLY cannot run in a transaction,
+            # so the indexes are built first, and the schema change
+            # is only committed once all of them have been built
+            # successfully.  If anything fails, the possibly invalid
+            # leftover indexes are dropped.
+            code_block = pg_dbops.PLTopBlock()
+            sql = tuple(
+                pg_dbops.CreateIndex(idx, concurrently=True)
+                .code(code_block).encode('utf-8')
+                for idx in index_builds
+            )
+            sql += (block.to_string().encode('utf-8'),)
+            cleanup_sql = tuple(
+                pg_dbops.DropIndex(idx, concurrently=True, if_exists=True)
+                .code(code_block).encode('utf-8')
+                for idx in index_builds
+            )
+            is_transactional = False
+        elif not is_transactional:
             sql = tuple(stmt.encode('utf-8')
                         for stmt in block.get_statements())
         else:
@@ -767,6 +915,9 @@ class Compiler(BaseCompiler):
             is_transactional=is_transactional,
             single_unit=not is_transactional,
             new_types=new_types,
+            cleanup_sql=cleanup_sql,
+            has_role_ddl=isinstance(
+                stmt, (qlast.CreateRole, qlast.AlterRole, qlast.DropRole)),
         )
 
     def _compile_ql_migration(self, ctx: CompileContext, ql: qlast.Migration):
@@ -1404,7 +1555,9 @@ class Compiler(BaseCompiler):
         single_stmt_mode = ctx.stmt_mode is enums.CompileStatementMode.SINGLE
         default_cardinality = enums.ResultCardinality.NO_RESULT
 
+        started_at = time.monotonic()
         statements = edgeql.parse_block_tokens(tokens)
+        parse_time = time.monotonic() - started_at
         statements_len = len(statements)
 
         if ctx.stmt_mode is enums.CompileStatementMode.SKIP_FIRST:
@@ -1426,6 +1579,7 @@ class Compiler(BaseCompiler):
         unit = None
 
         for stmt in statements:
+            ctx.phase_timings.clear()
             comp: dbstate.BaseQuery = self._compile_dispatch_ql(ctx, stmt)
 
             if unit is not None:
@@ -1442,6 +1596,13 @@ class Compiler(BaseCompiler):
             else:
                 unit.status = status.get_status(stmt)
 
+            if not units and not unit.compile_timings:
+                unit.compile_timings[dbstate.CompilePhase.PARSE.value] = (
+                    parse_time)
+            for phase, duration in ctx.phase_timings.items():
+                unit.compile_timings[phase] = (
+                    unit.compile_timings.get(phase, 0.0) + duration)
+
             if not comp.is_transactional:
                 if not comp.single_unit:
                     raise errors.InternalServerError(
@@ -1465,6 +1626,9 @@ class Compiler(BaseCompiler):
                     unit.cacheable = comp.cacheable
 
                     unit.cardinality = comp.cardinality
+                    unit.explain_map = comp.explain_map
+                    unit.reads_query_stats = comp.reads_query_stats
+                    unit.resets_query_stats = comp.resets_query_stats
                 else:
                     unit.sql += comp.sql
 
@@ -1475,7 +1639,9 @@ class Compiler(BaseCompiler):
             elif isinstance(comp, dbstate.DDLQuery):
                 unit.sql += comp.sql
                 unit.has_ddl = True
+                unit.has_role_ddl = unit.has_role_ddl or comp.has_role_ddl
                 unit.new_types = comp.new_types
+                unit.cleanup_sql = comp.cleanup_sql
 
             elif isinstance(comp, dbstate.TxControlQuery):
                 unit.sql += comp.sql
@@ -1679,6 +1845,17 @@ class Compiler(BaseCompiler):
 
     # API
 
+    async def can_recycle(self) -> bool:
+        """Return True if this worker can be replaced with a new one.
+
+        The state of an explicit transaction only exists in this
+        process, so the worker must be kept until it is over.
+        """
+        return (
+            self._current_db_state is None
+            or self._current_db_state.current_tx().is_implicit()
+        )
+
     async def try_compile_rollback(self, dbver: bytes, eql: bytes):
         statements = edgeql.parse_block(eql.decode())
 
@@ -1819,6 +1996,10 @@ class Compiler(BaseCompiler):
         db = await self._get_database(dbver)
         return errormech.interpret_backend_error(db.schema, fields)
 
+    async def get_backend_name_map(self, dbver):
+        db = await self._get_database(dbver)
+        return errormech.BackendNameMap.from_schema(db.schema)
+
     async def interpret_backend_error_in_tx(self, txid, fields):
         state = self._load_state(txid)
         return errormech.interpret_backend_error(
@@ -1837,16 +2018,13 @@ class Compiler(BaseCompiler):
         self,
         tx_snapshot_id: str
     ) -> s_schema.Schema:
-        con = await self.new_connection()
-        try:
+        async with self.new_connection() as con:
             async with con.transaction(isolation='serializable',
                                        readonly=True):
                 await con.execute(
                     f'SET TRANSACTION SNAPSHOT {pg_ql(tx_snapshot_id)};')
 
                 return await self.introspect(con)
-        finally:
-            await con.close()
 
     async def describe_database_dump(
         self,
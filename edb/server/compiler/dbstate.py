@@ -62,6 +62,15 @@ class MigrationAction(enum.IntEnum):
     REJECT_PROPOSED = 6
 
 
+class CompilePhase(str, enum.Enum):
+
+    PARSE = 'parse'
+    QL_TO_IR = 'EdgeQL to IR'
+    IR_TO_SQL = 'IR to SQL'
+    DESCRIBE = 'type descriptors'
+    DDL = 'DDL delta'
+
+
 @dataclasses.dataclass(frozen=True)
 class BaseQuery:
 
@@ -85,6 +94,11 @@ class Query(BaseQuery):
     single_unit: bool = False
     cacheable: bool = True
 
+    explain_map: Optional[Dict[str, Dict[str, Any]]] = None
+
+    reads_query_stats: bool = False
+    resets_query_stats: bool = False
+
 
 @dataclasses.dataclass(frozen=True)
 class SimpleQuery(BaseQuery):
@@ -111,6 +125,8 @@ class DDLQuery(BaseQuery):
     new_types: FrozenSet[str] = frozenset()
     is_transactional: bool = True
     single_unit: bool = False
+    cleanup_sql: Tuple[bytes, ...] = ()
+    has_role_ddl: bool = False
 
 
 @dataclasses.dataclass(frozen=True)
@@ -168,9 +184,17 @@ class QueryUnit:
     # If False, they will be executed separately.
     is_transactional: bool = True
 
+    # Statements undoing the partial effects of a non-transactional
+    # unit; executed separately if any of the statements in *sql* fail.
+    cleanup_sql: Tuple[bytes, ...] = ()
+
     # True if this unit contains DDL commands.
     has_ddl: bool = False
 
+    # True if this unit contains CREATE, ALTER or DROP ROLE commands
+    # (the server caches the roles to authenticate connections).
+    has_role_ddl: bool = False
+
     # A set of ids of types added by this unit.
     new_types: FrozenSet[str] = frozenset()
 
@@ -207,6 +231,15 @@ class QueryUnit:
     in_type_id: bytes = sertypes.EMPTY_TUPLE_ID
     in_type_args: Optional[List[Param]] = None
 
+    # Set only for EXPLAIN queries: a map of SQL range variable names
+    # to the EdgeQL information to add to the respective plan nodes.
+    explain_map: Optional[Dict[str, Dict[str, Any]]] = None
+
+    # Whether the unit reads sys::QueryStats (the server must provide
+    # the current statistics) or calls sys::reset_query_stats().
+    reads_query_stats: bool = False
+    resets_query_stats: bool = False
+
     # Set only when this unit contains a CONFIGURE SYSTEM command.
     system_config: bool = False
     config_requires_restart: bool = False
@@ -217,6 +250,11 @@ class QueryUnit:
         dataclasses.field(default_factory=list))
     modaliases: Optional[immutables.Map] = None
 
+    # Time in seconds spent in each CompilePhase (keyed by its value)
+    # while compiling the statements in this unit.
+    compile_timings: Dict[str, float] = (
+        dataclasses.field(default_factory=dict))
+
 
 #############################
 
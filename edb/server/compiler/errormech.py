@@ -27,10 +27,11 @@ from typing import *
 from edb import errors
 from edb.common import uuidgen
 
+from edb.schema import constraints as s_constr
 from edb.schema import name as sn
 from edb.schema import objtypes as s_objtypes
+from edb.schema import scalars as s_scalars
 
-from edb.pgsql import common
 from edb.pgsql import types
 
 
@@ -119,7 +120,79 @@ enum_re = re.compile(
     r'(?P<p>enum) (?P<v>"edgedb_([\w-]+)"."(?P<id>[\w-]+)_domain")')
 
 
-def translate_pgtype(schema, msg):
+class SchemaNames:
+    """Look up the names of schema objects referred to by backend errors."""
+
+    def __init__(self, schema):
+        self._schema = schema
+
+    def get_type_name(self, type_id):
+        stype = self._schema.get_by_id(type_id, None)
+        if stype is None:
+            return None
+        return stype.get_displayname(self._schema)
+
+    def get_constraint_message(self, constraint_id):
+        constraint = self._schema.get_by_id(constraint_id, None)
+        if constraint is None:
+            return None
+        return constraint.format_error_message(self._schema)
+
+
+class BackendNameMap:
+    """A compact snapshot of SchemaNames for a given database version.
+
+    The map covers enums and the user-defined object types and concrete
+    constraints, and is small enough to be sent over to the server
+    process and kept there, so that constraint violations can be
+    translated without a call to the compiler.  Lookups of objects
+    that are not in the map return None.
+    """
+
+    def __init__(self, types, constraints):
+        self._types = types
+        self._constraints = constraints
+
+    @classmethod
+    def from_schema(cls, schema):
+        types = {}
+        constraints = {}
+
+        for objtype in schema.get_objects(
+                type=s_objtypes.ObjectType, exclude_stdlib=True):
+            types[objtype.id] = objtype.get_displayname(schema)
+
+        for stype in schema.get_objects(type=s_scalars.ScalarType):
+            if stype.is_enum(schema):
+                types[stype.id] = stype.get_displayname(schema)
+
+        for constraint in schema.get_objects(
+                type=s_constr.Constraint, exclude_stdlib=True):
+            if not constraint.generic(schema):
+                constraints[constraint.id] = (
+                    constraint.format_error_message(schema))
+
+        return cls(types, constraints)
+
+    def get_type_name(self, type_id):
+        return self._types.get(type_id)
+
+    def get_constraint_message(self, constraint_id):
+        return self._constraints.get(constraint_id)
+
+
+class _NameNotFound(Exception):
+    pass
+
+
+def _get_type_name(names, type_id):
+    name = names.get_type_name(type_id)
+    if name is None:
+        raise _NameNotFound
+    return name
+
+
+def translate_pgtype(names, msg):
     translated = pgtype_re.sub(
         lambda r: types.base_type_name_map_r.get(r.group(0), r.group(0)),
         msg)
@@ -129,9 +202,9 @@ def translate_pgtype(schema, msg):
 
     def replace(r):
         type_id = uuidgen.UUID(r.group('id'))
-        stype = schema.get_by_id(type_id, None)
-        if stype:
-            return f'{r.group("p")} {stype.get_displayname(schema)!r}'
+        type_name = names.get_type_name(type_id)
+        if type_name is not None:
+            return f'{r.group("p")} {type_name!r}'
         else:
             return f'{r.group("p")} {r.group("v")}'
 
@@ -329,6 +402,26 @@ def static_interpret_backend_error(fields):
 
 
 def interpret_backend_error(schema, fields):
+    try:
+        return _interpret_backend_error(SchemaNames(schema), fields)
+    except _NameNotFound:
+        return errors.InternalServerError(fields.get('M'))
+
+
+def interpret_backend_error_with_names(names, fields):
+    """Interpret a backend error using a BackendNameMap.
+
+    Returns SchemaRequired if the error refers to an object that
+    is not in the map, in which case the error must be interpreted
+    with the schema.
+    """
+    try:
+        return _interpret_backend_error(names, fields)
+    except _NameNotFound:
+        return SchemaRequired
+
+
+def _interpret_backend_error(names, fields):
     err_details = get_error_details(fields)
     hint = None
     if err_details.detail_json:
@@ -340,11 +433,8 @@ def interpret_backend_error(schema, fields):
         source_name = pointer_name = None
 
         if err_details.schema_name and err_details.table_name:
-            tabname = (err_details.schema_name, err_details.table_name)
-
-            source = common.get_object_from_backend_name(
-                schema, s_objtypes.ObjectType, tabname)
-            source_name = source.get_displayname(schema)
+            source_name = _get_type_name(
+                names, uuidgen.UUID(err_details.table_name))
 
             if err_details.column_name:
                 pointer_name = err_details.column_name
@@ -376,17 +466,16 @@ def interpret_backend_error(schema, fields):
             constraint_id, _, _ = err_details.constraint_name.rpartition(';')
             constraint_id = uuidgen.UUID(constraint_id)
 
-            constraint = schema.get_by_id(constraint_id)
+            message = names.get_constraint_message(constraint_id)
+            if message is None:
+                raise _NameNotFound
 
-            return errors.ConstraintViolationError(
-                constraint.format_error_message(schema))
+            return errors.ConstraintViolationError(message)
         elif error_type == 'newconstraint':
             # If we're here, it means that we already validated that
             # schema_name, table_name and column_name all exist.
-            tabname = (err_details.schema_name, err_details.table_name)
-            source = common.get_object_from_backend_name(
-                schema, s_objtypes.ObjectType, tabname)
-            source_name = source.get_displayname(schema)
+            source_name = _get_type_name(
+                names, uuidgen.UUID(err_details.table_name))
             pname = f'{source_name}.{err_details.column_name}'
 
             return errors.ConstraintViolationError(
@@ -397,21 +486,21 @@ def interpret_backend_error(schema, fields):
             if stype_name:
                 msg = f'invalid value for scalar type {stype_name!r}'
             else:
-                msg = translate_pgtype(schema, err_details.message)
+                msg = translate_pgtype(names, err_details.message)
             return errors.InvalidValueError(msg)
 
     elif err_details.code == PGErrorCode.InvalidTextRepresentation:
         return errors.InvalidValueError(
-            translate_pgtype(schema, err_details.message))
+            translate_pgtype(names, err_details.message))
 
     elif err_details.code == PGErrorCode.NumericValueOutOfRange:
         return errors.NumericOutOfRangeError(
-            translate_pgtype(schema, err_details.message))
+            translate_pgtype(names, err_details.message))
 
     elif err_details.code in {PGErrorCode.InvalidDatetimeFormatError,
                               PGErrorCode.DatetimeError}:
         return errors.InvalidValueError(
-            translate_pgtype(schema, err_details.message),
+            translate_pgtype(names, err_details.message),
             hint=hint)
 
     return errors.InternalServerError(err_details.message)
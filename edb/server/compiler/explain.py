@@ -0,0 +1,122 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2020-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""Support for EXPLAIN [ANALYZE] of EdgeQL queries.
+
+The query is compiled as usual and the generated SQL is wrapped into
+a Postgres EXPLAIN (FORMAT JSON) statement.  The compiler also builds
+a map of SQL range variable names to the EdgeQL paths and source spans
+they were compiled from (see build_alias_map()), which the server uses
+to annotate the nodes of the returned plan (see annotate_plan()).
+"""
+
+
+from __future__ import annotations
+from typing import *
+
+import json
+
+from edb.common import ast
+from edb.common import parsing
+
+from edb.ir import ast as irast
+
+
+if TYPE_CHECKING:
+    AliasMap = Dict[str, Dict[str, Any]]
+
+
+def build_alias_map(
+    ir: irast.Statement,
+    rvar_paths: Mapping[str, irast.PathId],
+) -> AliasMap:
+    """Describe the EdgeQL origin of each named SQL range variable."""
+    sources, shape_elements = _get_path_sources(ir)
+
+    alias_map: AliasMap = {}
+    for alias, path_id in rvar_paths.items():
+        key = path_id.namespace_free_key
+        info: Dict[str, Any] = {'EdgeQL Path': path_id.pformat()}
+
+        shape_element = shape_elements.get(key)
+        if shape_element is not None:
+            info['EdgeQL Shape Element'] = shape_element
+
+        context = sources.get(key)
+        if context is not None:
+            info['EdgeQL Source'] = (
+                context.buffer[context.start.pointer:context.end.pointer])
+            info['EdgeQL Source Line'] = context.start.line
+            info['EdgeQL Source Column'] = context.start.column
+
+        alias_map[alias] = info
+
+    return alias_map
+
+
+def annotate_plan(plan: bytes, alias_map: AliasMap) -> bytes:
+    """Add EdgeQL information to the nodes of a JSON query plan."""
+    data = json.loads(plan)
+
+    nodes = [entry['Plan'] for entry in data if 'Plan' in entry]
+    while nodes:
+        node = nodes.pop()
+        name = node.get('Alias') or node.get('CTE Name')
+        if name is not None:
+            info = alias_map.get(name)
+            if info is not None:
+                node.update(info)
+        nodes.extend(node.get('Plans', ()))
+
+    return json.dumps(data, indent=2).encode('utf-8')
+
+
+def _get_path_sources(
+    ir: irast.Statement,
+) -> Tuple[Dict[Hashable, parsing.ParserContext], Dict[Hashable, str]]:
+    sources: Dict[Hashable, parsing.ParserContext] = {}
+    shape_elements: Dict[Hashable, str] = {}
+    seen: Set[irast.Set] = set()
+
+    # Shape elements are stored in (element, op) tuples and so aren't
+    # found by find_children(), hence the explicit worklist.
+    todo: List[irast.Base] = [ir]
+    while todo:
+        node = todo.pop()
+        ir_sets = ast.find_children(
+            node, lambda n: isinstance(n, irast.Set), force_traversal=True)
+        if isinstance(node, irast.Set):
+            ir_sets.append(node)
+
+        for ir_set in ir_sets:
+            if ir_set in seen:
+                continue
+            seen.add(ir_set)
+
+            if ir_set.context is not None:
+                sources.setdefault(
+                    ir_set.path_id.namespace_free_key, ir_set.context)
+
+            for el, _ in ir_set.shape:
+                ptr_name = el.path_id.rptr_name()
+                if ptr_name is not None:
+                    shape_elements.setdefault(
+                        el.path_id.namespace_free_key, ptr_name.name)
+                todo.append(el)
+
+    return sources, shape_elements
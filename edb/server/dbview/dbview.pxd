@@ -17,6 +17,9 @@
 #
 
 
+from libc.stdint cimport int64_t
+
+
 cdef class DatabaseIndex:
     cdef:
         dict _dbs
@@ -27,6 +30,12 @@ cdef class DatabaseIndex:
         object _sys_queries
         object _instance_data
 
+        object _roles
+        object _roles_loader
+        int _roles_ver
+
+    cdef invalidate_roles(self)
+
 
 cdef class Database:
 
@@ -34,11 +43,14 @@ cdef class Database:
         str _name
         object _dbver
         object _eql_to_compiled
+        object _query_stats
+        object _backend_name_map
         DatabaseIndex _index
 
     cdef _signal_ddl(self, new_dbver)
     cdef _invalidate_caches(self)
     cdef _cache_compiled_query(self, key, query_unit)
+    cdef _get_query_stats(self, str key)
     cdef _new_view(self, user, query_cache)
 
 
@@ -58,6 +70,7 @@ cdef class DatabaseConnectionView:
         object _in_tx_config
         bint _in_tx
         bint _in_tx_with_ddl
+        bint _in_tx_with_role_ddl
         bint _in_tx_with_set
         bint _tx_error
 
@@ -72,12 +85,23 @@ cdef class DatabaseConnectionView:
 
     cdef in_tx(self)
     cdef in_tx_error(self)
+    cdef in_tx_with_ddl(self)
 
     cdef cache_compiled_query(self, str eql, object io_format,
                               bint expect_one, int implicit_limit,
                               query_unit)
     cdef lookup_compiled_query(self, str eql, object io_format,
                                bint expect_one, int implicit_limit)
+    cdef get_compilation_state(self)
+
+    cdef get_backend_name_map(self)
+    cdef set_backend_name_map(self, bytes dbver, name_map)
+
+    cdef record_query_compile(self, str key, double duration,
+                              dict phase_timings)
+    cdef record_query_cache_hit(self, str key)
+    cdef record_query_execute(self, str key, double duration, int64_t rows)
+    cdef dump_query_stats(self)
 
     cdef tx_error(self)
 
@@ -17,6 +17,7 @@
 #
 
 
+import asyncio
 import json
 import os.path
 import pickle
@@ -34,11 +35,34 @@ from edb.pgsql import dbops
 __all__ = ('DatabaseIndex', 'DatabaseConnectionView')
 
 
+class QueryStats:
+    """Running execution statistics of a normalized query."""
+
+    __slots__ = ('calls', 'rows', 'total_exec_time', 'max_exec_time',
+                 'compiles', 'total_compile_time', 'compile_phase_times',
+                 'cache_hits')
+
+    def __init__(self):
+        self.calls = 0
+        self.rows = 0
+        self.total_exec_time = 0.0
+        self.max_exec_time = 0.0
+        self.compiles = 0
+        self.total_compile_time = 0.0
+        # Total time spent in each compiler phase, keyed by
+        # CompilePhase value.
+        self.compile_phase_times = {}
+        self.cache_hits = 0
+
+
 cdef class Database:
 
     # Global LRU cache of compiled anonymous queries
     _eql_to_compiled: typing.Mapping[str, dbstate.QueryUnit]
 
+    # Execution statistics keyed by normalized query text
+    _query_stats: typing.Mapping[str, QueryStats]
+
     def __init__(self, DatabaseIndex index, str name):
         self._name = name
         self._dbver = uuidgen.uuid1mc().bytes
@@ -48,6 +72,13 @@ cdef class Database:
         self._eql_to_compiled = lru.LRUMapping(
             maxsize=defines._MAX_QUERIES_CACHE)
 
+        self._query_stats = lru.LRUMapping(
+            maxsize=defines._MAX_QUERY_STATS)
+
+        # Names of schema objects used to interpret backend errors
+        # (see errormech.BackendNameMap), loaded on demand.
+        self._backend_name_map = None
+
     cdef _signal_ddl(self, new_dbver):
         if new_dbver is None:
             self._dbver = uuidgen.uuid1mc().bytes
@@ -57,6 +88,7 @@ cdef class Database:
 
     cdef _invalidate_caches(self):
         self._eql_to_compiled.clear()
+        self._backend_name_map = None
 
     cdef _cache_compiled_query(self, key, compiled: dbstate.QueryUnit):
         assert compiled.cacheable
@@ -68,6 +100,12 @@ cdef class Database:
 
         self._eql_to_compiled[key] = compiled
 
+    cdef _get_query_stats(self, str key):
+        stats = self._query_stats.get(key)
+        if stats is None:
+            stats = self._query_stats[key] = QueryStats()
+        return stats
+
     cdef _new_view(self, user, query_cache):
         return DatabaseConnectionView(self, user=user, query_cache=query_cache)
 
@@ -103,6 +141,7 @@ cdef class DatabaseConnectionView:
         self._in_tx = False
         self._in_tx_config = None
         self._in_tx_with_ddl = False
+        self._in_tx_with_role_ddl = False
         self._in_tx_with_set = False
         self._tx_error = False
         self._invalidate_local_cache()
@@ -111,6 +150,8 @@ cdef class DatabaseConnectionView:
         """Called when a DDL operation was applied at another server."""
         if new_dbver != self._db._dbver:
             self._db._signal_ddl(new_dbver)
+            # The DDL might have changed roles, re-read them.
+            self._db._index.invalidate_roles()
 
     cdef rollback_tx_to_savepoint(self, spid, modaliases, config):
         self._tx_error = False
@@ -168,6 +209,9 @@ cdef class DatabaseConnectionView:
     cdef in_tx_error(self):
         return self._tx_error
 
+    cdef in_tx_with_ddl(self):
+        return self._in_tx_with_ddl
+
     cdef cache_compiled_query(self, str eql, object io_format,
                               bint expect_one, int implicit_limit, query_unit):
 
@@ -200,6 +244,67 @@ cdef class DatabaseConnectionView:
 
         return query_unit
 
+    cdef record_query_compile(self, str key, double duration,
+                              dict phase_timings):
+        stats = self._db._get_query_stats(key)
+        stats.compiles += 1
+        stats.total_compile_time += duration
+        phase_times = stats.compile_phase_times
+        for phase, phase_duration in phase_timings.items():
+            phase_times[phase] = phase_times.get(phase, 0.0) + phase_duration
+
+    cdef record_query_cache_hit(self, str key):
+        stats = self._db._get_query_stats(key)
+        stats.cache_hits += 1
+
+    cdef record_query_execute(self, str key, double duration, int64_t rows):
+        stats = self._db._get_query_stats(key)
+        stats.calls += 1
+        stats.rows += rows
+        stats.total_exec_time += duration
+        if duration > stats.max_exec_time:
+            stats.max_exec_time = duration
+
+    cdef dump_query_stats(self):
+        """Return the query statistics as JSON (see sys::QueryStats)."""
+        return json.dumps([
+            {
+                'query': key,
+                'calls': stats.calls,
+                'rows': stats.rows,
+                'total_exec_time': stats.total_exec_time,
+                'max_exec_time': stats.max_exec_time,
+                'compiles': stats.compiles,
+                'total_compile_time': stats.total_compile_time,
+                'compile_phase_times': stats.compile_phase_times,
+                'cache_hits': stats.cache_hits,
+            }
+            for key, stats in self._db._query_stats.items()
+        ])
+
+    cdef get_compilation_state(self):
+        """Return a token identifying the state queries are compiled in.
+
+        A compiled query can be reused as long as the token stays
+        the same.  None is returned if compiled queries cannot be
+        reused in the current state at all.
+        """
+        if (self._tx_error or
+                not self._query_cache_enabled or
+                self._in_tx_with_ddl):
+            return None
+
+        return (self.dbver, self._modaliases, self.get_session_config())
+
+    cdef get_backend_name_map(self):
+        return self._db._backend_name_map
+
+    cdef set_backend_name_map(self, bytes dbver, name_map):
+        if dbver == self._db._dbver:
+            # Ignore a map that was loaded for a database version
+            # that has been superseded by DDL in the meantime.
+            self._db._backend_name_map = name_map
+
     cdef tx_error(self):
         if self._in_tx:
             self._tx_error = True
@@ -219,6 +324,8 @@ cdef class DatabaseConnectionView:
         if self._in_tx:
             if query_unit.has_ddl:
                 self._in_tx_with_ddl = True
+            if query_unit.has_role_ddl:
+                self._in_tx_with_role_ddl = True
             if query_unit.has_set:
                 self._in_tx_with_set = True
 
@@ -228,6 +335,9 @@ cdef class DatabaseConnectionView:
     cdef on_success(self, query_unit):
         signal_ddl = False
 
+        if query_unit.resets_query_stats:
+            self._db._query_stats.clear()
+
         if query_unit.tx_savepoint_rollback:
             # Need to invalidate the cache in case there were
             # SET ALIAS or CONFIGURE or DDL commands.
@@ -237,6 +347,9 @@ cdef class DatabaseConnectionView:
             self._db._signal_ddl(None)
             signal_ddl = True
 
+        if not self._in_tx and query_unit.has_role_ddl:
+            self._db._index.invalidate_roles()
+
         if query_unit.modaliases is not None:
             self._modaliases = query_unit.modaliases
 
@@ -250,6 +363,8 @@ cdef class DatabaseConnectionView:
             if self._in_tx_with_ddl:
                 self._db._signal_ddl(None)
                 signal_ddl = True
+            if self._in_tx_with_role_ddl:
+                self._db._index.invalidate_roles()
             self._reset_tx_state()
 
         elif query_unit.tx_rollback:
@@ -284,6 +399,7 @@ cdef class DatabaseIndex:
     async def init(cls, server) -> DatabaseIndex:
         state = cls(server)
         await state.reload_config()
+        await state._load_roles()
         return state
 
     def __init__(self, server):
@@ -294,6 +410,12 @@ cdef class DatabaseIndex:
         self._instance_data = None
         self._sys_config = None
 
+        # Roles by name, used to authenticate new connections
+        # without a round trip to the backend.
+        self._roles = None
+        self._roles_loader = None
+        self._roles_ver = 0
+
     async def get_sys_query(self, conn, key: str) -> bytes:
         if self._sys_queries is None:
             result = await conn.simple_query(
@@ -330,6 +452,42 @@ cdef class DatabaseIndex:
     def get_sys_config(self):
         return self._sys_config
 
+    async def get_role(self, name: str):
+        while self._roles is None:
+            if self._roles_loader is None:
+                self._roles_loader = asyncio.ensure_future(
+                    self._load_roles())
+            # Concurrent connections share the same loader.
+            await asyncio.shield(self._roles_loader)
+        return self._roles.get(name)
+
+    def get_mock_auth_nonce(self) -> str:
+        # Instance data is loaded along with the roles in init().
+        return self._instance_data['mock_auth_nonce']
+
+    cdef invalidate_roles(self):
+        self._roles = None
+        self._roles_ver += 1
+
+    async def _load_roles(self):
+        ver = self._roles_ver
+        try:
+            conn = await self._server.new_pgcon(defines.EDGEDB_SUPERUSER_DB)
+            try:
+                query = await self.get_sys_query(conn, 'roles')
+                result = await conn.simple_query(query, ignore_data=False)
+                await self.get_instance_data(conn, 'mock_auth_nonce')
+            finally:
+                conn.terminate()
+
+            if ver == self._roles_ver:
+                # Only use the result if no role DDL was committed
+                # while the roles were being loaded.
+                roles = json.loads(result[0][0].decode('utf-8'))
+                self._roles = {role['name']: role for role in roles}
+        finally:
+            self._roles_loader = None
+
     def get_dbver(self, dbname):
         db = self._get_db(dbname)
         return (<Database>db)._dbver
@@ -27,7 +27,7 @@ EDGEDB_ENCODING = 'utf-8'
 EDGEDB_VISIBLE_METADATA_PREFIX = r'EdgeDB metadata follows, do not modify.\n'
 
 # Increment this whenever the database layout or stdlib changes.
-EDGEDB_CATALOG_VERSION = 2020_08_25_00_00
+EDGEDB_CATALOG_VERSION = 2020_09_03_00_00
 
 # Resource limit on open FDs for the server process.
 # By default, at least on macOS, the max number of open FDs
@@ -38,6 +38,32 @@ EDGEDB_MIN_RLIMIT_NOFILE = 2048
 
 _MAX_QUERIES_CACHE = 1000
 
+_MAX_PREPARED_STATEMENTS = 1000
+
+# The maximum number of distinct queries that execution statistics
+# are kept for (per database); see sys::QueryStats.
+_MAX_QUERY_STATS = 5000
+
+# Compiler worker processes are replaced with fresh ones after serving
+# this many requests, or once their private memory grows past this many
+# megabytes (unless overridden by --compiler-worker-max-requests and
+# --compiler-worker-max-rss).
+COMPILER_WORKER_MAX_REQUESTS = 10_000
+COMPILER_WORKER_MAX_RSS = 1024
+
+# Requests for a backend connection wait at most this many seconds
+# (unless overridden by --backend-queue-timeout) when all of the
+# --max-backend-connections are in use, and are rejected right away
+# if this many requests are already waiting.
+BACKEND_QUEUE_TIMEOUT = 30.0
+_MAX_BACKEND_QUEUE_SIZE = 1000
+
+# Compiler workers connect to the backend to introspect schemas.
+# They do not go through the admission controller, but share this
+# many connections, which are taken out of --max-backend-connections
+# (at most a half of it).
+COMPILER_BACKEND_CONNECTIONS = 5
+
 _QUERY_ROLLING_AVG_LEN = 10
 _QUERIES_ROLLING_AVG_LEN = 300
 
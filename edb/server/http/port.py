@@ -105,7 +105,8 @@ class BaseHttpPort(baseport.Port):
                     g.create_task(self.new_compiler(
                         self.database, self.get_dbver())))
                 pgcons.append(
-                    g.create_task(self.get_server().new_pgcon(self.database)))
+                    g.create_task(self.get_server().new_pgcon(
+                        self.database, user=self.user)))
 
         for com_task in compilers:
             self._compilers.put_nowait(com_task.result())
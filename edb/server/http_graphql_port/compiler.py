@@ -51,6 +51,7 @@ class CompiledOperation:
     dbver: int
     cacheable: bool
     cache_deps_vars: Optional[FrozenSet[str]]
+    cache_deps_cursor_vars: Optional[FrozenSet[str]]
     variables: Dict
 
 
@@ -126,5 +127,6 @@ class Compiler(compiler.BaseCompiler):
             dbver=dbver,
             cacheable=op.cacheable,
             cache_deps_vars=op.cache_deps_vars,
+            cache_deps_cursor_vars=op.cache_deps_cursor_vars,
             variables=op.variables_desc,
         )
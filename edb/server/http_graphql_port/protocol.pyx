@@ -28,6 +28,7 @@ from graphql.language import lexer as gql_lexer
 from edb import _graphql_rewrite
 from edb import errors
 from edb.graphql import errors as gql_errors
+from edb.graphql import translator as gql_translator
 from edb.server.pgcon import errors as pgerrors
 
 from edb.common import debug
@@ -50,9 +51,11 @@ _USER_ERRORS = (
 @cython.final
 cdef class CacheRedirect:
     cdef public list key_vars  # List[str],  must be sorted
+    cdef public list cursor_vars  # List[str],  must be sorted
 
-    def __init__(self, key_vars: List[str]):
+    def __init__(self, key_vars: List[str], cursor_vars: List[str]):
         self.key_vars = key_vars
+        self.cursor_vars = cursor_vars
 
 
 CacheEntry = Union[CacheRedirect, compiler.CompiledOperation]
@@ -241,7 +244,7 @@ cdef class Protocol(http.HttpProtocol):
         entry: CacheEntry = self.query_cache.get(cache_key, None)
 
         if isinstance(entry, CacheRedirect):
-            key_vars2 = tuple(vars[k] for k in entry.key_vars)
+            key_vars2 = _get_key_vars(vars, entry.key_vars, entry.cursor_vars)
             cache_key2 = (prepared_query, key_vars2, operation_name, dbver)
             entry = self.query_cache.get(cache_key2, None)
 
@@ -257,12 +260,16 @@ cdef class Protocol(http.HttpProtocol):
                     dbver, query, None, None, operation_name, vars)
 
             key_var_set = set(key_var_names)
-            if op.cache_deps_vars and op.cache_deps_vars != key_var_set:
-                key_var_set.update(op.cache_deps_vars)
+            cursor_var_names = sorted(op.cache_deps_cursor_vars or ())
+            if (op.cache_deps_vars and op.cache_deps_vars != key_var_set
+                    or cursor_var_names):
+                key_var_set.update(op.cache_deps_vars or ())
                 key_var_names = sorted(key_var_set)
-                redir = CacheRedirect(key_vars=key_var_names)
+                redir = CacheRedirect(
+                    key_vars=key_var_names, cursor_vars=cursor_var_names)
                 self.query_cache[cache_key] = redir
-                key_vars2 = tuple(vars[k] for k in key_var_names)
+                key_vars2 = _get_key_vars(
+                    vars, key_var_names, cursor_var_names)
                 cache_key2 = (prepared_query, key_vars2, operation_name, dbver)
                 self.query_cache[cache_key2] = op
             else:
@@ -298,3 +305,13 @@ cdef class Protocol(http.HttpProtocol):
                 f'no data received for a JSON query {op.sql!r}')
 
         return data
+
+
+def _get_key_vars(vars, key_var_names, cursor_var_names):
+    # The compiled query depends on the values of the key variables,
+    # but only on the kind of the values of the pagination cursors.
+    return (
+        tuple(vars[k] for k in key_var_names)
+        + tuple(gql_translator.get_cursor_cache_key(vars.get(k))
+                for k in cursor_var_names)
+    )
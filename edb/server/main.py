@@ -41,8 +41,10 @@ import uvloop
 import click
 import setproctitle
 
+from edb.common import debug
 from edb.common import devmode
 from edb.common import exceptions
+from edb.common import sampler
 
 from . import buildmeta
 from . import cluster as edgedb_cluster
@@ -67,6 +69,22 @@ def terminate_server(server, loop):
     loop.stop()
 
 
+def stop_sampling_profiler():
+    path = sampler.stop()
+    if path is not None:
+        logger.info('Sampling profiler stacks written to %s', path)
+
+
+def toggle_sampling_profiler(server):
+    if sampler.is_running():
+        stop_sampling_profiler()
+        logger.info('Sampling profiler stopped.')
+    else:
+        sampler.start()
+        logger.info('Sampling profiler started.')
+    server.signal_compiler_workers(signal.SIGUSR2)
+
+
 @contextlib.contextmanager
 def _ensure_runstate_dir(
     default_runstate_dir: pathlib.Path,
@@ -191,6 +209,9 @@ def _run_server(cluster, args: ServerConfig,
         runstate_dir=runstate_dir,
         internal_runstate_dir=internal_runstate_dir,
         max_backend_connections=args.max_backend_connections,
+        backend_queue_timeout=args.backend_queue_timeout,
+        compiler_worker_max_requests=args.compiler_worker_max_requests,
+        compiler_worker_max_rss=args.compiler_worker_max_rss,
         nethost=args.bind_address,
         netport=args.port,
         auto_shutdown=args.auto_shutdown,
@@ -198,6 +219,9 @@ def _run_server(cluster, args: ServerConfig,
         max_protocol=args.max_protocol,
     )
 
+    if debug.flags.sampling_profiler:
+        sampler.start()
+
     loop.run_until_complete(ss.init())
 
     try:
@@ -207,6 +231,8 @@ def _run_server(cluster, args: ServerConfig,
         raise
 
     loop.add_signal_handler(signal.SIGTERM, terminate_server, ss, loop)
+    loop.add_signal_handler(
+        signal.SIGUSR2, toggle_sampling_profiler, ss)
 
     # Notify systemd that we've started up.
     _sd_notify('READY=1')
@@ -217,6 +243,7 @@ def _run_server(cluster, args: ServerConfig,
         try:
             logger.info('Shutting down.')
             loop.run_until_complete(ss.stop())
+            stop_sampling_profiler()
         finally:
             _sd_notify('STOPPING=1')
 
@@ -397,6 +424,9 @@ class ServerConfig(typing.NamedTuple):
     daemon_group: str
     runstate_dir: pathlib.Path
     max_backend_connections: int
+    backend_queue_timeout: float
+    compiler_worker_max_requests: int
+    compiler_worker_max_rss: int
     echo_runtime_info: bool
     temp_dir: bool
     auto_shutdown: bool
@@ -498,7 +528,26 @@ _server_options = [
              f'runtime files will be placed ({_get_runstate_dir_default()} '
              f'by default)'),
     click.option(
-        '--max-backend-connections', type=int, default=100),
+        '--max-backend-connections', type=click.IntRange(min=2), default=100,
+        help='the maximum number of connections to the Postgres backend '
+             'the server opens, including the few reserved for compiler '
+             'workers; clients are queued when all are in use'),
+    click.option(
+        '--backend-queue-timeout', type=float,
+        default=defines.BACKEND_QUEUE_TIMEOUT,
+        help='the number of seconds a client waits for a free backend '
+             'connection before the request is rejected'),
+    click.option(
+        '--compiler-worker-max-requests', type=click.IntRange(min=0),
+        default=defines.COMPILER_WORKER_MAX_REQUESTS,
+        help='the number of requests after which a compiler worker '
+             'process is replaced with a new one; 0 means no limit'),
+    click.option(
+        '--compiler-worker-max-rss', type=click.IntRange(min=0),
+        default=defines.COMPILER_WORKER_MAX_RSS,
+        help='the amount of private memory (in megabytes) above which '
+             'a compiler worker process is replaced with a new one; '
+             '0 means no limit'),
     click.option(
         '--echo-runtime-info', type=bool, default=False, is_flag=True,
         help='echo runtime info to stdout; the format is JSON, prefixed by ' +
@@ -56,6 +56,17 @@ cdef class CompiledQuery:
     cdef public object first_extra  # Optional[int]
     cdef public int extra_count
     cdef public bytes extra_blob
+    cdef public str stats_key  # Optional[str]
+
+
+@cython.final
+cdef class PreparedStatement:
+    cdef public CompiledQuery compiled
+    cdef public object state
+    cdef public bytes eql
+    cdef public object io_format
+    cdef public bint expect_one
+    cdef public uint64_t implicit_limit
 
 
 @cython.final
@@ -85,6 +96,8 @@ cdef class EdgeConnection:
         object _main_task
 
         CompiledQuery _last_anon_compiled
+        dict _prepared_stmts
+        tuple _pending_parse
         WriteBuffer _write_buf
 
         bint debug
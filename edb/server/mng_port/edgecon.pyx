@@ -60,7 +60,9 @@ from edb.server import config
 
 from edb.server import buildmeta
 from edb.server import compiler
+from edb.server import defines
 from edb.server.compiler import errormech
+from edb.pgsql.common import quote_literal as pg_ql
 from edb.server.pgcon cimport pgcon
 from edb.server.pgcon import errors as pgerror
 
@@ -106,12 +108,27 @@ cdef class CompiledQuery:
     def __init__(self, object query_unit,
         first_extra: Optional[int]=None,
         int extra_count=0,
-        bytes extra_blob=None
+        bytes extra_blob=None,
+        str stats_key=None,
     ):
         self.query_unit = query_unit
         self.first_extra = first_extra
         self.extra_count = extra_count
         self.extra_blob = extra_blob
+        self.stats_key = stats_key
+
+
+@cython.final
+cdef class PreparedStatement:
+
+    def __init__(self, CompiledQuery compiled, object state, bytes eql,
+                 object io_format, bint expect_one, uint64_t implicit_limit):
+        self.compiled = compiled
+        self.state = state
+        self.eql = eql
+        self.io_format = io_format
+        self.expect_one = expect_one
+        self.implicit_limit = implicit_limit
 
 
 @cython.final
@@ -139,6 +156,8 @@ cdef class EdgeConnection:
         self._write_waiter = None
 
         self._last_anon_compiled = None
+        self._prepared_stmts = {}
+        self._pending_parse = None
 
         self._write_buf = None
 
@@ -270,11 +289,6 @@ cdef class EdgeConnection:
         assert type(dbv) is dbview.DatabaseConnectionView
         self.dbview = <dbview.DatabaseConnectionView>dbv
 
-        self._backend = await self.port.new_backend(
-            dbname=database, dbver=self.dbview.dbver)
-        self._backend.pgcon.set_edgecon(self)
-        self._con_status = EDGECON_STARTED
-
         # The user has already been authenticated by other means
         # (such as the ability to write to a protected socket).
         if self._external_auth:
@@ -295,6 +309,19 @@ cdef class EdgeConnection:
         logger.debug('successfully authenticated %s in database %s',
                      user, database)
 
+        # Roles are cached by the server, so authentication doesn't
+        # need a backend; only acquire one for authenticated clients.
+        backend = await self.port.new_backend(
+            dbname=database, user=user, dbver=self.dbview.dbver)
+        if self._con_status is EDGECON_BAD:
+            # The client has disconnected in the meantime.
+            await backend.close()
+            raise ConnectionAbortedError()
+
+        self._backend = backend
+        self._backend.pgcon.set_edgecon(self)
+        self._con_status = EDGECON_STARTED
+
         buf = WriteBuffer()
 
         msg_buf = WriteBuffer.new_message(b'R')
@@ -381,18 +408,7 @@ cdef class EdgeConnection:
         return params
 
     async def _get_role_record(self, user):
-        conn = self.get_backend().pgcon
-        server = self.port.get_server()
-        role_query = await server.get_sys_query(conn, 'role')
-        json_data = await conn.parse_execute_json(
-            role_query, b'__sys_role',
-            dbver=b'', use_prep_stmt=True, args=(user,),
-        )
-
-        if json_data is not None:
-            return json.loads(json_data.decode('utf-8'))
-        else:
-            return None
+        return await self.port.get_server().get_role(user)
 
     async def _auth_trust(self, user):
         rolerec = await self._get_role_record(user)
@@ -555,9 +571,7 @@ cdef class EdgeConnection:
             # generate a mock verifier using a salt derived from the
             # received user name and the cluster mock auth nonce.
             # The same approach is taken by Postgres.
-            server = self.port.get_server()
-            nonce = await server.get_instance_data(
-                self.get_backend().pgcon, 'mock_auth_nonce')
+            nonce = self.port.get_server().get_mock_auth_nonce()
             salt = hashlib.sha256(nonce.encode() + user.encode()).digest()
 
             verifier = scram.SCRAMVerifier(
@@ -626,7 +640,7 @@ cdef class EdgeConnection:
             self.dbview.raise_in_tx_error()
 
         if self.dbview.in_tx():
-            return await self.get_backend().compiler.call(
+            units = await self.get_backend().compiler.call(
                 'compile_eql_tokens_in_tx',
                 self.dbview.txid,
                 tokens,
@@ -637,7 +651,7 @@ cdef class EdgeConnection:
                 first_extracted_var,
             )
         else:
-            return await self.get_backend().compiler.call(
+            units = await self.get_backend().compiler.call(
                 'compile_eql_tokens',
                 self.dbview.dbver,
                 tokens,
@@ -651,6 +665,12 @@ cdef class EdgeConnection:
                 first_extracted_var,
             )
 
+        for unit in units:
+            for phase, duration in unit.compile_timings.items():
+                self.timer.record(f'Query compilation ({phase})', duration)
+
+        return units
+
     async def _compile_rollback(self, bytes eql):
         assert self.dbview.in_tx_error()
         try:
@@ -728,9 +748,7 @@ cdef class EdgeConnection:
                         await self.get_backend().pgcon.simple_query(
                             b';'.join(query_unit.sql), ignore_data=True)
                     else:
-                        for sql in query_unit.sql:
-                            await self.get_backend().pgcon.simple_query(
-                                sql, ignore_data=True)
+                        await self._execute_nontransactional(query_unit)
 
                     if query_unit.config_ops:
                         await self.dbview.apply_config_ops(
@@ -805,6 +823,7 @@ cdef class EdgeConnection:
                     # ROLLBACK in that 'eql' string.
                     self.dbview.raise_in_tx_error()
             else:
+                started_at = time.monotonic()
                 with self.timer.timed("Query compilation"):
                     query_unit = await self._compile(
                         normalized.tokens(),
@@ -815,6 +834,9 @@ cdef class EdgeConnection:
                         first_extracted_var=normalized.first_extra(),
                     )
                 query_unit = query_unit[0]
+                self.dbview.record_query_compile(
+                    normalized.key(), time.monotonic() - started_at,
+                    query_unit.compile_timings)
         elif self.dbview.in_tx_error():
             # We have a cached QueryUnit for this 'eql', but the current
             # transaction is aborted.  We can only complete this Parse
@@ -822,16 +844,12 @@ cdef class EdgeConnection:
             # 'ROLLBACK TO SAVEPOINT' command.
             if not (query_unit.tx_rollback or query_unit.tx_savepoint_rollback):
                 self.dbview.raise_in_tx_error()
+        else:
+            self.dbview.record_query_cache_hit(normalized.key())
 
-        await self.get_backend().pgcon.parse_execute(
-            1,           # =parse
-            0,           # =execute
-            query_unit,  # =query
-            self,        # =edgecon
-            None,        # =bind_data
-            0,           # =send_sync
-            0,           # =use_prep_stmt
-        )
+        # Note that the SQL is not parsed by Postgres here: parse()
+        # pipelines the backend Parse with the client's next message,
+        # and optimistic_execute() with Bind/Execute.
 
         if not cached and query_unit.cacheable:
             self.dbview.cache_compiled_query(
@@ -843,6 +861,7 @@ cdef class EdgeConnection:
             first_extra=normalized.first_extra(),
             extra_count=normalized.extra_count(),
             extra_blob=normalized.extra_blob(),
+            stats_key=normalized.key(),
         )
 
     cdef parse_cardinality(self, bytes card):
@@ -951,9 +970,13 @@ cdef class EdgeConnection:
         )
 
         stmt_name = self.buffer.read_len_prefixed_bytes()
-        if stmt_name:
-            raise errors.UnsupportedFeatureError(
-                'prepared statements are not yet supported')
+        if (stmt_name and stmt_name not in self._prepared_stmts and
+                len(self._prepared_stmts) >=
+                    defines._MAX_PREPARED_STATEMENTS):
+            raise errors.BinaryProtocolError(
+                f'too many prepared statements, at most '
+                f'{defines._MAX_PREPARED_STATEMENTS} are allowed '
+                f'per connection')
 
         eql = self.buffer.read_len_prefixed_bytes()
         if not eql:
@@ -962,6 +985,11 @@ cdef class EdgeConnection:
         compiled_query = await self._parse(
             eql, io_format, expect_one, implicit_limit)
 
+        if stmt_name:
+            self._prepared_stmts[stmt_name] = PreparedStatement(
+                compiled_query, self.dbview.get_compilation_state(),
+                eql, io_format, expect_one, implicit_limit)
+
         buf = WriteBuffer.new_message(b'1')  # ParseComplete
         buf.write_int16(0)  # no headers
         buf.write_byte(self.render_cardinality(compiled_query.query_unit))
@@ -969,9 +997,36 @@ cdef class EdgeConnection:
         buf.write_bytes(compiled_query.query_unit.out_type_id)
         buf.end_message()
 
-        self._last_anon_compiled = compiled_query
+        if not stmt_name:
+            self._last_anon_compiled = compiled_query
+
+        query_unit = compiled_query.query_unit
+        if (query_unit.sql_hash and
+                self.get_backend().pgcon.send_parse(query_unit)):
+            # Postgres parses the statement while the client sends
+            # its next message.  ParseComplete is held back until
+            # then, so that backend errors are reported in response
+            # to this Parse, see _wait_for_parse().
+            self._pending_parse = (stmt_name, buf)
+        else:
+            self.write(buf)
 
-        self.write(buf)
+    async def _wait_for_parse(self, bint sync):
+        stmt_name, parse_complete = self._pending_parse
+        self._pending_parse = None
+
+        try:
+            await self.get_backend().pgcon.wait_for_parse(sync)
+        except Exception:
+            # The client gets the error instead of ParseComplete,
+            # so forget the statement.
+            if stmt_name:
+                self._prepared_stmts.pop(stmt_name, None)
+            else:
+                self._last_anon_compiled = None
+            raise
+
+        self.write(parse_complete)
 
     #############
 
@@ -1017,8 +1072,15 @@ cdef class EdgeConnection:
             stmt_name = self.buffer.read_len_prefixed_bytes()
 
             if stmt_name:
-                raise errors.UnsupportedFeatureError(
-                    'prepared statements are not yet supported')
+                stmt = self._prepared_stmts.get(stmt_name)
+                if stmt is None:
+                    name = stmt_name.decode(errors='replace')
+                    raise errors.TypeSpecNotFoundError(
+                        f'no prepared statement {name!r} found')
+
+                msg = self.make_describe_msg(
+                    (<PreparedStatement>stmt).compiled)
+                self.write(msg)
             else:
                 if self._last_anon_compiled is None:
                     raise errors.TypeSpecNotFoundError(
@@ -1031,6 +1093,27 @@ cdef class EdgeConnection:
             raise errors.BinaryProtocolError(
                 f'unsupported "describe" message mode {chr(rtype)!r}')
 
+    async def _execute_nontransactional(self, query_unit):
+        pgcon = self.get_backend().pgcon
+        try:
+            for sql in query_unit.sql:
+                await pgcon.simple_query(sql, ignore_data=True)
+        except ConnectionAbortedError:
+            raise
+        except Exception:
+            for sql in query_unit.cleanup_sql:
+                try:
+                    await pgcon.simple_query(sql, ignore_data=True)
+                except ConnectionAbortedError:
+                    raise
+                except Exception:
+                    # Report the original error rather than
+                    # the cleanup failure.
+                    logger.exception(
+                        'failed to clean up after a non-transactional '
+                        'command')
+            raise
+
     async def _execute_system_config(self, query_unit):
         data = await self.get_backend().pgcon.simple_query(
             b';'.join(query_unit.sql), ignore_data=False)
@@ -1056,6 +1139,19 @@ cdef class EdgeConnection:
                 'server restart is required for the configuration '
                 'change to take effect')
 
+    async def _load_query_stats(self):
+        # sys::QueryStats is a view over the statistics stored in
+        # the session state table, refresh them before the query.
+        stats = self.dbview.dump_query_stats()
+        await self.get_backend().pgcon.simple_query(
+            b'INSERT INTO _edgecon_state(name, value, type) '
+            b"VALUES ('query_stats', " +
+            pg_ql(stats).encode() +
+            b", 'R') "
+            b'ON CONFLICT (name, type) DO UPDATE '
+            b'SET value = EXCLUDED.value;',
+            ignore_data=True)
+
     async def _execute(self, compiled: CompiledQuery, bind_args,
                        bint parse, bint use_prep_stmt):
         query_unit = compiled.query_unit
@@ -1089,8 +1185,17 @@ cdef class EdgeConnection:
             try:
                 if query_unit.system_config:
                     await self._execute_system_config(query_unit)
+                elif not query_unit.is_transactional:
+                    # The statements of a non-transactional unit must
+                    # run one by one (and be cleaned up after if one
+                    # fails), so they can't be pipelined as one query.
+                    await self._execute_nontransactional(query_unit)
                 else:
-                    await self.get_backend().pgcon.parse_execute(
+                    if query_unit.reads_query_stats:
+                        await self._load_query_stats()
+
+                    started_at = time.monotonic()
+                    rows = await self.get_backend().pgcon.parse_execute(
                         parse,              # =parse
                         1,                  # =execute
                         query_unit,         # =query
@@ -1099,6 +1204,11 @@ cdef class EdgeConnection:
                         process_sync,       # =send_sync
                         use_prep_stmt,      # =use_prep_stmt
                     )
+                    if compiled.stats_key is not None:
+                        self.dbview.record_query_execute(
+                            compiled.stats_key,
+                            time.monotonic() - started_at,
+                            rows or 0)
                     if query_unit.config_ops:
                         await self.dbview.apply_config_ops(
                             self.get_backend().pgcon,
@@ -1200,8 +1310,7 @@ cdef class EdgeConnection:
             self.debug_print('EXECUTE')
 
         if stmt_name:
-            raise errors.UnsupportedFeatureError(
-                'prepared statements are not yet supported')
+            compiled = await self._get_prepared_stmt(stmt_name)
         else:
             if self._last_anon_compiled is None:
                 raise errors.BinaryProtocolError(
@@ -1209,7 +1318,51 @@ cdef class EdgeConnection:
 
             compiled = self._last_anon_compiled
 
-        await self._execute(compiled, bind_args, False, False)
+        # The backend Parse is sent together with Bind/Execute in
+        # one batch.  Queries are executed through a backend prepared
+        # statement whenever possible, so that only Bind and Execute
+        # are sent in the common case.
+        await self._execute(
+            compiled, bind_args, True, bool(compiled.query_unit.sql_hash))
+
+    async def _get_prepared_stmt(self, bytes stmt_name) -> CompiledQuery:
+        cdef:
+            PreparedStatement stmt
+            CompiledQuery compiled
+
+        stmt = self._prepared_stmts.get(stmt_name)
+        if stmt is None:
+            name = stmt_name.decode(errors='replace')
+            raise errors.BinaryProtocolError(
+                f'no prepared statement {name!r} found')
+
+        state = self.dbview.get_compilation_state()
+        if state is not None and state == stmt.state:
+            return stmt.compiled
+
+        # The schema or the session state has changed since the
+        # statement was prepared; compile it again.
+        if self.debug:
+            self.debug_print('EXECUTE /REPARSE', stmt_name, stmt.eql)
+
+        compiled = await self._parse(
+            stmt.eql, stmt.io_format, stmt.expect_one, stmt.implicit_limit)
+
+        query_unit = compiled.query_unit
+        if (query_unit.in_type_id !=
+                stmt.compiled.query_unit.in_type_id or
+                query_unit.out_type_id !=
+                stmt.compiled.query_unit.out_type_id):
+            del self._prepared_stmts[stmt_name]
+            name = stmt_name.decode(errors='replace')
+            raise errors.TypeSpecNotFoundError(
+                f'prepared statement {name!r} is outdated because its '
+                f'argument or result types have changed; it must be '
+                f'prepared again')
+
+        stmt.compiled = compiled
+        stmt.state = state
+        return compiled
 
     async def optimistic_execute(self):
         cdef:
@@ -1257,11 +1410,13 @@ cdef class EdgeConnection:
             self._last_anon_compiled = compiled
             query_unit = compiled.query_unit
         else:
+            self.dbview.record_query_cache_hit(normalized.key())
             compiled = CompiledQuery(
                 query_unit=query_unit,
                 first_extra=normalized.first_extra(),
                 extra_count=normalized.extra_count(),
                 extra_blob=normalized.extra_blob(),
+                stats_key=normalized.key(),
             )
 
         if (query_unit.in_type_id != in_tid or
@@ -1272,12 +1427,8 @@ cdef class EdgeConnection:
 
             self.write(self.make_describe_msg(compiled))
 
-            # We must re-parse the query so that it becomes
-            # "last anonymous statement" *in Postgres*.
-            # Otherwise the `await self._execute` below would execute
-            # some other query.
-            compiled = await self._parse(
-                query, io_format, expect_one, implicit_limit)
+            # The query becomes the "last anonymous statement", so
+            # that the client can follow up with an Execute.
             self._last_anon_compiled = compiled
             return
 
@@ -1292,7 +1443,11 @@ cdef class EdgeConnection:
     async def sync(self):
         self.buffer.consume_message()
 
-        await self.get_backend().pgcon.sync()
+        if self._pending_parse is not None:
+            # The Sync completes the pipelined backend Parse.
+            await self._wait_for_parse(True)
+        else:
+            await self.get_backend().pgcon.sync()
         self.write(self.pgcon_last_sync_status())
 
         if self.debug:
@@ -1320,7 +1475,8 @@ cdef class EdgeConnection:
                 self.close()
 
                 if not isinstance(ex, (errors.ProtocolError,
-                                       errors.AuthenticationError)):
+                                       errors.AuthenticationError,
+                                       errors.AvailabilityError)):
                     self.loop.call_exception_handler({
                         'message': (
                             'unhandled error in edgedb protocol while '
@@ -1346,6 +1502,17 @@ cdef class EdgeConnection:
                 flush_sync_on_error = False
 
                 try:
+                    if self._pending_parse is not None:
+                        if mtype == b'S':
+                            # The Sync is consumed by the time the
+                            # backend Parse fails.
+                            flush_sync_on_error = True
+                        elif mtype != b'X':
+                            # No Sync after Parse: flush the backend
+                            # Parse so that its errors are reported
+                            # before this message is processed.
+                            await self._wait_for_parse(False)
+
                     if mtype == b'P':
                         await self.parse()
 
@@ -1539,6 +1706,15 @@ cdef class EdgeConnection:
         self.write(buf)
 
     async def _interpret_backend_error(self, exc):
+        if not self.dbview.in_tx_with_ddl():
+            # The schema is the one of the current database version,
+            # so try to interpret the error without calling the compiler.
+            name_map = await self._get_backend_name_map()
+            static_exc = errormech.interpret_backend_error_with_names(
+                name_map, exc.fields)
+            if static_exc is not errormech.SchemaRequired:
+                return static_exc
+
         if self.dbview.in_tx():
             return await self.get_backend().compiler.call(
                 'interpret_backend_error_in_tx',
@@ -1550,6 +1726,16 @@ cdef class EdgeConnection:
                 self.dbview.dbver,
                 exc.fields)
 
+    async def _get_backend_name_map(self):
+        name_map = self.dbview.get_backend_name_map()
+        if name_map is None:
+            dbver = self.dbview.dbver
+            name_map = await self.get_backend().compiler.call(
+                'get_backend_name_map',
+                dbver)
+            self.dbview.set_backend_name_map(dbver, name_map)
+        return name_map
+
     cdef write_log(self, EdgeSeverity severity, uint32_t code, str message):
         cdef:
             WriteBuffer buf
@@ -1751,7 +1937,7 @@ cdef class EdgeConnection:
             )
 
         dbname = self.dbview.dbname
-        pgcon = await self.port.new_pgcon(dbname)
+        pgcon = await self.port.new_pgcon(dbname, user=self.dbview.user)
 
         # To avoid having races, we want to:
         #
@@ -1924,7 +2110,7 @@ cdef class EdgeConnection:
 
         self.buffer.finish_message()
         dbname = self.dbview.dbname
-        pgcon = await self.port.new_pgcon(dbname)
+        pgcon = await self.port.new_pgcon(dbname, user=self.dbview.user)
 
         try:
             await pgcon.simple_query(
@@ -2057,10 +2243,12 @@ cdef class Timer:
             yield
         finally:
             ts_end = time.monotonic()
-            duration = ts_end - ts_start
-            series = self._durations.setdefault(operation, [])
-            series.append(duration)
-            self.maybe_log_stats(operation, series=series)
+            self.record(operation, ts_end - ts_start)
+
+    def record(self, operation: str, duration: float) -> None:
+        series = self._durations.setdefault(operation, [])
+        series.append(duration)
+        self.maybe_log_stats(operation, series=series)
 
     def maybe_log_stats(
         self, operation: str, *, series: Sequence[float] = ()
@@ -88,12 +88,23 @@ class ManagementPort(baseport.Port):
     def get_compiler_worker_name(self):
         return 'compiler-mng'
 
-    async def new_backend(self, *, dbname: str, dbver: int):
+    async def new_backend(self, *, dbname: str, user: str, dbver: int):
         try:
             async with taskgroup.TaskGroup() as g:
-                new_pgcon_task = g.create_task(self.new_pgcon(dbname))
+                new_pgcon_task = g.create_task(
+                    self.new_pgcon(dbname, user=user))
                 compiler_task = g.create_task(self.new_compiler(dbname, dbver))
         except taskgroup.MultiError as ex:
+            # Don't leak the half of the backend that was created
+            # (and which, in case of the pgcon, occupies a backend
+            # connection slot).
+            if new_pgcon_task.done() and not new_pgcon_task.cancelled():
+                if new_pgcon_task.exception() is None:
+                    new_pgcon_task.result().terminate()
+            if compiler_task.done() and not compiler_task.cancelled():
+                if compiler_task.exception() is None:
+                    await compiler_task.result().close()
+
             # Errors like "database ??? does not exist" should
             # not be obfuscated by a MultiError.
             raise ex.__errors__[0]
@@ -109,9 +120,9 @@ class ManagementPort(baseport.Port):
         self._edgecon_id += 1
         return str(self._edgecon_id)
 
-    async def new_pgcon(self, dbname):
+    async def new_pgcon(self, dbname, *, user):
         server = self.get_server()
-        return await server.new_pgcon(dbname)
+        return await server.new_pgcon(dbname, user=user)
 
     def on_client_authed(self):
         self._num_connections += 1
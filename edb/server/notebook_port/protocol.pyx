@@ -147,7 +147,8 @@ cdef class Protocol(http.HttpProtocol):
 
                     try:
                         data = await pgcon.parse_execute_notebook(
-                            query_unit.sql[0], query_unit.dbver)
+                            query_unit.sql[0], query_unit.dbver,
+                            query_unit.explain_map)
                     except Exception as ex:
                         if debug.flags.server:
                             markup.dump(ex)
@@ -78,11 +78,13 @@ cdef class PGProto:
 
         stmt_cache.StatementsCache prep_stmts
         list last_parse_prep_stmts
+        tuple pending_parse
 
         bint debug
 
         object pgaddr
         object edgecon_ref
+        object close_cb
 
         bint idle
 
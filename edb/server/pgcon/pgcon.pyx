@@ -51,6 +51,7 @@ from edb.server.pgproto.pgproto cimport (
 
 from edb.server import buildmeta
 from edb.server import compiler
+from edb.server.compiler import explain as compiler_explain
 from edb.server import defines
 from edb.server.cache cimport stmt_cache
 from edb.server.mng_port cimport edgecon
@@ -97,6 +98,23 @@ def _build_init_con_script() -> bytes:
     ''').encode('utf-8')
 
 
+def make_explain_data_row(bytes data, object explain_map) -> bytes:
+    """Annotate the plan in the *data* of an EXPLAIN DataRow message.
+
+    Return a complete DataRow message with the annotated plan.
+    """
+    cdef WriteBuffer buf
+
+    # The plan is the only column of the row: skip the column
+    # count (int16) and the value length (int32).
+    plan = compiler_explain.annotate_plan(data[6:], explain_map)
+
+    buf = WriteBuffer.new_message(b'D')
+    buf.write_int16(1)
+    buf.write_len_prefixed_bytes(plan)
+    return bytes(buf.end_message())
+
+
 async def connect(connargs, dbname):
     global INIT_CON_SCRIPT
 
@@ -170,10 +188,12 @@ cdef class PGProto:
         self.backend_secret = -1
 
         self.last_parse_prep_stmts = []
+        self.pending_parse = None
         self.debug = debug.flags.server_proto
 
         self.pgaddr = addr
         self.edgecon_ref = None
+        self.close_cb = None
 
         self.idle = True
 
@@ -186,6 +206,13 @@ cdef class PGProto:
     def set_edgecon(self, edgecon.EdgeConnection edgecon):
         self.edgecon_ref = weakref.ref(edgecon)
 
+    def set_close_callback(self, cb):
+        """Set a callback to be called once the connection is closed."""
+        if not self.is_connected():
+            cb()
+        else:
+            self.close_cb = cb
+
     def get_pgaddr(self):
         return self.pgaddr
 
@@ -289,6 +316,7 @@ cdef class PGProto:
         use_prep_stmt,
         args,
         WriteBuffer out,
+        explain_map=None,
     ):
         cdef:
             WriteBuffer parse_buf
@@ -355,7 +383,11 @@ cdef class PGProto:
             try:
                 if mtype == b'D':
                     # DataRow
-                    self.buffer.redirect_messages(out, b'D', 0)
+                    if explain_map is not None:
+                        out.write_bytes(make_explain_data_row(
+                            self.buffer.consume_message(), explain_map))
+                    else:
+                        self.buffer.redirect_messages(out, b'D', 0)
 
                 elif mtype == b'E':
                     # ErrorResponse
@@ -398,6 +430,7 @@ cdef class PGProto:
         dbver,
         use_prep_stmt,
         args,
+        explain_map=None,
     ):
         cdef:
             WriteBuffer out
@@ -405,7 +438,7 @@ cdef class PGProto:
 
         out = WriteBuffer.new()
         await self._parse_execute_to_buf(
-            sql, sql_hash, dbver, use_prep_stmt, args, out)
+            sql, sql_hash, dbver, use_prep_stmt, args, out, explain_map)
 
         cpython.PyObject_GetBuffer(out, &pybuf, cpython.PyBUF_SIMPLE)
         try:
@@ -450,6 +483,7 @@ cdef class PGProto:
         dbver,
         use_prep_stmt,
         args,
+        explain_map=None,
     ):
         self.before_command()
         try:
@@ -459,6 +493,7 @@ cdef class PGProto:
                 dbver,
                 use_prep_stmt,
                 args,
+                explain_map,
             )
         finally:
             self.after_command()
@@ -467,6 +502,7 @@ cdef class PGProto:
         self,
         sql,
         dbver,
+        explain_map=None,
     ):
         cdef:
             WriteBuffer out
@@ -475,7 +511,8 @@ cdef class PGProto:
         self.before_command()
         try:
             out = WriteBuffer.new()
-            await self._parse_execute_to_buf(sql, b'', dbver, False, (), out)
+            await self._parse_execute_to_buf(
+                sql, b'', dbver, False, (), out, explain_map)
 
             cpython.PyObject_GetBuffer(out, &pybuf, cpython.PyBUF_SIMPLE)
             try:
@@ -509,6 +546,7 @@ cdef class PGProto:
             uint64_t msgs_parsed = 0
             uint64_t msgs_executed = 0
             uint64_t i
+            int64_t rows = 0
 
         if not parse and not execute:
             raise RuntimeError('invalid parse/execute call')
@@ -607,7 +645,14 @@ cdef class PGProto:
                         if buf is None:
                             buf = WriteBuffer.new()
 
-                        self.buffer.redirect_messages(buf, b'D', 0)
+                        if query.explain_map is not None:
+                            buf.write_bytes(make_explain_data_row(
+                                self.buffer.consume_message(),
+                                query.explain_map))
+                            rows += 1
+                        else:
+                            rows += self.buffer.redirect_messages(
+                                buf, b'D', 0)
                         if buf.len() >= DATA_BUFFER_SIZE:
                             edgecon.write(buf)
                             buf = None
@@ -620,7 +665,7 @@ cdef class PGProto:
                             buf = None
                         msgs_executed += 1
                         if msgs_executed == msgs_num:
-                            return
+                            return rows
 
                     elif mtype == b'1' and parse:
                         # ParseComplete
@@ -629,7 +674,7 @@ cdef class PGProto:
                             self.prep_stmts[stmt_name] = query.dbver
                         msgs_parsed += 1
                         if not execute and msgs_parsed == msgs_num:
-                            return
+                            return rows
 
                     elif mtype == b'E':  ## result
                         # ErrorResponse
@@ -643,7 +688,7 @@ cdef class PGProto:
                     elif mtype == b's' and execute:  ## result
                         # PortalSuspended
                         self.buffer.discard_message()
-                        return
+                        return rows
 
                     elif mtype == b'2' and execute:
                         # BindComplete
@@ -652,7 +697,7 @@ cdef class PGProto:
                     elif mtype == b'I' and execute:  ## result
                         # EmptyQueryResponse
                         self.buffer.discard_message()
-                        return
+                        return rows
 
                     elif mtype == b'3':
                         # CloseComplete
@@ -667,6 +712,110 @@ cdef class PGProto:
             if send_sync:
                 await self.wait_for_sync()
 
+    def send_parse(self, object query):
+        """Send a Parse of the backend prepared statement for *query*.
+
+        The Parse is sent without waiting for the result, which is
+        read by wait_for_parse().  Return False if the statement is
+        already prepared, in which case nothing is sent.
+        """
+        cdef:
+            WriteBuffer packet
+            WriteBuffer buf
+
+        stmt_name = query.sql_hash
+        if not stmt_name or len(query.sql) != 1:
+            raise errors.InternalServerError(
+                'only single-statement queries can be parsed in advance')
+
+        if self.prep_stmts.get(stmt_name, None) == query.dbver:
+            return False
+
+        self.before_command()
+        try:
+            packet = WriteBuffer.new()
+            parse, store_stmt = self.before_prepare(
+                stmt_name, query.dbver, packet)
+            assert parse
+
+            buf = WriteBuffer.new_message(b'P')
+            buf.write_bytestring(stmt_name)
+            buf.write_bytestring(query.sql[0])
+            buf.write_int16(0)
+            packet.write_buffer(buf.end_message())
+
+            self.write(packet)
+        except Exception:
+            self.after_command()
+            raise
+
+        # The connection stays busy until wait_for_parse() is called.
+        self.pending_parse = (stmt_name, query.dbver, store_stmt)
+        return True
+
+    async def wait_for_parse(self, bint sync):
+        """Wait for the result of the Parse sent by send_parse().
+
+        The Parse is followed by a Sync if *sync* is true, and by a
+        Flush otherwise.  Raise BackendError if the backend failed to
+        parse the statement; in the Flush case the backend ignores all
+        messages until the next Sync.
+        """
+        if self.pending_parse is None:
+            raise RuntimeError('no Parse is waiting for the result')
+
+        stmt_name, dbver, store_stmt = self.pending_parse
+        self.pending_parse = None
+        error = None
+
+        try:
+            if sync:
+                self.waiting_for_sync = True
+                self.write(SYNC_MESSAGE)
+            else:
+                self.write(FLUSH_MESSAGE)
+
+            while True:
+                if not self.buffer.take_message():
+                    await self.wait_for_message()
+                mtype = self.buffer.get_message_type()
+
+                try:
+                    if mtype == b'1':
+                        # ParseComplete
+                        self.buffer.discard_message()
+                        if store_stmt:
+                            self.prep_stmts[stmt_name] = dbver
+                        if not sync:
+                            break
+
+                    elif mtype == b'E':
+                        # ErrorResponse
+                        er = self.parse_error_message()
+                        error = pgerror.BackendError(fields=er)
+                        if not sync:
+                            break
+
+                    elif mtype == b'3':
+                        # CloseComplete
+                        self.buffer.discard_message()
+
+                    elif mtype == b'Z':
+                        # ReadyForQuery
+                        self.parse_sync_message()
+                        break
+
+                    else:
+                        self.fallthrough()
+
+                finally:
+                    self.buffer.finish_message()
+        finally:
+            self.after_command()
+
+        if error is not None:
+            raise error
+
     async def parse_execute(
         self,
         bint parse,
@@ -1197,6 +1346,10 @@ cdef class PGProto:
 
         self.transport = None
 
+        if self.close_cb is not None:
+            cb, self.close_cb = self.close_cb, None
+            cb()
+
     def pause_writing(self):
         pass
 
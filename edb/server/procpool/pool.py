@@ -18,6 +18,7 @@
 
 
 from __future__ import annotations
+from typing import *
 
 import asyncio
 import base64
@@ -25,11 +26,14 @@ import collections
 import logging
 import os.path
 import pickle
+import signal
 import subprocess
 import sys
 import time
 
 from edb.common import debug
+from edb.common import devmode
+from edb.common import sampler
 from edb.common import supervisor
 from edb.common import taskgroup
 
@@ -39,7 +43,13 @@ from . import amsg
 BUFFER_POOL_SIZE = 4
 PROCESS_INITIAL_RESPONSE_TIMEOUT = 60.0
 KILL_TIMEOUT = 10.0
+# How often the memory use of workers is checked against the limit.
+WORKER_MEMORY_CHECK_INTERVAL = 5.0
+# How often a worker which refuses to be recycled (see can_recycle())
+# is asked again.
+WORKER_RECYCLE_RETRY_INTERVAL = 1.0
 WORKER_MOD = __name__.rpartition('.')[0] + '.worker'
+TEMPLATE_MOD = __name__.rpartition('.')[0] + '.template'
 
 
 logger = logging.getLogger("edb.server")
@@ -52,6 +62,183 @@ _ENV = os.environ.copy()
 _ENV['PYTHONPATH'] = ':'.join(sys.path)
 
 
+def _get_worker_env():
+    env = _ENV
+    if debug.flags.server:
+        env = {'EDGEDB_DEBUG_SERVER': '1', **_ENV}
+    return env
+
+
+def _get_private_memory(pid):
+    """Return the amount of private memory of process *pid* in bytes.
+
+    Workers forked from the template share most of their pages with
+    it, so their RSS is not a good measure of how much memory they
+    have accumulated; the private (not shared) part of it is.
+
+    Returns None if it cannot be determined (e.g. there is no procfs
+    on this platform).
+    """
+    try:
+        with open(f'/proc/{pid}/smaps_rollup', 'rb') as f:
+            private = 0
+            for line in f:
+                if line.startswith(b'Private_'):
+                    # "Private_Dirty:  1234 kB"
+                    private += int(line.split()[1]) * 1024
+            return private
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class ForkedProcess:
+    """A minimal asyncio.subprocess.Process look-alike for forked workers.
+
+    Forked workers are children of the template process rather than
+    of the server, so they are signalled through the template, which
+    also reports their exit.
+    """
+
+    def __init__(self, template, pid):
+        self.pid = pid
+        self.returncode = None
+        self._template = template
+        self._exit_waiter = asyncio.get_running_loop().create_future()
+
+    def _set_returncode(self, returncode):
+        if self.returncode is None:
+            self.returncode = returncode
+            self._exit_waiter.set_result(returncode)
+
+    def send_signal(self, signum):
+        if self.returncode is not None:
+            raise ProcessLookupError(self.pid)
+        self._template.send_signal(self.pid, signum)
+
+    def terminate(self):
+        self.send_signal(signal.SIGTERM)
+
+    def kill(self):
+        self.send_signal(signal.SIGKILL)
+
+    async def wait(self):
+        return await asyncio.shield(self._exit_waiter)
+
+
+class Template:
+    """A preloaded process that new workers are forked from.
+
+    See template.py for details.
+    """
+
+    def __init__(self, command_args):
+        self._command_args = command_args
+        self._proc = None
+        self._reader = None
+        self._procs = {}
+        self._fork_waiters = collections.deque()
+
+    def is_alive(self):
+        return (
+            self._proc is not None
+            and self._proc.returncode is None
+            and self._reader is not None
+            and not self._reader.done()
+        )
+
+    async def start(self):
+        self._proc = await asyncio.create_subprocess_exec(
+            *self._command_args,
+            env=_get_worker_env(),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE)
+
+        try:
+            resp = await asyncio.wait_for(
+                self._proc.stdout.readline(),
+                PROCESS_INITIAL_RESPONSE_TIMEOUT)
+            if resp != b'ready\n':
+                raise RuntimeError(
+                    f'unexpected response from the pool template '
+                    f'process: {resp!r}')
+        except Exception:
+            await self.stop()
+            raise
+
+        self._reader = asyncio.create_task(self._read_replies())
+
+    async def _read_replies(self):
+        try:
+            while True:
+                line = await self._proc.stdout.readline()
+                if not line:
+                    break
+
+                op, *args = line.split()
+                if op == b'pid':
+                    self._on_forked(int(args[0]))
+                elif op == b'exit':
+                    proc = self._procs.pop(int(args[0]), None)
+                    if proc is not None:
+                        proc._set_returncode(int(args[1]))
+                else:
+                    logger.error(
+                        'unexpected response from the pool template '
+                        'process: %r', line)
+                    break
+        finally:
+            # The forked workers exit along with the template, but
+            # their exit status can't be known anymore.
+            for waiter in self._fork_waiters:
+                if not waiter.done():
+                    waiter.set_exception(ConnectionError(
+                        'the pool template process has exited'))
+            self._fork_waiters.clear()
+            for proc in self._procs.values():
+                proc._set_returncode(-1)
+            self._procs.clear()
+
+    def _on_forked(self, pid):
+        proc = ForkedProcess(self, pid)
+        self._procs[pid] = proc
+        waiter = self._fork_waiters.popleft()
+        if waiter.done():
+            # fork() has timed out.
+            proc.kill()
+        else:
+            waiter.set_result(proc)
+
+    async def fork(self):
+        if not self.is_alive():
+            raise ConnectionError('the pool template process has exited')
+        waiter = asyncio.get_running_loop().create_future()
+        self._fork_waiters.append(waiter)
+        self._proc.stdin.write(
+            b'fork 1\n' if sampler.is_running() else b'fork 0\n')
+        return await asyncio.wait_for(
+            waiter, PROCESS_INITIAL_RESPONSE_TIMEOUT)
+
+    def send_signal(self, pid, signum):
+        if not self.is_alive():
+            raise ProcessLookupError(pid)
+        self._proc.stdin.write(b'kill %d %d\n' % (pid, signum))
+
+    async def stop(self):
+        if self._proc is None or self._proc.returncode is not None:
+            return
+        # Closing stdin tells the template to exit.
+        self._proc.stdin.close()
+        try:
+            await asyncio.wait_for(self._proc.wait(), KILL_TIMEOUT)
+        except asyncio.TimeoutError:
+            try:
+                self._proc.kill()
+            except ProcessLookupError:
+                pass
+        if self._reader is not None:
+            await self._reader
+
+
 class Worker:
 
     def __init__(self, manager, server, command_args):
@@ -64,6 +251,19 @@ class Worker:
         self._closed = False
         self._sup = None
 
+        # The call that initializes a fresh worker process, replayed
+        # whenever the process is respawned or recycled.
+        self._init_call = None
+        # The number of calls served by the current process.
+        self._requests = 0
+        # Requests to the worker process are serialized, so that the
+        # process can be swapped between calls.
+        self._lock = asyncio.Lock()
+        self._recycling = False
+        # A spawned and initialized process waiting to replace
+        # the current one.
+        self._replacement = None
+
     async def _kill_proc(self, proc):
         try:
             proc.kill()
@@ -76,47 +276,79 @@ class Worker:
             proc.terminate()
             raise
 
-    async def _spawn(self):
-        self._manager._stats_spawned += 1
+    async def _new_proc(self):
+        proc = None
 
-        if self._proc is not None:
-            self._manager._sup.create_task(self._kill_proc(self._proc))
-            self._proc = None
-
-        env = _ENV
-        if debug.flags.server:
-            env = {'EDGEDB_DEBUG_SERVER': '1', **_ENV}
-
-        self._proc = await asyncio.create_subprocess_exec(
-            *self._command_args,
-            env=env,
-            stdin=subprocess.DEVNULL)
+        template = self._manager._template
+        if template is not None and template.is_alive():
+            try:
+                proc = await template.fork()
+            except Exception:
+                logger.exception(
+                    'could not fork a worker from the pool template process;'
+                    ' falling back to spawning new worker processes')
+                self._manager._template = None
+                self._manager._sup.create_task(template.stop())
+
+        if proc is None:
+            # Workers spawned while the sampling profiler is toggled on
+            # must start sampling too (and vice versa).
+            env = {
+                **_get_worker_env(),
+                'EDGEDB_DEBUG_SAMPLING_PROFILER':
+                    '1' if sampler.is_running() else '0',
+            }
+
+            proc = await asyncio.create_subprocess_exec(
+                *self._command_args,
+                env=env,
+                stdin=subprocess.DEVNULL)
         try:
-            self._con = await asyncio.wait_for(
-                self._server.get_by_pid(self._proc.pid),
+            con = await asyncio.wait_for(
+                self._server.get_by_pid(proc.pid),
                 PROCESS_INITIAL_RESPONSE_TIMEOUT)
+            if self._init_call is not None:
+                await self._request(con, *self._init_call)
         except Exception:
             try:
-                self._proc.kill()
+                proc.kill()
             except ProcessLookupError:
                 pass
             raise
 
+        return proc, con
+
+    async def _spawn(self):
+        self._manager._stats_spawned += 1
+
+        if self._proc is not None:
+            self._manager._sup.create_task(self._kill_proc(self._proc))
+            self._proc = None
+
+        self._proc, self._con = await self._new_proc()
+        self._requests = 0
+
     def get_pid(self):
         return self._proc.pid
 
-    async def call(self, method_name, *args):
-        assert not self._closed
-
-        if self._con.is_closed():
-            await self._spawn()
+    def send_signal(self, signum):
+        procs = [self._proc]
+        if self._replacement is not None:
+            procs.append(self._replacement[0])
+        for proc in procs:
+            if proc is None:
+                # Being respawned.
+                continue
+            try:
+                proc.send_signal(signum)
+            except ProcessLookupError:
+                pass
 
+    async def _request(self, con, method_name, args):
         msg = pickle.dumps((method_name, args))
-        data = await self._con.request(msg)
+        data = await con.request(msg)
         status, *data = pickle.loads(data)
 
-        self._last_used = time.monotonic()
-
         if status == 0:
             return data[0]
         elif status == 1:
@@ -129,6 +361,92 @@ class Worker:
             exc.__formatted_error__ = data[0]
             raise exc
 
+    async def init(self, method_name, *args):
+        """Call *method_name* and remember it as the initialization call.
+
+        The call is replayed on every new process that replaces the
+        current one, i.e. when the worker is respawned after a crash
+        or recycled.
+        """
+        self._init_call = (method_name, args)
+        return await self.call(method_name, *args)
+
+    async def call(self, method_name, *args):
+        assert not self._closed
+
+        async with self._lock:
+            if self._con.is_closed():
+                await self._spawn()
+
+            try:
+                return await self._request(self._con, method_name, args)
+            finally:
+                self._last_used = time.monotonic()
+                self._requests += 1
+                max_requests = self._manager._max_worker_requests
+                if max_requests is not None and self._requests >= max_requests:
+                    self._recycle()
+
+    def _recycle(self):
+        if not self._recycling and not self._closed:
+            self._recycling = True
+            self._manager._sup.create_task(self._prepare_replacement())
+
+    async def _prepare_replacement(self):
+        # Spawn the replacement and swap the processes in the
+        # background, so that the calls to this worker are not
+        # blocked on it.
+        try:
+            proc, con = await self._new_proc()
+        except Exception:
+            logger.exception(
+                'could not spawn a replacement for a %s worker with PID %d',
+                self._manager._name, self._proc.pid)
+            self._recycling = False
+            return
+
+        if self._closed:
+            await self._kill_proc(proc)
+            return
+
+        self._replacement = (proc, con)
+        while True:
+            async with self._lock:
+                if self._replacement is None or await self._try_swap():
+                    return
+            await asyncio.sleep(WORKER_RECYCLE_RETRY_INTERVAL)
+            if not self._manager._running:
+                # close() kills the replacement.
+                return
+
+    async def _try_swap(self):
+        # Must be called with self._lock held, which guarantees that
+        # there are no calls in flight in the current process.
+        if not self._con.is_closed() and not await self._can_recycle():
+            return False
+
+        old_proc = self._proc
+        self._proc, self._con = self._replacement
+        self._replacement = None
+        self._requests = 0
+        self._recycling = False
+        self._manager._sup.create_task(self._kill_proc(old_proc))
+        self._manager._stats_spawned += 1
+        self._manager._stats_recycled += 1
+        self._manager._report_workers(self, action="recycle")
+        return True
+
+    async def _can_recycle(self):
+        # The worker object may keep state between calls (e.g.
+        # an open transaction) that can't be transferred to the new
+        # process; let it tell when it is safe to drop it.
+        if not hasattr(self._manager._worker_cls, 'can_recycle'):
+            return True
+        try:
+            return await self._request(self._con, 'can_recycle', ())
+        except Exception:
+            return False
+
     async def close(self):
         if self._closed:
             return
@@ -136,6 +454,10 @@ class Worker:
         self._manager._stats_killed += 1
         self._manager._workers.discard(self)
         self._manager._report_workers(self, action="kill")
+        if self._replacement is not None:
+            proc, _ = self._replacement
+            self._replacement = None
+            self._manager._sup.create_task(self._kill_proc(proc))
         try:
             self._proc.terminate()
             await self._proc.wait()
@@ -146,7 +468,8 @@ class Worker:
 class Manager:
 
     def __init__(self, *, worker_cls, worker_args,
-                 loop, name, runstate_dir, pool_size=BUFFER_POOL_SIZE):
+                 loop, name, runstate_dir, pool_size=BUFFER_POOL_SIZE,
+                 max_worker_requests=None, max_worker_rss=None):
 
         self._worker_cls = worker_cls
         self._worker_args = worker_args
@@ -163,24 +486,36 @@ class Manager:
         self._workers_pool = collections.deque()
         self._workers = set()
 
+        # Workers are transparently replaced with fresh processes once
+        # they have served *max_worker_requests* calls, or once their
+        # private memory is found to exceed *max_worker_rss* bytes
+        # (it is checked every WORKER_MEMORY_CHECK_INTERVAL seconds).
+        self._max_worker_requests = max_worker_requests
+        self._max_worker_rss = max_worker_rss
+
         self._server = amsg.Server(self._poolsock_name, loop)
 
         self._running = False
 
         self._stats_spawned = 0
         self._stats_killed = 0
+        self._stats_recycled = 0
 
         self._sup = None
+        self._template = None
+        self._memory_checker = None
 
-        self._worker_command_args = [
-            sys.executable, '-m', WORKER_MOD,
-
+        worker_args = [
             '--cls-name',
             f'{self._worker_cls.__module__}.{self._worker_cls.__name__}',
 
             '--cls-args', base64.b64encode(pickle.dumps(self._worker_args)),
             '--sockname', self._poolsock_name
         ]
+        self._worker_command_args = [
+            sys.executable, '-m', WORKER_MOD, *worker_args]
+        self._template_command_args = [
+            sys.executable, '-m', TEMPLATE_MOD, *worker_args]
 
     def iter_workers(self):
         return iter(frozenset(self._workers))
@@ -188,6 +523,24 @@ class Manager:
     def is_running(self):
         return self._running
 
+    def signal_workers(self, signum):
+        for worker in list(self._workers) + list(self._workers_pool):
+            worker.send_signal(signum)
+
+    async def _check_memory(self):
+        # Reading the memory stats of a large process takes a while,
+        # so this is done periodically in a thread rather than after
+        # every call.
+        while True:
+            await asyncio.sleep(WORKER_MEMORY_CHECK_INTERVAL)
+            for worker in list(self._workers):
+                if worker._recycling or worker._proc is None:
+                    continue
+                mem = await self._loop.run_in_executor(
+                    None, _get_private_memory, worker._proc.pid)
+                if mem is not None and mem > self._max_worker_rss:
+                    worker._recycle()
+
     async def _spawn_worker(self, *, report: bool = True):
         worker = Worker(self, self._server, self._worker_command_args)
         await worker._spawn()
@@ -227,14 +580,41 @@ class Manager:
         await self._server.start()
         self._running = True
 
+        # Forking workers from a template process is not compatible
+        # with collecting coverage data in them.
+        if (hasattr(os, 'fork') and
+                devmode.CoverageConfig.from_environ() is None):
+            template = Template(self._template_command_args)
+            try:
+                await template.start()
+            except Exception:
+                logger.exception(
+                    'could not start the pool template process; '
+                    'falling back to spawning new worker processes')
+            else:
+                self._template = template
+
         if self._pool_size:
             async with taskgroup.TaskGroup(name='manager-start') as g:
                 for _ in range(self._pool_size):
                     g.create_task(self._spawn_for_pool())
 
+        if self._max_worker_rss is not None:
+            self._memory_checker = self._loop.create_task(
+                self._check_memory())
+
     async def stop(self):
         if not self._running:
             return
+        self._running = False
+
+        if self._memory_checker is not None:
+            self._memory_checker.cancel()
+            try:
+                await self._memory_checker
+            except asyncio.CancelledError:
+                pass
+            self._memory_checker = None
 
         await self._sup.wait()
 
@@ -244,13 +624,16 @@ class Manager:
         workers_to_kill = list(self._workers) + list(self._workers_pool)
         self._workers_pool.clear()
         self._workers.clear()
-        self._running = False
 
         async with taskgroup.TaskGroup(
                 name=f'{self._name}-manager-stop') as g:
             for worker in workers_to_kill:
                 g.create_task(worker.close())
 
+        if self._template is not None:
+            await self._template.stop()
+            self._template = None
+
     def _report_workers(self, worker: Worker, *, action: str = "spawn"):
         action = action.capitalize()
         if not action.endswith("e"):
@@ -258,7 +641,7 @@ class Manager:
         action += "d"
         log_metrics.info(
             "%s a %s worker with PID %d; used=%d; pool=%d;"
-            + " spawned=%d; killed=%d",
+            + " spawned=%d; killed=%d; recycled=%d",
             action,
             self._name,
             worker.get_pid(),
@@ -266,12 +649,15 @@ class Manager:
             len(self._workers_pool),
             self._stats_spawned,
             self._stats_killed,
+            self._stats_recycled,
         )
 
 
 async def create_manager(*, runstate_dir: str, name: str,
                          worker_cls: type, worker_args: dict,
-                         pool_size: int) -> Manager:
+                         pool_size: int,
+                         max_worker_requests: Optional[int] = None,
+                         max_worker_rss: Optional[int] = None) -> Manager:
 
     loop = asyncio.get_running_loop()
     pool = Manager(
@@ -280,7 +666,9 @@ async def create_manager(*, runstate_dir: str, name: str,
         worker_cls=worker_cls,
         worker_args=worker_args,
         name=name,
-        pool_size=pool_size)
+        pool_size=pool_size,
+        max_worker_requests=max_worker_requests,
+        max_worker_rss=max_worker_rss)
 
     await pool.start()
     return pool
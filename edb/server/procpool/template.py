@@ -0,0 +1,218 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2020-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""The template ("zygote") process that pool workers are forked from.
+
+The template creates a worker object, lets it preload everything it
+needs (see BaseCompiler.preload()), freezes the GC, and then forks
+a new worker process whenever the pool manager asks for one.  This is
+much faster than starting a new interpreter, and the preloaded data is
+shared between all workers copy-on-write.
+
+The manager talks to the template over its stdin and stdout:
+
+* the template writes "ready" once the worker object is initialized;
+* the manager writes "fork <sampling>", where <sampling> is "1" if
+  the new worker should start the sampling profiler;
+* the template replies with "pid <pid>" of the forked worker;
+* the manager writes "kill <pid> <signal>" to signal a worker;
+* the template writes "exit <pid> <returncode>" when a worker exits.
+
+Forked workers are children of the template, so only the template
+can wait for them.  Because it also sends all signals to them, a PID
+is never signalled after it has been reaped and possibly reused by an
+unrelated process.  Forked workers exit when the template does.
+"""
+
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import gc
+import os
+import pickle
+import select
+import signal
+import sys
+import threading
+import traceback
+
+from edb.common import debug
+
+from . import amsg
+from . import worker as procworker
+
+
+def _watch_lifeline(fd):
+    # The write end of the lifeline pipe is only open in the template,
+    # so the read returns once the template has exited.
+    os.read(fd, 1)
+    os._exit(1)
+
+
+def run_forked_worker(cls, cls_args, sockname, instance, sampling,
+                      lifeline, wakeup_fds):
+    # Restore what the template has set up for waiting on its
+    # children, so that the worker can manage its own.
+    signal.set_wakeup_fd(-1)
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    for fd in (*wakeup_fds, lifeline[1]):
+        os.close(fd)
+
+    threading.Thread(
+        target=_watch_lifeline, args=(lifeline[0],), daemon=True).start()
+
+    # The template's stdin and stdout are used to talk to the pool
+    # manager, don't let the worker touch them.
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.close(devnull)
+    os.dup2(2, 1)
+
+    debug.flags.sampling_profiler = sampling
+
+    status = 0
+    try:
+        procworker.run_worker(cls, cls_args, sockname, instance=instance)
+    except amsg.PoolClosedError:
+        pass
+    except BaseException:
+        traceback.print_exc()
+        status = 1
+    finally:
+        os._exit(status)
+
+
+def main():
+    # Forked workers inherit this until they install their own
+    # SIGUSR2 handler, see worker.main().
+    signal.signal(signal.SIGUSR2, signal.SIG_IGN)
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--cls-name')
+    parser.add_argument('--cls-args')
+    parser.add_argument('--sockname')
+    args = parser.parse_args()
+
+    cls = procworker.load_class(args.cls_name)
+    cls_args = pickle.loads(base64.b64decode(args.cls_args))
+
+    instance = cls(**cls_args)
+    preload = getattr(instance, 'preload', None)
+    if preload is not None:
+        try:
+            # Use a throwaway vanilla asyncio loop: we are going to
+            # fork, and the workers set up their own uvloop.
+            asyncio.run(preload())
+        except Exception:
+            # Preloading is an optimization; workers will
+            # initialize lazily instead.
+            print('could not preload the pool worker:', file=sys.stderr)
+            traceback.print_exc()
+
+    # Move everything loaded so far into the permanent generation, so
+    # that the GC in forked workers doesn't touch (and hence copy)
+    # the shared memory pages.
+    gc.collect()
+    gc.freeze()
+
+    # The lifeline pipe is used by forked workers to detect the exit
+    # of the template, see _watch_lifeline().
+    lifeline = os.pipe()
+
+    # SIGCHLD wakes up the command loop below to reap the exited
+    # workers and report them to the manager.
+    wakeup_r, wakeup_w = os.pipe()
+    os.set_blocking(wakeup_w, False)
+    signal.set_wakeup_fd(wakeup_w)
+    signal.signal(signal.SIGCHLD, lambda *args: None)
+
+    children = set()
+
+    def write(line):
+        os.write(1, line + b'\n')
+
+    def reap():
+        while children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            children.discard(pid)
+            if os.WIFSIGNALED(status):
+                returncode = -os.WTERMSIG(status)
+            else:
+                returncode = os.WEXITSTATUS(status)
+            write(b'exit %d %d' % (pid, returncode))
+
+    write(b'ready')
+
+    buf = b''
+    while True:
+        try:
+            ready, _, _ = select.select([0, wakeup_r], [], [])
+        except InterruptedError:
+            continue
+
+        if wakeup_r in ready:
+            try:
+                os.read(wakeup_r, 4096)
+            except BlockingIOError:
+                pass
+            reap()
+
+        if 0 not in ready:
+            continue
+
+        data = os.read(0, 4096)
+        if not data:
+            # The manager has closed the pipe.
+            break
+
+        buf += data
+        *cmds, buf = buf.split(b'\n')
+        for cmd in cmds:
+            op, _, arg = cmd.partition(b' ')
+            cmd_args = arg.split()
+            if op == b'fork':
+                sys.stderr.flush()
+                pid = os.fork()
+                if pid == 0:
+                    run_forked_worker(
+                        cls, cls_args, args.sockname, instance,
+                        arg == b'1', lifeline, (wakeup_r, wakeup_w))
+                children.add(pid)
+                write(b'pid %d' % pid)
+            elif op == b'kill':
+                pid, signum = map(int, cmd_args)
+                # Only signal the children that have not been reaped
+                # yet: their PIDs can't have been reused.
+                if pid in children:
+                    os.kill(pid, signum)
+            else:
+                print(f'unknown pool template command: {cmd!r}',
+                      file=sys.stderr)
+                return
+
+
+if __name__ == '__main__':
+    main()
@@ -33,6 +33,7 @@ import uvloop
 from edb.common import debug
 from edb.common import devmode
 from edb.common import markup
+from edb.common import sampler
 
 from . import amsg
 
@@ -44,18 +45,28 @@ def load_class(cls_name):
     return cls
 
 
-async def worker(cls, cls_args, sockname):
+async def worker(cls, cls_args, sockname, *, instance=None):
     loop = asyncio.get_running_loop()
     loop.add_signal_handler(signal.SIGTERM, on_terminate_worker)
+    loop.add_signal_handler(signal.SIGUSR2, sampler.toggle)
+
+    if debug.flags.sampling_profiler:
+        sampler.start()
 
     con = await amsg.worker_connect(sockname)
     try:
-        worker = cls(**cls_args)
+        if instance is not None:
+            # Forked from the template process with
+            # an already initialized worker object.
+            worker = instance
+        else:
+            worker = cls(**cls_args)
 
         while True:
             try:
                 req = await con.next_request()
             except amsg.PoolClosedError:
+                sampler.stop()
                 os._exit(0)
 
             try:
@@ -97,14 +108,15 @@ async def worker(cls, cls_args, sockname):
 
 
 def on_terminate_worker():
+    sampler.stop()
     # sys.exit() might not do it, apparently.
     os._exit(-1)
 
 
-def run_worker(cls, cls_args, sockname):
+def run_worker(cls, cls_args, sockname, *, instance=None):
     asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     with devmode.CoverageConfig.enable_coverage_if_requested():
-        asyncio.run(worker(cls, cls_args, sockname))
+        asyncio.run(worker(cls, cls_args, sockname, instance=instance))
 
 
 def prepare_exception(ex):
@@ -134,6 +146,11 @@ def clear_exception_frames(er):
 
 
 def main():
+    # The pool manager toggles the sampling profiler with SIGUSR2,
+    # which must not kill a worker that is still starting up; the
+    # handler is installed in worker().
+    signal.signal(signal.SIGUSR2, signal.SIG_IGN)
+
     parser = argparse.ArgumentParser()
     parser.add_argument('--cls-name')
     parser.add_argument('--cls-args')
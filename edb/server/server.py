@@ -38,6 +38,7 @@ from edb.server import notebook_port
 from edb.server import mng_port
 from edb.server import pgcon
 
+from . import admission
 from . import baseport
 from . import dbview
 
@@ -54,6 +55,10 @@ class Server:
                  internal_runstate_dir,
                  max_backend_connections,
                  nethost, netport,
+                 backend_queue_timeout: float=defines.BACKEND_QUEUE_TIMEOUT,
+                 compiler_worker_max_requests: int=(
+                     defines.COMPILER_WORKER_MAX_REQUESTS),
+                 compiler_worker_max_rss: int=defines.COMPILER_WORKER_MAX_RSS,
                  auto_shutdown: bool=False,
                  echo_runtime_info: bool = False,
                  max_protocol: Tuple[int, int]):
@@ -71,6 +76,20 @@ class Server:
         self._runstate_dir = runstate_dir
         self._internal_runstate_dir = internal_runstate_dir
         self._max_backend_connections = max_backend_connections
+        self._backend_queue_timeout = backend_queue_timeout
+        self._compiler_backend_connections = max(1, min(
+            defines.COMPILER_BACKEND_CONNECTIONS,
+            max_backend_connections // 2,
+        ))
+        self._admission = admission.AdmissionController(
+            capacity=(
+                max_backend_connections - self._compiler_backend_connections
+            ),
+            queue_timeout=backend_queue_timeout,
+            max_queue_size=defines._MAX_BACKEND_QUEUE_SIZE,
+        )
+        self._compiler_worker_max_requests = compiler_worker_max_requests
+        self._compiler_worker_max_rss = compiler_worker_max_rss
 
         self._mgmt_port = None
         self._mgmt_host_addr = nethost
@@ -115,13 +134,22 @@ class Server:
     def _get_pgaddr(self):
         return self._cluster.get_connection_spec()
 
-    async def new_pgcon(self, dbname):
-        return await pgcon.connect(self._get_pgaddr(), dbname)
+    async def new_pgcon(self, dbname, *, user=defines.EDGEDB_SUPERUSER):
+        # "user" is the EdgeDB role the connection is opened for;
+        # it is only used to fairly share the backend capacity.
+        await self._admission.acquire(dbname, user)
+        try:
+            con = await pgcon.connect(self._get_pgaddr(), dbname)
+        except BaseException:
+            self._admission.release()
+            raise
+        con.set_close_callback(self._admission.release)
+        return con
 
     async def new_compiler(self, dbname, dbver):
         compiler_worker = await self._compiler_manager.spawn_worker()
         try:
-            await compiler_worker.call('connect', dbname, dbver)
+            await compiler_worker.init('connect', dbname, dbver)
         except Exception:
             await compiler_worker.close()
             raise
@@ -304,6 +332,14 @@ class Server:
             }
             print(f'\nEDGEDB_SERVER_DATA:{json.dumps(ri)}\n', flush=True)
 
+    def signal_compiler_workers(self, signum):
+        if self._mgmt_port is not None:
+            self._mgmt_port.signal_compiler_workers(signum)
+        for port in self._ports:
+            port.signal_compiler_workers(signum)
+        for port in self._sys_conf_ports.values():
+            port.signal_compiler_workers(signum)
+
     async def stop(self):
         self._serving = False
 
@@ -338,6 +374,35 @@ class Server:
     async def get_instance_data(self, conn, key):
         return await self._dbindex.get_instance_data(conn, key)
 
+    async def get_role(self, name):
+        return await self._dbindex.get_role(name)
+
+    def get_mock_auth_nonce(self):
+        return self._dbindex.get_mock_auth_nonce()
+
+    def get_compiler_worker_limits(
+        self,
+    ) -> Tuple[Optional[int], Optional[int]]:
+        """Return the compiler worker request count and memory limits.
+
+        The memory limit is in bytes; None means no limit.
+        """
+        max_requests = self._compiler_worker_max_requests or None
+        max_rss = self._compiler_worker_max_rss or None
+        if max_rss is not None:
+            max_rss *= 1024 * 1024
+        return max_requests, max_rss
+
+    def get_compiler_backend_connection_slots(
+        self,
+    ) -> admission.BackendConnectionSlots:
+        """Return the backend connections shared by compiler workers."""
+        return admission.BackendConnectionSlots(
+            dirname=str(self._internal_runstate_dir),
+            size=self._compiler_backend_connections,
+            timeout=self._backend_queue_timeout,
+        )
+
     def get_backend_instance_params(self) -> edbcompiler.BackendInstanceParams:
         return edbcompiler.BackendInstanceParams(
             explicit_superuser_role=self._cluster.get_superuser_role(),
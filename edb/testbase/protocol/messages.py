@@ -717,7 +717,8 @@ class Prepare(ClientMessage):
     io_format = EnumOf(UInt8, IOFormat, 'Data I/O format.')
     expected_cardinality = EnumOf(UInt8, Cardinality,
                                   'Expected result cardinality')
-    statement_name = Bytes('Prepared statement name. Currently must be empty.')
+    statement_name = Bytes(
+        'Prepared statement name, empty for the anonymous statement.')
     command = String('Command text.')
 
 
@@ -0,0 +1,473 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2020-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+from __future__ import annotations
+from typing import *
+
+import concurrent.futures
+import dataclasses
+import http.client
+import json
+import pathlib
+import statistics
+import sys
+import threading
+import time
+
+import click
+import edgedb
+
+from edb.server import buildmeta
+from edb.server import cluster as edgedb_cluster
+from edb.server import defines as edgedb_defines
+from edb.testbase import server as tb
+from edb.tools.edb import edbcommands
+
+
+SCHEMAS_DIR = (
+    pathlib.Path(__file__).parent.parent.parent.resolve() / 'tests' / 'schemas'
+)
+
+BENCH_DATABASE = 'bench'
+
+
+@dataclasses.dataclass(frozen=True)
+class Benchmark:
+
+    #: Unique name of the benchmark.
+    name: str
+    protocol: str
+    query: str
+
+
+BENCHMARKS = (
+    Benchmark(
+        name='scalar',
+        protocol='binary',
+        query='SELECT 1',
+    ),
+    Benchmark(
+        name='users',
+        protocol='binary',
+        query='''
+            WITH MODULE test
+            SELECT User {
+                name,
+                age,
+                groups: {
+                    name,
+                },
+            }
+            ORDER BY .name;
+        ''',
+    ),
+    Benchmark(
+        name='user_by_name',
+        protocol='binary',
+        query='''
+            WITH MODULE test
+            SELECT User {
+                name,
+                profile: {
+                    name,
+                    value,
+                },
+            }
+            FILTER .name = 'John';
+        ''',
+    ),
+    Benchmark(
+        name='users_http',
+        protocol='http',
+        query='''
+            WITH MODULE test
+            SELECT User {
+                name,
+                age,
+                groups: {
+                    name,
+                },
+            }
+            ORDER BY .name;
+        ''',
+    ),
+    Benchmark(
+        name='users_graphql',
+        protocol='graphql',
+        query='''
+            query {
+                User(order: {name: {dir: ASC}}) {
+                    name
+                    age
+                    groups {
+                        name
+                    }
+                }
+            }
+        ''',
+    ),
+)
+
+assert len({b.name for b in BENCHMARKS}) == len(BENCHMARKS), \
+    'benchmark names must be unique'
+
+PORT_PROTOCOLS = {
+    'http': 'edgeql+http',
+    'graphql': 'graphql+http',
+}
+
+
+def die(msg):
+    print(f'FATAL: {msg}', file=sys.stderr)
+    sys.exit(1)
+
+
+def get_setup_script() -> str:
+    with open(SCHEMAS_DIR / 'graphql.esdl') as f:
+        schema = f.read()
+
+    with open(SCHEMAS_DIR / 'graphql_setup.edgeql') as f:
+        setup = f.read()
+
+    return (
+        f'START MIGRATION TO {{ module test {{ {schema} }} }};\n'
+        f'POPULATE MIGRATION;\n'
+        f'COMMIT MIGRATION;\n'
+        f'SET MODULE test;\n'
+        f'{setup}'
+    )
+
+
+def setup_database(conargs, concurrency: int) -> Dict[str, int]:
+    con = edgedb.connect(**conargs)
+    try:
+        con.execute(f'CREATE DATABASE {BENCH_DATABASE};')
+    finally:
+        con.close()
+
+    con = edgedb.connect(**{**conargs, 'database': BENCH_DATABASE})
+    try:
+        con.execute(get_setup_script())
+
+        ports = {}
+        for protocol, port_proto in PORT_PROTOCOLS.items():
+            port = edgedb_cluster.find_available_port()
+            con.execute(f'''
+                CONFIGURE SYSTEM INSERT Port {{
+                    protocol := "{port_proto}",
+                    database := "{BENCH_DATABASE}",
+                    address := "127.0.0.1",
+                    port := {port},
+                    user := "http",
+                    concurrency := {concurrency},
+                }};
+            ''')
+            ports[protocol] = port
+    finally:
+        con.close()
+
+    return ports
+
+
+def teardown_database(conargs, ports: Dict[str, int]) -> None:
+    con = edgedb.connect(**conargs)
+    try:
+        for port in ports.values():
+            con.execute(f'''
+                CONFIGURE SYSTEM RESET Port FILTER .port = {port};
+            ''')
+        con.execute(f'DROP DATABASE {BENCH_DATABASE};')
+    finally:
+        con.close()
+
+
+def reset_query_stats(conargs) -> None:
+    con = edgedb.connect(**{**conargs, 'database': BENCH_DATABASE})
+    try:
+        con.query('SELECT sys::reset_query_stats()')
+    finally:
+        con.close()
+
+
+def get_compile_stats(conargs) -> Dict[str, Any]:
+    """Return the compilation statistics collected since the last reset.
+
+    The server only collects them for the binary protocol (see
+    sys::QueryStats).
+    """
+    con = edgedb.connect(**{**conargs, 'database': BENCH_DATABASE})
+    try:
+        stats = con.query('''
+            SELECT sys::QueryStats {
+                compiles,
+                cache_hits,
+                total_compile_time,
+                compile_phase_times,
+            }
+            FILTER .query NOT LIKE '%sys::%';
+        ''')
+    finally:
+        con.close()
+
+    compiles = sum(s.compiles for s in stats)
+    cache_hits = sum(s.cache_hits for s in stats)
+    compile_time = sum(s.total_compile_time.total_seconds() for s in stats)
+    phase_times: Dict[str, float] = {}
+    for s in stats:
+        for phase, duration in json.loads(s.compile_phase_times).items():
+            phase_times[phase] = phase_times.get(phase, 0.0) + duration
+
+    return {
+        'compiles': compiles,
+        'cache_hits': cache_hits,
+        'cache_hit_ratio': round(
+            cache_hits / max(compiles + cache_hits, 1), 4),
+        'compile_time_ms': {
+            'total': round(compile_time * 1000, 3),
+            'mean': round(compile_time * 1000 / max(compiles, 1), 3),
+            'phases': {
+                phase: round(duration * 1000, 3)
+                for phase, duration in sorted(phase_times.items())
+            },
+        },
+    }
+
+
+class Worker:
+
+    def __init__(self, benchmark: Benchmark, *, conargs, ports):
+        self.benchmark = benchmark
+        self.conargs = conargs
+        self.ports = ports
+
+    def connect(self) -> None:
+        protocol = self.benchmark.protocol
+        if protocol == 'binary':
+            self.con = edgedb.connect(
+                **{**self.conargs, 'database': BENCH_DATABASE})
+        else:
+            self.con = http.client.HTTPConnection(
+                '127.0.0.1', self.ports[protocol])
+            self.con.connect()
+            self.body = json.dumps({'query': self.benchmark.query}).encode()
+
+    def close(self) -> None:
+        self.con.close()
+
+    def run_once(self) -> None:
+        if self.benchmark.protocol == 'binary':
+            self.con.query(self.benchmark.query)
+        else:
+            self.con.request(
+                'POST', '/', body=self.body,
+                headers={'Content-Type': 'application/json'})
+            resp = self.con.getresponse()
+            data = json.loads(resp.read())
+            if resp.status != 200 or 'data' not in data:
+                raise RuntimeError(
+                    f'unexpected {self.benchmark.protocol} response: {data}')
+
+    def run(
+        self,
+        *,
+        warmup_until: float,
+        deadline: float,
+        latencies: List[float],
+        errors: List[str],
+        lock: threading.Lock,
+    ) -> None:
+        local_latencies = []
+        local_errors = []
+
+        self.connect()
+        try:
+            while True:
+                started_at = time.monotonic()
+                if started_at >= deadline:
+                    break
+
+                try:
+                    self.run_once()
+                except Exception as e:
+                    if started_at >= warmup_until:
+                        local_errors.append(f'{type(e).__name__}: {e}')
+                    if self.benchmark.protocol != 'binary':
+                        # The HTTP connection may be in an unusable
+                        # state after an error.
+                        self.close()
+                        self.connect()
+                    continue
+
+                if started_at >= warmup_until:
+                    local_latencies.append(time.monotonic() - started_at)
+        finally:
+            self.close()
+
+        with lock:
+            latencies.extend(local_latencies)
+            errors.extend(local_errors)
+
+
+def percentile(data: Sequence[float], pct: float) -> float:
+    if not data:
+        return 0.0
+    idx = min(len(data) - 1, max(0, round(pct / 100 * len(data)) - 1))
+    return data[idx]
+
+
+def run_benchmark(
+    benchmark: Benchmark,
+    *,
+    conargs,
+    ports,
+    concurrency: int,
+    duration: float,
+    warmup: float,
+) -> Dict[str, Any]:
+    latencies: List[float] = []
+    errors: List[str] = []
+    lock = threading.Lock()
+
+    collect_compile_stats = benchmark.protocol == 'binary'
+    if collect_compile_stats:
+        reset_query_stats(conargs)
+
+    warmup_until = time.monotonic() + warmup
+    deadline = warmup_until + duration
+
+    with concurrent.futures.ThreadPoolExecutor(concurrency) as pool:
+        futures = [
+            pool.submit(
+                Worker(benchmark, conargs=conargs, ports=ports).run,
+                warmup_until=warmup_until,
+                deadline=deadline,
+                latencies=latencies,
+                errors=errors,
+                lock=lock,
+            )
+            for _ in range(concurrency)
+        ]
+
+        for future in futures:
+            future.result()
+
+    # Includes the warmup period, which is when the queries are
+    # compiled for the first time.
+    compile_stats = (
+        get_compile_stats(conargs) if collect_compile_stats else None)
+
+    latencies.sort()
+    ms = [lat * 1000 for lat in latencies]
+
+    return {
+        'name': benchmark.name,
+        'protocol': benchmark.protocol,
+        'queries': len(latencies),
+        'errors': len(errors),
+        'first_error': errors[0] if errors else None,
+        'qps': round(len(latencies) / duration, 2),
+        'latency_ms': {
+            'min': round(ms[0], 3) if ms else 0.0,
+            'mean': round(statistics.mean(ms), 3) if ms else 0.0,
+            'p50': round(percentile(ms, 50), 3),
+            'p90': round(percentile(ms, 90), 3),
+            'p99': round(percentile(ms, 99), 3),
+            'max': round(ms[-1], 3) if ms else 0.0,
+        },
+        'compile': compile_stats,
+    }
+
+
+@edbcommands.command()
+@click.option('-c', '--concurrency', type=int, default=10,
+              help='number of concurrent client connections')
+@click.option('-d', '--duration', type=float, default=10.0,
+              help='duration of each benchmark in seconds')
+@click.option('--warmup', type=float, default=2.0,
+              help='warmup period before each benchmark in seconds')
+@click.option('-p', '--protocol', 'protocols', multiple=True,
+              type=click.Choice(['binary', 'http', 'graphql']),
+              help='only run benchmarks for the specified protocols')
+@click.option('-k', '--include', type=str, multiple=True,
+              help='only run benchmarks whose names contain the '
+                   'specified substrings')
+@click.option('-o', '--output', type=click.File('w'), default='-',
+              help='file to write the JSON report to')
+def bench(*, concurrency, duration, warmup, protocols, include, output):
+    """Measure end-to-end server throughput and latency.
+
+    Starts a server on a temporary cluster (or uses the one specified
+    by EDGEDB_TEST_CLUSTER_ADDR), loads the benchmark schema and
+    dataset, and reports the results as JSON.  For the binary protocol
+    the report includes query cache hit rates and per-phase compile
+    times as collected by the server in sys::QueryStats.
+    """
+    if concurrency < 1:
+        die('--concurrency must be a positive number')
+    if duration <= 0:
+        die('--duration must be a positive number')
+
+    benchmarks = [
+        b for b in BENCHMARKS
+        if (not protocols or b.protocol in protocols)
+        and (not include or any(i in b.name for i in include))
+    ]
+    if not benchmarks:
+        die('no benchmarks selected')
+
+    cluster = tb._start_cluster(cleanup_atexit=False)
+    try:
+        conargs = cluster.get_connect_args().copy()
+        conargs.update(
+            user=edgedb_defines.EDGEDB_SUPERUSER,
+            password='test',
+            database=edgedb_defines.EDGEDB_SUPERUSER_DB,
+        )
+
+        ports = setup_database(conargs, concurrency)
+        try:
+            results = []
+            for benchmark in benchmarks:
+                print(
+                    f'Running {benchmark.protocol}/{benchmark.name}...',
+                    file=sys.stderr)
+                results.append(run_benchmark(
+                    benchmark,
+                    conargs=conargs,
+                    ports=ports,
+                    concurrency=concurrency,
+                    duration=duration,
+                    warmup=warmup,
+                ))
+        finally:
+            teardown_database(conargs, ports)
+    finally:
+        tb._shutdown_cluster(
+            cluster, destroy=isinstance(cluster, edgedb_cluster.TempCluster))
+
+    report = {
+        'version': str(buildmeta.get_version()),
+        'concurrency': concurrency,
+        'duration': duration,
+        'warmup': warmup,
+        'benchmarks': results,
+    }
+
+    json.dump(report, output, indent=2)
+    output.write('\n')
@@ -87,7 +87,8 @@ def perfviz(
     """Aggregate raw profiling traces into textual and graphical formats.
 
     Generates aggregate .prof and .singledispatch files, an aggregate textual
-    .pstats file, as well as two SVG flame graphs.
+    .pstats file, as well as two SVG flame graphs.  Stacks recorded by the
+    sampling profiler are aggregated when --suffix=.collapsed is given.
 
     For more comprehensive documentation read edb/tools/profiling/README.md.
     """
@@ -41,17 +41,20 @@ import sys
 import tempfile
 from xml.sax import saxutils
 
+from edb.common import sampler
 from edb.tools.profiling import tracing_singledispatch
 
 
 CURRENT_DIR = pathlib.Path(__file__).resolve().parent
 EDGEDB_DIR = CURRENT_DIR.parent.parent.parent
 PROFILING_JS = CURRENT_DIR / "svg_helpers.js"
-PREFIX = "edgedb_"
+PREFIX = sampler.PREFIX
 STAT_SUFFIX = ".pstats"
 PROF_SUFFIX = ".prof"
 SVG_SUFFIX = ".svg"
 SINGLEDISPATCH_SUFFIX = ".singledispatch"
+COLLAPSED_SUFFIX = sampler.COLLAPSED_SUFFIX
+SAMPLING_INTERVAL = sampler.SAMPLING_INTERVAL
 
 
 T = TypeVar("T", bound=Callable[..., Any])
@@ -217,7 +220,13 @@ class profile:
             ps = pstats.Stats(stream=out)
             for file in files:
                 try:
-                    ps.add(file)
+                    if file.endswith(COLLAPSED_SUFFIX):
+                        # pstats.Stats accepts any object with
+                        # create_stats() and stats, but Mypy only
+                        # knows about the profilers.
+                        ps.add(CollapsedStacks(file))  # type: ignore
+                    else:
+                        ps.add(file)
                 except TypeError as te:
                     # Probably the profile file is empty.
                     print(te, file=sys.stderr)
@@ -272,6 +281,76 @@ class profile:
         return result
 
 
+class CollapsedStacks:
+    """Adapts a collapsed stack file to what `pstats.Stats` can consume.
+
+    Every line of the file is a semicolon-separated list of frames
+    (root first) in the "path:lineno:name" form, followed by a space and
+    the number of times the stack was sampled.  Each sample is assumed
+    to stand for `interval` seconds.  Since the sampler cannot see
+    function calls, call counts are sample counts.
+    """
+
+    def __init__(
+        self,
+        path: Union[pathlib.Path, str],
+        *,
+        interval: float = SAMPLING_INTERVAL,
+    ) -> None:
+        self.path = str(path)
+        self.interval = interval
+        self.stats: Stats = {}
+
+    def __repr__(self) -> str:
+        return f"<CollapsedStacks {self.path!r}>"
+
+    def create_stats(self) -> None:
+        stats: Dict[FunctionID, List[Any]] = {}
+        with open(self.path) as f:
+            for line in f:
+                frames, _, count_str = line.rstrip("\n").rpartition(" ")
+                if not frames:
+                    continue
+                count = int(count_str)
+                t = count * self.interval
+                stack: List[FunctionID] = []
+                for frame in frames.split(";"):
+                    path, lineno, name = frame.rsplit(":", 2)
+                    stack.append((path, int(lineno), name))
+
+                # Recursive calls must only count once towards cumtime.
+                seen_funcs: Set[FunctionID] = set()
+                seen_calls: Set[Call] = set()
+                leaf = len(stack) - 1
+                for i, func in enumerate(stack):
+                    stat = stats.setdefault(func, [0, 0, 0.0, 0.0, {}])
+                    if i == leaf:
+                        stat[2] += t
+                    if func not in seen_funcs:
+                        seen_funcs.add(func)
+                        stat[0] += count
+                        stat[1] += count
+                        stat[3] += t
+                    if i == 0:
+                        continue
+                    caller = stack[i - 1]
+                    if (caller, func) in seen_calls:
+                        continue
+                    seen_calls.add((caller, func))
+                    cc, nc, tt, ct = stat[4].get(caller, (0, 0, 0.0, 0.0))
+                    stat[4][caller] = (
+                        cc + count,
+                        nc + count,
+                        tt + (t if i == leaf else 0.0),
+                        ct + t,
+                    )
+
+        self.stats = {
+            func: (cc, nc, tt, ct, callers)
+            for func, (cc, nc, tt, ct, callers) in stats.items()
+        }
+
+
 def profile_memory(func: Callable[[], Any]) -> MemoryFrame:
     """Profile memory and return a tree of statistics.
 
@@ -167,6 +167,39 @@ class ASTBaseTests(unittest.TestCase):
         self.assertEqual(Node().field1, None)
         self.assertEqual(Node().field3, 123)
 
+    def test_common_ast_child_fields(self):
+        class Base(ast.AST):
+            pass
+
+        class Node(Base):
+            __ast_meta__ = {'meta'}
+
+            name: str
+            flag: bool
+            names: typing.List[typing.Optional[str]]
+            meta: Base
+            untyped: object
+            child: Base
+            children: typing.List[Base]
+            mixed: typing.Tuple[str, Base]
+            anything: list
+
+        self.assertEqual(
+            [f.name for f in Node._child_fields],
+            ['untyped', 'child', 'children', 'mixed', 'anything'],
+        )
+
+        leaf = Node(name='leaf')
+        tree = Node(
+            name='root',
+            child=Node(name='child', children=[leaf]),
+            meta=Node(name='meta'),
+        )
+
+        found = ast.find_children(
+            tree, lambda n: isinstance(n, Node), force_traversal=True)
+        self.assertEqual([n.name for n in found], ['child', 'leaf'])
+
     def test_common_ast_type_anno(self):
         with self.assertRaisesRegex(RuntimeError, r"1 is not a type"):
             class Node1(ast.AST):
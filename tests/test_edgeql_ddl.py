@@ -2284,6 +2284,234 @@ class TestEdgeQLDDL(tb.DDLTestCase):
                 DROP FUNCTION test::constant_decimal();
             """)
 
+    async def test_edgeql_ddl_function_28(self):
+        # Backend functions are labelled with their parallel safety,
+        # check pg_proc.proparallel of a sample of them: 's'afe,
+        # 'r'estricted or 'u'nsafe.
+        await self.con.execute(r"""
+            CREATE FUNCTION test::proparallel(name: str) -> str {
+                USING SQL $$
+                    SELECT string_agg(DISTINCT p.proparallel::text, '')
+                    FROM
+                        pg_proc AS p
+                        INNER JOIN pg_namespace AS n
+                            ON (n.oid = p.pronamespace)
+                    WHERE n.nspname || '.' || p.proname = "name"
+                $$;
+            };
+
+            CREATE FUNCTION test::proparallel_by_src(src: str) -> str {
+                USING SQL $$
+                    SELECT string_agg(DISTINCT proparallel::text, '')
+                    FROM pg_proc
+                    WHERE strpos(prosrc, "src") > 0
+                $$;
+            };
+
+            CREATE FUNCTION test::par_sql_immutable() -> str {
+                SET volatility := 'IMMUTABLE';
+                USING SQL $$
+                    SELECT 'par_sql_immutable'::text
+                $$;
+            };
+
+            CREATE FUNCTION test::par_sql_volatile() -> str {
+                USING SQL $$
+                    SELECT 'par_sql_volatile'::text
+                $$;
+            };
+
+            CREATE FUNCTION test::par_sql_state() -> str {
+                SET volatility := 'STABLE';
+                USING SQL $$
+                    SELECT value || 'par_sql_state'
+                    FROM _edgecon_state
+                    WHERE name = '' AND type = 'A'
+                $$;
+            };
+
+            CREATE FUNCTION test::par_sql_config() -> str {
+                SET volatility := 'STABLE';
+                USING SQL $$
+                    SELECT set_config('TimeZone', 'UTC', true)
+                        || 'par_sql_config'
+                $$;
+            };
+
+            CREATE FUNCTION test::par_eql_immutable(s: str) -> str {
+                SET volatility := 'IMMUTABLE';
+                USING (s ++ 'par_eql_immutable');
+            };
+
+            CREATE FUNCTION test::par_eql_stable(s: str) -> str {
+                SET volatility := 'STABLE';
+                USING (s ++ 'par_eql_stable');
+            };
+        """)
+
+        try:
+            await self.assert_query_result(
+                r"""
+                    WITH MODULE test
+                    SELECT (
+                        raise := proparallel('edgedb._raise_exception'),
+                        cast := proparallel('edgedb.str_to_bigint'),
+                        sys_config := proparallel('edgedb._read_sys_config'),
+                        sys_version := proparallel('edgedb._sys_version'),
+                        to_datetime := proparallel('edgedb.to_datetime'),
+                    );
+                """,
+                [{
+                    'raise': 's',
+                    'cast': 's',
+                    'sys_config': 'r',
+                    'sys_version': 'r',
+                    'to_datetime': 'u',
+                }],
+            )
+
+            # Functions from the standard library.
+            await self.assert_query_result(
+                r"""
+                    WITH MODULE test
+                    SELECT (
+                        str_repeat := proparallel_by_src(
+                            'repeat("s", "n"::int4)'),
+                        get_version := proparallel_by_src(
+                            'edgedb._sys_version() as v'),
+                        to_datetime := proparallel_by_src(
+                            'edgedb.to_datetime("s", "fmt")'),
+                    );
+                """,
+                [{
+                    'str_repeat': 's',
+                    'get_version': 'r',
+                    'to_datetime': 'u',
+                }],
+            )
+
+            await self.assert_query_result(
+                r"""
+                    WITH MODULE test
+                    SELECT (
+                        sql_immutable := proparallel_by_src(
+                            'par_sql_immutable'),
+                        sql_volatile := proparallel_by_src(
+                            'par_sql_volatile'),
+                        sql_state := proparallel_by_src('par_sql_state'),
+                        sql_config := proparallel_by_src('par_sql_config'),
+                        eql_immutable := proparallel_by_src(
+                            'par_eql_immutable'),
+                        eql_stable := proparallel_by_src('par_eql_stable'),
+                    );
+                """,
+                [{
+                    'sql_immutable': 's',
+                    'sql_volatile': 'u',
+                    'sql_state': 'r',
+                    'sql_config': 'u',
+                    'eql_immutable': 's',
+                    'eql_stable': 'r',
+                }],
+            )
+
+            # The functions still work.
+            await self.assert_query_result(
+                r"""
+                    SELECT (
+                        test::par_sql_immutable(),
+                        test::par_eql_stable('a'),
+                    );
+                """,
+                [['par_sql_immutable', 'apar_eql_stable']],
+            )
+        finally:
+            await self.con.execute("""
+                DROP FUNCTION test::proparallel(name: str);
+                DROP FUNCTION test::proparallel_by_src(src: str);
+                DROP FUNCTION test::par_sql_immutable();
+                DROP FUNCTION test::par_sql_volatile();
+                DROP FUNCTION test::par_sql_state();
+                DROP FUNCTION test::par_sql_config();
+                DROP FUNCTION test::par_eql_immutable(s: str);
+                DROP FUNCTION test::par_eql_stable(s: str);
+            """)
+
+    async def test_edgeql_ddl_function_29(self):
+        # EdgeQL functions are labelled after the functions they call:
+        # std::to_datetime() changes the TimeZone setting (through
+        # a helper), which is not allowed in parallel mode.
+        await self.con.execute(r"""
+            CREATE FUNCTION test::proparallel_by_src(src: str) -> str {
+                USING SQL $$
+                    SELECT string_agg(DISTINCT proparallel::text, '')
+                    FROM pg_proc
+                    WHERE strpos(prosrc, "src") > 0
+                $$;
+            };
+
+            CREATE FUNCTION test::set_parallel_mode(val: str) -> str {
+                USING SQL $$
+                    SELECT set_config('force_parallel_mode', "val", false)
+                $$;
+            };
+
+            CREATE FUNCTION test::par_eql_datetime(s: str) -> datetime {
+                SET volatility := 'STABLE';
+                USING (to_datetime(s ++ 'par_eql_datetime'[:0]));
+            };
+
+            CREATE FUNCTION test::par_eql_wrapper(s: str) -> datetime {
+                SET volatility := 'STABLE';
+                USING (test::par_eql_datetime(s ++ 'par_eql_wrapper'[:0]));
+            };
+
+            CREATE FUNCTION test::par_eql_repeat(s: str) -> str {
+                SET volatility := 'IMMUTABLE';
+                USING (str_repeat(s ++ 'par_eql_repeat'[:0], 2));
+            };
+        """)
+
+        try:
+            await self.assert_query_result(
+                r"""
+                    WITH MODULE test
+                    SELECT (
+                        eql_datetime := proparallel_by_src(
+                            'par_eql_datetime'),
+                        eql_wrapper := proparallel_by_src('par_eql_wrapper'),
+                        eql_repeat := proparallel_by_src('par_eql_repeat'),
+                    );
+                """,
+                [{
+                    'eql_datetime': 'u',
+                    'eql_wrapper': 'u',
+                    'eql_repeat': 's',
+                }],
+            )
+
+            await self.con.query_one(r"""
+                SELECT test::set_parallel_mode('on');
+            """)
+
+            await self.assert_query_result(
+                r"""
+                    SELECT test::par_eql_wrapper('2020-01-01T00:00:00+00:00')
+                        = <datetime>'2020-01-01T00:00:00+00:00';
+                """,
+                [True],
+            )
+        finally:
+            await self.con.execute("""
+                SELECT test::set_parallel_mode('off');
+
+                DROP FUNCTION test::proparallel_by_src(src: str);
+                DROP FUNCTION test::set_parallel_mode(val: str);
+                DROP FUNCTION test::par_eql_wrapper(s: str);
+                DROP FUNCTION test::par_eql_datetime(s: str);
+                DROP FUNCTION test::par_eql_repeat(s: str);
+            """)
+
     async def test_edgeql_ddl_module_01(self):
         with self.assertRaisesRegex(
                 edgedb.SchemaError,
@@ -0,0 +1,115 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2020-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import json
+import os.path
+
+from edb.testbase import server as tb
+
+
+def iter_plan_nodes(plan):
+    for entry in plan:
+        nodes = [entry['Plan']]
+        while nodes:
+            node = nodes.pop()
+            yield node
+            nodes.extend(node.get('Plans', ()))
+
+
+class TestEdgeQLExplain(tb.QueryTestCase):
+    '''Tests for EXPLAIN [ANALYZE] of EdgeQL queries.'''
+
+    SCHEMA = os.path.join(os.path.dirname(__file__), 'schemas',
+                          'issues.esdl')
+
+    SETUP = os.path.join(os.path.dirname(__file__), 'schemas',
+                         'issues_setup.edgeql')
+
+    async def test_edgeql_explain_01(self):
+        plan = json.loads(await self.con.query_one(r'''
+            EXPLAIN
+            WITH MODULE test
+            SELECT User {
+                name,
+                todo: {number}
+            }
+            FILTER .name = <str>$name;
+        ''', name='Elvis'))
+
+        nodes = list(iter_plan_nodes(plan))
+        annotated = [node for node in nodes if 'EdgeQL Path' in node]
+        self.assertTrue(annotated)
+        # Only nodes that scan a named relation are annotated.
+        for node in annotated:
+            self.assertTrue(
+                node.get('Alias') or node.get('CTE Name'), node)
+            self.assertNotIn('Actual Loops', node)
+
+        paths = {node['EdgeQL Path'] for node in annotated}
+        self.assertIn('User', paths)
+
+        sources = {
+            node['EdgeQL Source'] for node in annotated
+            if 'EdgeQL Source' in node
+        }
+        self.assertIn('User', sources)
+
+    async def test_edgeql_explain_02(self):
+        plan = json.loads(await self.con.query_one(r'''
+            EXPLAIN ANALYZE
+            WITH MODULE test
+            SELECT Issue {
+                number,
+                owner: {name},
+            }
+            FILTER .number = '1';
+        '''))
+
+        self.assertIn('Execution Time', plan[0])
+        annotated = [
+            node for node in iter_plan_nodes(plan)
+            if 'EdgeQL Path' in node
+        ]
+        self.assertTrue(annotated)
+        for node in annotated:
+            self.assertIn('Actual Loops', node)
+        self.assertTrue(
+            any('EdgeQL Source' in node for node in annotated))
+
+        self.assertIn(
+            'owner',
+            {node.get('EdgeQL Shape Element') for node in annotated},
+        )
+
+    async def test_edgeql_explain_03(self):
+        # EXPLAIN ANALYZE executes the query, side effects included.
+        await self.con.query_one(r'''
+            EXPLAIN ANALYZE
+            INSERT test::Status {
+                name := 'explained'
+            };
+        ''')
+
+        await self.assert_query_result(
+            r'''
+                SELECT test::Status { name }
+                FILTER .name = 'explained';
+            ''',
+            [{'name': 'explained'}],
+        )
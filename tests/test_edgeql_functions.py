@@ -84,6 +84,66 @@ class TestEdgeQLFunctions(tb.QueryTestCase):
             [True]
         )
 
+    async def test_edgeql_functions_approximate_count_01(self):
+        # The estimate is based on the table statistics, so bring
+        # them up to date first.
+        await self.con.execute(r"""
+            CREATE FUNCTION test::analyze() -> bool {
+                USING SQL $$
+                    ANALYZE;
+                    SELECT true
+                $$;
+            };
+        """)
+        await self.con.query_one(r"""SELECT test::analyze();""")
+
+        for typename in ['Issue', 'Named', 'LogEntry']:
+            res = await self.con.query_one(f"""
+                WITH MODULE test
+                SELECT (
+                    approximate := approximate_count({typename}),
+                    exact := count({typename}),
+                );
+            """)
+            self.assertGreater(res.exact, 0)
+            self.assertAlmostEqual(
+                res.approximate, res.exact, delta=max(1, res.exact // 10),
+                msg=typename)
+
+    async def test_edgeql_functions_approximate_count_02(self):
+        # Sets other than all objects of a type are counted exactly.
+        await self.assert_query_result(
+            r"""
+                WITH
+                    MODULE test,
+                    x := (SELECT Issue FILTER .owner.name = 'Elvis')
+                SELECT approximate_count(x) = count(x);
+            """,
+            [True]
+        )
+
+        await self.assert_query_result(
+            r"""
+                SELECT approximate_count({2, 3, 5});
+            """,
+            [3]
+        )
+
+        await self.assert_query_result(
+            r"""
+                WITH MODULE test
+                SELECT User {
+                    issues := approximate_count(User.<owner[IS Issue]),
+                    users := approximate_count(User),
+                }
+                ORDER BY .name;
+            """,
+            [
+                {'issues': 2, 'users': 1},
+                {'issues': 2, 'users': 1},
+            ]
+        )
+
     async def test_edgeql_functions_array_agg_01(self):
         await self.assert_query_result(
             r'''SELECT array_agg({1, 2, 3});''',
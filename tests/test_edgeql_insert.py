@@ -17,6 +17,7 @@
 #
 
 
+import json
 import os.path
 import uuid
 
@@ -940,6 +941,166 @@ class TestInsert(tb.QueryTestCase):
             }]
         )
 
+    async def test_edgeql_insert_for_05(self):
+        # Bulk insert from a JSON array argument, including a multi
+        # link with link properties.
+        await self.con.execute(r'''
+            FOR name IN {'bulk-sub1', 'bulk-sub2'}
+            UNION (
+                INSERT test::Subordinate {
+                    name := name
+                }
+            );
+        ''')
+
+        data = [
+            {'name': f'bulk-{i}', 'l2': i, 'subs': ['bulk-sub1', 'bulk-sub2']}
+            for i in range(100)
+        ] + [
+            {'name': 'bulk-nosubs', 'l2': 100, 'subs': []},
+        ]
+
+        await self.con.query(r'''
+            WITH MODULE test
+            FOR x IN {array_unpack(<array<json>>$data)}
+            UNION (
+                INSERT InsertTest {
+                    name := <str>x['name'],
+                    l2 := <int64>x['l2'],
+                    subordinates := (
+                        SELECT Subordinate {
+                            @comment := <str>x['l2']
+                        }
+                        FILTER
+                            .name IN array_unpack(<array<str>>x['subs'])
+                    )
+                }
+            );
+        ''', data=[json.dumps(row) for row in data])
+
+        await self.assert_query_result(
+            r'''
+                WITH MODULE test
+                SELECT (
+                    count(InsertTest FILTER .name LIKE 'bulk-%'),
+                    sum((
+                        SELECT InsertTest FILTER .name LIKE 'bulk-%'
+                    ).l2),
+                    count((
+                        SELECT InsertTest FILTER .name LIKE 'bulk-%'
+                    ).subordinates),
+                );
+            ''',
+            [[101, sum(range(101)), 2]]
+        )
+
+        await self.assert_query_result(
+            r'''
+                WITH MODULE test
+                SELECT InsertTest {
+                    name,
+                    subordinates: {
+                        name,
+                        @comment,
+                    } ORDER BY .name
+                }
+                FILTER .name IN {'bulk-42', 'bulk-nosubs'}
+                ORDER BY .name;
+            ''',
+            [{
+                'name': 'bulk-42',
+                'subordinates': [{
+                    'name': 'bulk-sub1',
+                    '@comment': '42',
+                }, {
+                    'name': 'bulk-sub2',
+                    '@comment': '42',
+                }]
+            }, {
+                'name': 'bulk-nosubs',
+                'subordinates': [],
+            }]
+        )
+
+    async def test_edgeql_insert_for_06(self):
+        # The bulk insert from test_edgeql_insert_for_05 is executed
+        # as one set-based INSERT per table rather than as a loop over
+        # the elements of the argument.
+        def iter_plan_nodes(plan):
+            if isinstance(plan, dict):
+                if 'Node Type' in plan:
+                    yield plan
+                for value in plan.values():
+                    yield from iter_plan_nodes(value)
+            elif isinstance(plan, list):
+                for value in plan:
+                    yield from iter_plan_nodes(value)
+
+        await self.con.execute(r'''
+            FOR name IN {'bulk-sub1', 'bulk-sub2'}
+            UNION (
+                INSERT test::Subordinate {
+                    name := name
+                }
+            );
+        ''')
+
+        inserts = {}
+        for count in (1, 50):
+            data = [
+                {'name': f'bulk-{count}-{i}', 'l2': i,
+                 'subs': ['bulk-sub1', 'bulk-sub2']}
+                for i in range(count)
+            ]
+
+            plan = await self.con.query_one(r'''
+                EXPLAIN ANALYZE
+                WITH MODULE test
+                FOR x IN {array_unpack(<array<json>>$data)}
+                UNION (
+                    INSERT InsertTest {
+                        name := <str>x['name'],
+                        l2 := <int64>x['l2'],
+                        subordinates := (
+                            SELECT Subordinate {
+                                @comment := <str>x['l2']
+                            }
+                            FILTER
+                                .name IN array_unpack(<array<str>>x['subs'])
+                        )
+                    }
+                );
+            ''', data=[json.dumps(row) for row in data])
+
+            inserts[count] = [
+                node for node in iter_plan_nodes(json.loads(plan))
+                if node['Node Type'] == 'ModifyTable'
+                and node['Operation'] == 'Insert'
+            ]
+
+            # Every INSERT is executed at most once...
+            for node in inserts[count]:
+                self.assertLessEqual(node['Actual Loops'], 1)
+
+        # ...the object and the link table ones at least...
+        self.assertGreaterEqual(len(inserts[50]), 2)
+        # ...and there are as many of them no matter how many
+        # objects are inserted.
+        self.assertEqual(len(inserts[1]), len(inserts[50]))
+
+        await self.assert_query_result(
+            r'''
+                WITH MODULE test
+                SELECT sum((
+                    SELECT InsertTest {
+                        n := count(.subordinates)
+                    }
+                    FILTER .name LIKE 'bulk-50-%'
+                ).n);
+            ''',
+            [100],
+        )
+
     async def test_edgeql_insert_default_01(self):
         await self.con.execute(r'''
             # create 10 DefaultTest3 objects, each object is defined
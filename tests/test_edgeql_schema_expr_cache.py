@@ -0,0 +1,111 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2020-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import os.path
+from unittest import mock
+
+from edb.common import ast
+from edb.testbase import lang as tb
+
+from edb.edgeql import compiler
+from edb.edgeql import parser as qlparser
+from edb.edgeql.compiler import schemactx
+
+
+# Not affected by the mock.patch() below.
+_parse = qlparser.parse
+
+
+def _snapshot(node):
+    # A structural copy of *node* that doesn't share any of its
+    # mutable containers.
+    if ast.is_ast_node(node):
+        return (
+            type(node),
+            tuple(
+                (name, _snapshot(value))
+                for name, value in ast.iter_fields(node)
+            ),
+        )
+    elif isinstance(node, (list, tuple)):
+        return tuple(_snapshot(n) for n in node)
+    elif isinstance(node, dict):
+        return tuple((k, _snapshot(v)) for k, v in node.items())
+    else:
+        return node
+
+
+class TestEdgeQLSchemaExprCache(tb.BaseEdgeQLCompilerTest):
+    """Tests for the cache of parsed schema expressions."""
+
+    SCHEMA = os.path.join(os.path.dirname(__file__), 'schemas',
+                          'cards.esdl')
+
+    def _compile(self, source, cache):
+        return compiler.compile_ast_to_ir(
+            _parse(source),
+            self.schema,
+            options=compiler.CompilerOptions(
+                modaliases={None: 'test'},
+                schema_expr_cache=cache,
+            ),
+        )
+
+    def _get_alias_text(self, name):
+        alias = self.schema.get(f'test::{name}')
+        return alias.get_expr(self.schema).text
+
+    def test_edgeql_schema_expr_cache_01(self):
+        cache = {}
+        query = 'SELECT WaterOrEarthCard { name, owned_by_alice }'
+
+        self._compile(query, cache)
+        self.assertIn(self._get_alias_text('WaterOrEarthCard'), cache)
+        cached = dict(cache)
+        snapshots = {text: _snapshot(tree) for text, tree in cache.items()}
+
+        with mock.patch.object(
+            schemactx.qlparser, 'parse', wraps=_parse,
+        ) as parse:
+            self._compile(query, cache)
+            self._compile(query, cache)
+
+        # The cached trees are reused instead of parsing the
+        # expressions again...
+        parsed = {call[0][0] for call in parse.call_args_list}
+        self.assertFalse(parsed & cache.keys())
+        self.assertEqual(cache.keys(), cached.keys())
+        for text, tree in cache.items():
+            self.assertIs(tree, cached[text])
+            # ...and the compiler never modifies them.
+            self.assertEqual(_snapshot(tree), snapshots[text])
+
+    def test_edgeql_schema_expr_cache_02(self):
+        # Without a cache every compilation parses the expressions.
+        query = 'SELECT WaterOrEarthCard { name }'
+        alias_text = self._get_alias_text('WaterOrEarthCard')
+
+        with mock.patch.object(
+            schemactx.qlparser, 'parse', wraps=_parse,
+        ) as parse:
+            self._compile(query, None)
+            self._compile(query, None)
+
+        parsed = [call[0][0] for call in parse.call_args_list]
+        self.assertEqual(parsed.count(alias_text), 2)
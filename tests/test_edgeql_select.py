@@ -2607,6 +2607,162 @@ class TestEdgeQLSelect(tb.QueryTestCase):
                 ORDER BY User.<owner[IS Issue].number;
             """)
 
+    async def test_edgeql_select_shape_single_link_01(self):
+        # Single links in shapes, both required and optional.
+        await self.assert_query_result(
+            r'''
+            WITH MODULE test
+            SELECT Issue {
+                number,
+                owner: {name},
+                status: {name},
+                priority: {name},
+            }
+            ORDER BY Issue.number;
+            ''',
+            [
+                {
+                    'number': '1',
+                    'owner': {'name': 'Elvis'},
+                    'status': {'name': 'Open'},
+                    'priority': None,
+                },
+                {
+                    'number': '2',
+                    'owner': {'name': 'Yury'},
+                    'status': {'name': 'Open'},
+                    'priority': {'name': 'High'},
+                },
+                {
+                    'number': '3',
+                    'owner': {'name': 'Yury'},
+                    'status': {'name': 'Closed'},
+                    'priority': {'name': 'Low'},
+                },
+                {
+                    'number': '4',
+                    'owner': {'name': 'Elvis'},
+                    'status': {'name': 'Closed'},
+                    'priority': None,
+                },
+            ]
+        )
+
+        await self.assert_query_result(
+            r'''
+            WITH MODULE test
+            SELECT Issue {
+                number,
+                priority: {name},
+                time_estimate,
+            }
+            ORDER BY Issue.priority.name EMPTY LAST THEN Issue.number
+            LIMIT 3;
+            ''',
+            [
+                {
+                    'number': '2',
+                    'priority': {'name': 'High'},
+                    'time_estimate': None,
+                },
+                {
+                    'number': '3',
+                    'priority': {'name': 'Low'},
+                    'time_estimate': None,
+                },
+                {
+                    'number': '1',
+                    'priority': None,
+                    'time_estimate': 3000,
+                },
+            ]
+        )
+
+    async def test_edgeql_select_subshape_01(self):
+        # Multi links in shapes of an unfiltered set, including
+        # a nested multi link and objects with no links.
+        await self.assert_query_result(
+            r'''
+            WITH MODULE test
+            SELECT User {
+                name,
+                todo: {
+                    number,
+                    watchers: {name},
+                },
+            }
+            ORDER BY User.name;
+            ''',
+            [
+                {
+                    'name': 'Elvis',
+                    'todo': [
+                        {'number': '1', 'watchers': [{'name': 'Yury'}]},
+                        {'number': '2', 'watchers': [{'name': 'Elvis'}]},
+                    ],
+                },
+                {
+                    'name': 'Yury',
+                    'todo': [
+                        {'number': '3', 'watchers': [{'name': 'Elvis'}]},
+                        {'number': '4', 'watchers': []},
+                    ],
+                },
+            ],
+            sort={
+                'todo': lambda x: x['number'],
+            }
+        )
+
+    async def test_edgeql_select_shape_single_link_02(self):
+        # Single links in a nested shape.
+        await self.assert_query_result(
+            r'''
+            WITH MODULE test
+            SELECT User {
+                name,
+                todo: {
+                    number,
+                    owner: {name},
+                    priority: {name},
+                } ORDER BY .number,
+            }
+            ORDER BY User.name;
+            ''',
+            [
+                {
+                    'name': 'Elvis',
+                    'todo': [
+                        {
+                            'number': '1',
+                            'owner': {'name': 'Elvis'},
+                            'priority': None,
+                        },
+                        {
+                            'number': '2',
+                            'owner': {'name': 'Yury'},
+                            'priority': {'name': 'High'},
+                        },
+                    ],
+                },
+                {
+                    'name': 'Yury',
+                    'todo': [
+                        {
+                            'number': '3',
+                            'owner': {'name': 'Yury'},
+                            'priority': {'name': 'Low'},
+                        },
+                        {
+                            'number': '4',
+                            'owner': {'name': 'Elvis'},
+                            'priority': None,
+                        },
+                    ],
+                },
+            ]
+        )
+
     async def test_edgeql_select_where_01(self):
         await self.assert_query_result(
             r'''
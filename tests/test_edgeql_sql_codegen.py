@@ -0,0 +1,145 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2020-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import os.path
+
+from edb.common import ast
+from edb.testbase import lang as tb
+
+from edb.edgeql import compiler
+from edb.edgeql import parser as qlparser
+
+from edb.pgsql import ast as pgast
+from edb.pgsql import compiler as pg_compiler
+
+
+class TestEdgeQLSQLCodegen(tb.BaseEdgeQLCompilerTest):
+    """Tests for the shape of the generated SQL."""
+
+    SCHEMA = os.path.join(os.path.dirname(__file__), 'schemas',
+                          'issues.esdl')
+
+    def _compile(self, source):
+        qltree = qlparser.parse(source)
+        ir = compiler.compile_ast_to_ir(
+            qltree,
+            self.schema,
+            options=compiler.CompilerOptions(
+                modaliases={None: 'test'},
+            ),
+        )
+        return pg_compiler.compile_ir_to_sql_tree(
+            ir, output_format=pg_compiler.OutputFormat.NATIVE)
+
+    def _find(self, tree, node_type, **attrs):
+        return ast.find_children(
+            tree,
+            lambda n: (
+                isinstance(n, node_type)
+                and all(getattr(n, k) == v for k, v in attrs.items())
+            ),
+            force_traversal=True,
+        )
+
+    def _find_grouped(self, tree):
+        return [
+            stmt for stmt in self._find(tree, pgast.SelectStmt)
+            if stmt.group_clause
+        ]
+
+    def test_codegen_shape_batch_multi_01(self):
+        # A multi link in the shape of an unfiltered top-level set
+        # is aggregated once for all source objects, the nested
+        # multi link is aggregated per object of the aggregate.
+        tree = self._compile('''
+            SELECT User {
+                todo: {
+                    watchers: {name}
+                }
+            }
+        ''')
+
+        self.assertEqual(len(self._find_grouped(tree)), 1)
+
+    def test_codegen_shape_batch_multi_02(self):
+        # Filtered sets are not batched.
+        tree = self._compile('''
+            SELECT User {
+                todo: {
+                    watchers: {name}
+                }
+            }
+            FILTER .name = 'Elvis'
+        ''')
+
+        self.assertEqual(self._find_grouped(tree), [])
+
+    def test_codegen_shape_batch_multi_03(self):
+        # Shapes nested in a correlated element subquery are not
+        # batched, as the aggregate would be computed for every
+        # row of the enclosing query.
+        tree = self._compile('''
+            SELECT User {
+                todo: {
+                    watchers: {name}
+                } ORDER BY .number
+            }
+        ''')
+
+        self.assertEqual(self._find_grouped(tree), [])
+
+        tree = self._compile('''
+            SELECT Issue {
+                owner: {
+                    todo: {name}
+                }
+            }
+        ''')
+
+        self.assertEqual(self._find_grouped(tree), [])
+
+    def test_codegen_shape_single_link_01(self):
+        # Single links in a shape are compiled into LEFT JOINs
+        # rather than correlated subqueries in the target list.
+        tree = self._compile('''
+            SELECT Issue {
+                number,
+                owner: {name},
+                status: {name},
+                priority: {name},
+            }
+        ''')
+
+        self.assertEqual(
+            len(self._find(tree, pgast.JoinExpr, type='left')), 3)
+
+    def test_codegen_shape_single_link_02(self):
+        # Same for single links in a nested shape.
+        tree = self._compile('''
+            SELECT User {
+                todo: {
+                    number,
+                    owner: {name},
+                    priority: {name},
+                } ORDER BY .number
+            }
+        ''')
+
+        self.assertEqual(
+            len(self._find(tree, pgast.JoinExpr, type='left')), 2)
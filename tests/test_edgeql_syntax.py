@@ -4110,3 +4110,26 @@ aa';
         """
         DESCRIBE ROLES AS DDL;
         """
+
+    def test_edgeql_syntax_explain_01(self):
+        """
+        EXPLAIN SELECT User { name } FILTER .name = 'foo';
+        """
+
+    def test_edgeql_syntax_explain_02(self):
+        """
+        EXPLAIN ANALYZE WITH x := 1 SELECT x + 1;
+        """
+
+    def test_edgeql_syntax_explain_03(self):
+        """
+        EXPLAIN ANALYZE UPDATE User SET { name := 'bar' };
+        """
+
+    @tb.must_fail(errors.EdgeQLSyntaxError,
+                  r"Unexpected 'DESCRIBE'",
+                  line=2, col=17)
+    def test_edgeql_syntax_explain_04(self):
+        """
+        EXPLAIN DESCRIBE ROLES;
+        """
@@ -57,3 +57,49 @@ class TestEdgeQLSys(tb.QueryTestCase):
                 'select sys::advisory_unlock(<int64>$0)',
                 lock_key),
             [False])
+
+    async def test_edgeql_sys_query_stats(self):
+        await self.con.query('SELECT sys::reset_query_stats()')
+
+        for i in range(3):
+            await self.con.query(
+                'WITH query_stats_marker := {1, 2} '
+                'SELECT query_stats_marker + <int64>$0',
+                i)
+
+        await self.assert_query_result(
+            r'''
+                SELECT sys::QueryStats {
+                    calls,
+                    rows,
+                    compiles,
+                    cache_hits,
+                    ok := .max_exec_time <= .total_exec_time,
+                    phases_ok := all(
+                        {'parse', 'EdgeQL to IR', 'IR to SQL'}
+                        IN json_object_unpack(.compile_phase_times).0
+                    ),
+                }
+                FILTER .query LIKE '%query_stats_marker%';
+            ''',
+            [{
+                'calls': 3,
+                'rows': 6,
+                'compiles': 1,
+                'cache_hits': 2,
+                'ok': True,
+                'phases_ok': True,
+            }],
+        )
+
+        await self.con.query('SELECT sys::reset_query_stats()')
+
+        await self.assert_query_result(
+            r'''
+                SELECT count(
+                    sys::QueryStats
+                    FILTER .query LIKE '%query_stats_marker%'
+                );
+            ''',
+            [0],
+        )
@@ -294,3 +294,20 @@ class TestHttpEdgeQL(tb.EdgeQLTestCase):
                     bad := sys::sleep(0)
                 };
             """)
+
+    def test_http_edgeql_explain_01(self):
+        # The plan is returned as is, annotated like for the binary
+        # protocol.
+        plan = self.edgeql_query(r"""
+            EXPLAIN SELECT Setting { name } FILTER .value = 'blue';
+        """)
+
+        nodes = [plan[0]['Plan']]
+        annotated = []
+        while nodes:
+            node = nodes.pop()
+            if 'EdgeQL Path' in node:
+                annotated.append(node)
+            nodes.extend(node.get('Plans', ()))
+
+        self.assertIn('Setting', {node['EdgeQL Path'] for node in annotated})
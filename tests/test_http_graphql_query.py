@@ -23,6 +23,7 @@ import uuid
 
 import edgedb
 
+from edb.graphql import translator
 from edb.testbase import http as tb
 from edb.tools import test
 
@@ -1309,12 +1310,8 @@ class TestGraphQLFunctional(tb.GraphQLTestCase):
     def test_graphql_functional_arguments_22(self):
         with self.assertRaisesRegex(
                 edgedb.QueryError,
-                # this error message is subpar, but this is what we get
-                # from postgres, because we transfer bigint values to postgres
-                # as strings
-                r'invalid input syntax for type bigint: "aaaaa"',
-                # _line=5, _col=32,
-        ):
+                r"invalid value for 'after': expected a string castable "
+                r"to an int or a cursor, got 'aaaaa'"):
             self.graphql_query(r"""
                 query {
                     u0: User(
@@ -1343,6 +1340,124 @@ class TestGraphQLFunctional(tb.GraphQLTestCase):
             }]
         })
 
+    def test_graphql_functional_arguments_24(self):
+        # Keyset pagination: the cursor consists of the values of the
+        # ordering fields of the boundary object and its id.
+        users = self.graphql_query(r"""
+            query {
+                User(order: {age: {dir: DESC}}) {
+                    id
+                    name
+                    age
+                }
+            }
+        """)['User']
+
+        # Jane and John share the age, so the id decides their order.
+        users.sort(key=lambda u: (-u['age'], u['id']))
+
+        for i, user in enumerate(users):
+            cursor = json.dumps([user['age'], user['id']])
+            self.assert_graphql_query_result(r"""
+                query($cursor: String) {
+                    User(
+                        order: {age: {dir: DESC}},
+                        after: $cursor
+                    ) {
+                        name
+                    }
+                }
+            """, {
+                'User': [{'name': u['name']} for u in users[i + 1:]],
+            }, variables={'cursor': cursor})
+
+            self.assert_graphql_query_result(r"""
+                query($cursor: String) {
+                    User(
+                        order: {age: {dir: DESC}},
+                        before: $cursor
+                    ) {
+                        name
+                    }
+                }
+            """, {
+                'User': [{'name': u['name']} for u in users[:i]],
+            }, variables={'cursor': cursor})
+
+        # An index and a cursor for the same variable.
+        self.assert_graphql_query_result(r"""
+            query($cursor: String) {
+                User(
+                    order: {age: {dir: DESC}},
+                    after: $cursor,
+                    first: 1
+                ) {
+                    name
+                }
+            }
+        """, {
+            'User': [{'name': users[1]['name']}],
+        }, variables={'cursor': '0'})
+
+        self.assert_graphql_query_result(r"""
+            query {
+                User(
+                    order: {age: {dir: DESC}},
+                    after: %s,
+                    first: 1
+                ) {
+                    name
+                }
+            }
+        """ % json.dumps(json.dumps([users[0]['age'], users[0]['id']])), {
+            'User': [{'name': users[1]['name']}],
+        })
+
+    def test_graphql_functional_arguments_25(self):
+        with self.assertRaisesRegex(
+                edgedb.QueryError,
+                r"invalid cursor: expected 2 values"):
+            self.graphql_query(r"""
+                query {
+                    User(
+                        order: {name: {dir: ASC}},
+                        after: "[\"Alice\"]"
+                    ) {
+                        name
+                    }
+                }
+            """)
+
+        with self.assertRaisesRegex(
+                edgedb.QueryError,
+                r"cannot mix indices and cursors"):
+            self.graphql_query(r"""
+                query {
+                    User(
+                        order: {name: {dir: ASC}},
+                        after: "[\"Alice\", \"%s\"]",
+                        before: "2"
+                    ) {
+                        name
+                    }
+                }
+            """ % uuid.uuid4())
+
+    def test_graphql_functional_arguments_26(self):
+        # Compiled queries are cached by the kind of the cursor only,
+        # the cursor values themselves are passed as a parameter.
+        key = translator.get_cursor_cache_key
+        self.assertIsNone(key(None))
+        self.assertEqual(key('10'), key('2'))
+        self.assertEqual(
+            key(json.dumps([20, str(uuid.uuid4())])),
+            key(json.dumps([30, str(uuid.uuid4())])))
+        self.assertNotEqual(key('10'), key(json.dumps([20, 'x'])))
+        self.assertNotEqual(
+            key(json.dumps([20, 'x'])), key(json.dumps([None, 'x'])))
+        self.assertNotEqual(
+            key(json.dumps([20, 'x'])), key(json.dumps([20, 1, 'x'])))
+
     def test_graphql_functional_enums_01(self):
         self.assert_graphql_query_result(r"""
             query {
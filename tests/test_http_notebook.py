@@ -19,7 +19,9 @@
 
 from typing import *
 
+import base64
 import json
+import struct
 import urllib
 
 from edb.testbase import http as tb
@@ -184,3 +186,28 @@ class TestHttpNotebook(tb.BaseHttpTest, tb.server.QueryTestCase):
                 ]
             }
         )
+
+    def test_http_notebook_06(self):
+        results = self.run_queries([
+            'EXPLAIN SELECT schema::ObjectType { name }',
+        ])
+
+        self.assertEqual(results['kind'], 'results')
+        [result] = results['results']
+        self.assertEqual(result['kind'], 'data')
+
+        # A single DataRow with the annotated plan.
+        row = base64.b64decode(result['data'][2])
+        self.assertEqual(row[:1], b'D')
+        mlen, ncol, vlen = struct.unpack('!ihi', row[1:11])
+        self.assertEqual((mlen, ncol, vlen), (len(row) - 1, 1, len(row) - 11))
+
+        nodes = [json.loads(row[11:])[0]['Plan']]
+        paths = set()
+        while nodes:
+            node = nodes.pop()
+            if 'EdgeQL Path' in node:
+                paths.add(node['EdgeQL Path'])
+            nodes.extend(node.get('Plans', ()))
+
+        self.assertIn('ObjectType', paths)
@@ -144,3 +144,300 @@ class TestIndexes(tb.DDLTestCase):
             await self.con.execute("""
                 ALTER TYPE test::User DROP INDEX ON (.name)
             """)
+
+    async def test_index_04(self):
+        await self.con.execute(r"""
+            CREATE TYPE test::Event {
+                CREATE PROPERTY data -> json;
+                CREATE PROPERTY active -> bool;
+                CREATE INDEX ON (.data) {
+                    SET kind := 'GIN';
+                    SET predicate := (.active);
+                };
+            }
+        """)
+
+        await self.assert_query_result(
+            r"""
+                SELECT
+                    schema::ObjectType {
+                        indexes: {
+                            expr,
+                            kind,
+                            predicate,
+                        }
+                    }
+                FILTER .name = 'test::Event';
+            """,
+            [{
+                'indexes': [{
+                    'expr': '.data',
+                    'kind': 'GIN',
+                    'predicate': '.active',
+                }]
+            }],
+        )
+
+        await self.con.execute(r"""
+            ALTER TYPE test::Event {
+                ALTER INDEX ON (.data) {
+                    SET kind := 'BTREE';
+                };
+            }
+        """)
+
+        await self.assert_query_result(
+            r"""
+                SELECT
+                    schema::ObjectType {
+                        indexes: {
+                            kind,
+                        }
+                    }
+                FILTER .name = 'test::Event';
+            """,
+            [{
+                'indexes': [{
+                    'kind': 'BTREE',
+                }]
+            }],
+        )
+
+        await self.con.execute(r"""
+            ALTER TYPE test::Event {
+                ALTER INDEX ON (.data) {
+                    SET predicate := (NOT .active);
+                };
+            }
+        """)
+
+        await self.assert_query_result(
+            r"""
+                SELECT
+                    schema::ObjectType {
+                        indexes: {
+                            kind,
+                            predicate,
+                        }
+                    }
+                FILTER .name = 'test::Event';
+            """,
+            [{
+                'indexes': [{
+                    'kind': 'BTREE',
+                    'predicate': 'NOT .active',
+                }]
+            }],
+        )
+
+        with self.assertRaisesRegex(
+            edgedb.SchemaDefinitionError,
+            r"index predicate expected to return a bool value",
+        ):
+            await self.con.execute("""
+                ALTER TYPE test::Event {
+                    ALTER INDEX ON (.data) {
+                        SET predicate := (.data);
+                    };
+                }
+            """)
+
+        with self.assertRaisesRegex(
+            edgedb.SchemaDefinitionError,
+            r"index predicate expected to return a bool value",
+        ):
+            await self.con.execute("""
+                ALTER TYPE test::Event {
+                    CREATE INDEX ON (.active) {
+                        SET predicate := (.data);
+                    };
+                }
+            """)
+
+    async def test_index_05(self):
+        with self.assertRaisesRegex(
+            edgedb.SchemaDefinitionError,
+            r"cannot build an index concurrently on object type "
+            r"'test::Log', which is being created by the same command",
+        ):
+            await self.con.execute(r"""
+                CREATE TYPE test::Log {
+                    CREATE PROPERTY ts -> datetime;
+                    CREATE INDEX ON (.ts) {
+                        SET build_concurrently := true;
+                    };
+                }
+            """)
+
+    async def test_index_06(self):
+        await self.con.execute(r"""
+            CREATE TYPE test::Log {
+                CREATE PROPERTY ts -> datetime;
+            }
+        """)
+
+        with self.assertRaisesRegex(
+            edgedb.QueryError,
+            r"cannot build an index concurrently in a transaction block",
+        ):
+            await self.con.execute(r"""
+                ALTER TYPE test::Log {
+                    CREATE INDEX ON (.ts) {
+                        SET build_concurrently := true;
+                    };
+                }
+            """)
+
+
+class TestIndexesConcurrent(tb.NonIsolatedDDLTestCase):
+
+    async def test_index_concurrent_01(self):
+        await self.con.execute(r"""
+            CREATE TYPE test::Log {
+                CREATE PROPERTY ts -> datetime;
+                CREATE PROPERTY message -> str;
+            };
+        """)
+
+        try:
+            await self.con.execute(r"""
+                ALTER TYPE test::Log {
+                    CREATE INDEX ON (.ts) {
+                        SET build_concurrently := true;
+                    };
+                };
+            """)
+
+            await self.assert_query_result(
+                r"""
+                    SELECT
+                        schema::ObjectType {
+                            indexes: {
+                                expr
+                            }
+                        }
+                    FILTER .name = 'test::Log';
+                """,
+                [{
+                    'indexes': [{
+                        'expr': '.ts'
+                    }]
+                }],
+            )
+
+            # str has no default GIN operator class, so the build
+            # fails and the schema must remain unchanged.
+            with self.assertRaisesRegex(
+                edgedb.EdgeDBError,
+                r"operator class",
+            ):
+                await self.con.execute(r"""
+                    ALTER TYPE test::Log {
+                        CREATE INDEX ON (.message) {
+                            SET kind := 'GIN';
+                            SET build_concurrently := true;
+                        };
+                    };
+                """)
+
+            await self.assert_query_result(
+                r"""
+                    SELECT
+                        schema::ObjectType {
+                            indexes: {
+                                expr
+                            }
+                        }
+                    FILTER .name = 'test::Log';
+                """,
+                [{
+                    'indexes': [{
+                        'expr': '.ts'
+                    }]
+                }],
+            )
+
+        finally:
+            await self.con.execute(r"""
+                DROP TYPE test::Log;
+            """)
+
+    async def test_index_concurrent_02(self):
+        # The copies of the index inherited by subtypes are built
+        # concurrently too, and a failed build is cleaned up when
+        # the command is sent with Execute rather than as a script.
+        await self.con.execute(r"""
+            CREATE TYPE test::Log {
+                CREATE PROPERTY ts -> datetime;
+                CREATE PROPERTY message -> str;
+            };
+
+            CREATE TYPE test::AuditLog EXTENDING test::Log;
+
+            CREATE FUNCTION test::invalid_indexes() -> int64 {
+                USING SQL $$
+                    SELECT count(*) FROM pg_index WHERE NOT indisvalid
+                $$;
+            };
+        """)
+
+        try:
+            await self.con.query(r"""
+                ALTER TYPE test::Log {
+                    CREATE INDEX ON (.ts) {
+                        SET build_concurrently := true;
+                    };
+                };
+            """)
+
+            await self.assert_query_result(
+                r"""
+                    SELECT
+                        schema::ObjectType {
+                            name,
+                            indexes: {
+                                expr
+                            }
+                        }
+                    FILTER .name IN {'test::Log', 'test::AuditLog'}
+                    ORDER BY .name;
+                """,
+                [{
+                    'name': 'test::AuditLog',
+                    'indexes': [{
+                        'expr': '.ts'
+                    }]
+                }, {
+                    'name': 'test::Log',
+                    'indexes': [{
+                        'expr': '.ts'
+                    }]
+                }],
+            )
+
+            with self.assertRaisesRegex(
+                edgedb.EdgeDBError,
+                r"operator class",
+            ):
+                await self.con.query(r"""
+                    ALTER TYPE test::Log {
+                        CREATE INDEX ON (.message) {
+                            SET kind := 'GIN';
+                            SET build_concurrently := true;
+                        };
+                    };
+                """)
+
+            await self.assert_query_result(
+                r"""
+                    SELECT test::invalid_indexes();
+                """,
+                [0],
+            )
+
+        finally:
+            await self.con.execute(r"""
+                DROP FUNCTION test::invalid_indexes();
+                DROP TYPE test::AuditLog;
+                DROP TYPE test::Log;
+            """)
@@ -276,6 +276,37 @@ class TestLinkTargetDeleteDeclarative(stb.QueryTestCase):
 
         self.assertTrue(success)
 
+    async def test_link_on_target_delete_restrict_08(self):
+        # Bulk deletion must be rejected if any of the deleted
+        # objects is still referenced.
+        async with self._run_and_rollback():
+            await self.con.execute("""
+                SET MODULE test;
+
+                FOR name IN {'Target1.1', 'Target1.2', 'Target1.3'}
+                UNION (
+                    INSERT Target1 {
+                        name := name
+                    });
+
+                INSERT Source1 {
+                    name := 'Source1.1',
+                    tgt1_m2m_restrict := (
+                        SELECT Target1
+                        FILTER .name = 'Target1.3'
+                    )
+                };
+            """)
+
+            with self.assertRaisesRegex(
+                    edgedb.ConstraintViolationError,
+                    'deletion of test::Target1.* is prohibited by link'):
+                await self.con.execute("""
+                    DELETE (
+                        SELECT test::Target1 FILTER .name LIKE 'Target1.%'
+                    );
+                """)
+
     async def test_link_on_target_delete_deferred_restrict_01(self):
         exception_is_deferred = False
 
@@ -873,6 +904,69 @@ class TestLinkTargetDeleteDeclarative(stb.QueryTestCase):
                 ]
             )
 
+    async def test_link_on_target_delete_delete_source_04(self):
+        # Delete many targets in one statement, making sure that
+        # every affected source is deleted and unaffected ones are not.
+        async with self._run_and_rollback():
+            await self.con.execute("""
+                SET MODULE test;
+
+                FOR x IN {1, 2, 3, 4, 5, 6, 7, 8, 9, 10}
+                UNION (
+                    INSERT Source1 {
+                        name := 'Source1.' ++ <str>x,
+                        tgt1_del_source := (
+                            INSERT Target1 {
+                                name := 'Target1.' ++ <str>x
+                            }
+                        ),
+                        tgt1_m2m_allow := (
+                            INSERT Target1 {
+                                name := 'Target1.m.' ++ <str>x
+                            }
+                        ),
+                    }
+                );
+            """)
+
+            await self.con.execute("""
+                DELETE (
+                    SELECT test::Target1
+                    FILTER
+                        .name LIKE 'Target1.%'
+                        AND .name NOT LIKE 'Target1.m.%'
+                        AND .name != 'Target1.1'
+                );
+
+                DELETE (
+                    SELECT test::Target1
+                    FILTER .name LIKE 'Target1.m.%'
+                );
+            """)
+
+            await self.assert_query_result(
+                r'''
+                    WITH MODULE test
+                    SELECT
+                        Source1 {
+                            name,
+                            tgt1_del_source: {
+                                name
+                            },
+                            tgt1_m2m_allow: {
+                                name
+                            },
+                        }
+                    FILTER
+                        .name LIKE 'Source1.%';
+                ''',
+                [{
+                    'name': 'Source1.1',
+                    'tgt1_del_source': {'name': 'Target1.1'},
+                    'tgt1_m2m_allow': [],
+                }]
+            )
+
 
 class TestLinkTargetDeleteMigrations(stb.NonIsolatedDDLTestCase):
     SCHEMA = pathlib.Path(__file__).parent / 'schemas' / 'link_tgt_del.esdl'
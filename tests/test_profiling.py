@@ -87,3 +87,41 @@ class ProfilingTestCase(unittest.TestCase):
             out_contents = out.read()
             self.assertIn("profiled_function", out_contents)
             self.assertIn("regular_function", out_contents)
+
+    def test_tools_profiling_sampler(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            self._inner_sampler(tmpdir)
+
+    def _inner_sampler(self, dir: str) -> None:
+        from edb.common import sampler
+
+        def sampled_function(arg):
+            return sum(regular_function(i) for i in range(arg))
+
+        sampler.start(interval=0.001)
+        try:
+            while not sampler._samples:
+                sampled_function(10000)
+        finally:
+            collapsed_file = sampler.stop(dir=dir, prefix="test_")
+
+        self.assertFalse(sampler.is_running())
+        self.assertIsNotNone(collapsed_file)
+
+        with open(collapsed_file) as f:
+            self.assertIn("_inner_sampler", f.read())
+
+        # aggregate the results
+        profiler = profiling.profile(
+            dir=dir, prefix="test_", suffix=".collapsed"
+        )
+        out_file = pathlib.Path(collapsed_file).with_suffix(".pstats")
+        success, failure = profiler.aggregate(
+            out_file, sort_by="cumulative", quiet=True
+        )
+
+        self.assertEqual(success, 1)
+        self.assertEqual(failure, 0)
+
+        with out_file.open() as out:
+            self.assertIn("_inner_sampler", out.read())
@@ -171,3 +171,200 @@ class TestProtocol(protocol.ProtocolTestCase):
             protocol.ReadyForCommand,
             transaction_state=protocol.TransactionState.NOT_IN_TRANSACTION,
         )
+
+    async def test_proto_prepared_statement_01(self):
+        # Test that named statements outlive the anonymous statement.
+
+        await self.con.connect()
+
+        await self.con.send(
+            protocol.Prepare(
+                headers=[],
+                io_format=protocol.IOFormat.BINARY,
+                expected_cardinality=protocol.Cardinality.MANY,
+                statement_name=b'stmt1',
+                command='SELECT {1, 2, 3}',
+            ),
+            protocol.Prepare(
+                headers=[],
+                io_format=protocol.IOFormat.BINARY,
+                expected_cardinality=protocol.Cardinality.ONE,
+                statement_name=b'',
+                command='SELECT 1',
+            ),
+            protocol.Flush()
+        )
+        await self.con.recv_match(
+            protocol.PrepareComplete,
+            cardinality=protocol.Cardinality.MANY,
+        )
+        await self.con.recv_match(
+            protocol.PrepareComplete,
+            cardinality=protocol.Cardinality.ONE,
+        )
+
+        await self.con.send(
+            protocol.DescribeStatement(
+                headers=[],
+                aspect=protocol.DescribeAspect.DATA_DESCRIPTION,
+                statement_name=b'stmt1',
+            ),
+            protocol.Flush()
+        )
+        await self.con.recv_match(
+            protocol.CommandDataDescription,
+            result_cardinality=protocol.Cardinality.MANY,
+        )
+
+        for _ in range(2):
+            await self.con.send(
+                protocol.Execute(
+                    headers=[],
+                    statement_name=b'stmt1',
+                    arguments=b'\x00\x00\x00\x00',
+                ),
+                protocol.Sync()
+            )
+            for _ in range(3):
+                await self.con.recv_match(protocol.Data)
+            await self.con.recv_match(
+                protocol.CommandComplete,
+                status='SELECT'
+            )
+            await self.con.recv_match(
+                protocol.ReadyForCommand,
+                transaction_state=(
+                    protocol.TransactionState.NOT_IN_TRANSACTION),
+            )
+
+        await self.con.send(
+            protocol.Execute(
+                headers=[],
+                statement_name=b'stmt2',
+                arguments=b'\x00\x00\x00\x00',
+            ),
+            protocol.Sync()
+        )
+        await self.con.recv_match(
+            protocol.ErrorResponse,
+            message="no prepared statement 'stmt2' found"
+        )
+        await self.con.recv_match(
+            protocol.ReadyForCommand,
+            transaction_state=protocol.TransactionState.NOT_IN_TRANSACTION,
+        )
+
+    async def test_proto_execute_01(self):
+        # Test that the anonymous statement survives other commands
+        # sent between Prepare and Execute.
+
+        await self.con.connect()
+
+        await self.con.send(
+            protocol.Prepare(
+                headers=[],
+                io_format=protocol.IOFormat.BINARY,
+                expected_cardinality=protocol.Cardinality.MANY,
+                statement_name=b'',
+                command='SELECT {1, 2}',
+            ),
+            protocol.Sync()
+        )
+        await self.con.recv_match(
+            protocol.PrepareComplete,
+            cardinality=protocol.Cardinality.MANY,
+        )
+        await self.con.recv_match(
+            protocol.ReadyForCommand,
+            transaction_state=protocol.TransactionState.NOT_IN_TRANSACTION,
+        )
+
+        await self.con.send(
+            protocol.ExecuteScript(
+                headers=[],
+                script='SELECT 1'
+            )
+        )
+        await self.con.recv_match(
+            protocol.CommandComplete,
+            status='SELECT'
+        )
+        await self.con.recv_match(
+            protocol.ReadyForCommand,
+            transaction_state=protocol.TransactionState.NOT_IN_TRANSACTION,
+        )
+
+        await self.con.send(
+            protocol.Execute(
+                headers=[],
+                statement_name=b'',
+                arguments=b'\x00\x00\x00\x00',
+            ),
+            protocol.Sync()
+        )
+        for _ in range(2):
+            await self.con.recv_match(protocol.Data)
+        await self.con.recv_match(
+            protocol.CommandComplete,
+            status='SELECT'
+        )
+        await self.con.recv_match(
+            protocol.ReadyForCommand,
+            transaction_state=protocol.TransactionState.NOT_IN_TRANSACTION,
+        )
+
+    async def test_proto_parse_error_01(self):
+        # Test that errors raised by Postgres while parsing the
+        # generated SQL are reported in response to Prepare, even
+        # though the backend Parse is pipelined with the next message.
+        query = 'SELECT ({})'.format(', '.join(['1'] * 1700))
+
+        await self.con.connect()
+
+        for follow_up in [
+            (protocol.Sync(),),
+            (
+                protocol.Execute(
+                    headers=[],
+                    statement_name=b'',
+                    arguments=b'\x00\x00\x00\x00',
+                ),
+                protocol.Sync(),
+            ),
+        ]:
+            await self.con.send(
+                protocol.Prepare(
+                    headers=[],
+                    io_format=protocol.IOFormat.BINARY,
+                    expected_cardinality=protocol.Cardinality.MANY,
+                    statement_name=b'',
+                    command=query,
+                ),
+                *follow_up,
+            )
+            # No PrepareComplete, and the Execute is not processed.
+            await self.con.recv_match(
+                protocol.ErrorResponse,
+                message='.*at most 1664 entries'
+            )
+            await self.con.recv_match(
+                protocol.ReadyForCommand,
+                transaction_state=(
+                    protocol.TransactionState.NOT_IN_TRANSACTION),
+            )
+
+        # The connection is usable after the error.
+        await self.con.send(
+            protocol.ExecuteScript(
+                headers=[],
+                script='SELECT 1'
+            )
+        )
+        await self.con.recv_match(
+            protocol.CommandComplete,
+            status='SELECT'
+        )
+        await self.con.recv_match(
+            protocol.ReadyForCommand,
+            transaction_state=protocol.TransactionState.NOT_IN_TRANSACTION,
+        )
@@ -0,0 +1,171 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2020-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import asyncio
+import pickle
+import tempfile
+
+from edb import errors
+from edb.server import admission
+from edb.testbase import server as tb
+
+
+class TestServerAdmission(tb.TestCase):
+
+    def new_controller(self, capacity=1, queue_timeout=5.0,
+                       max_queue_size=100):
+        return admission.AdmissionController(
+            capacity=capacity,
+            queue_timeout=queue_timeout,
+            max_queue_size=max_queue_size,
+        )
+
+    async def test_server_admission_capacity(self):
+        ac = self.new_controller(capacity=2)
+
+        await ac.acquire('db', 'user')
+        await ac.acquire('db', 'user')
+        self.assertEqual(ac.used, 2)
+
+        waiter = asyncio.ensure_future(ac.acquire('db', 'user'))
+        await asyncio.sleep(0)
+        self.assertFalse(waiter.done())
+        self.assertEqual(ac.queued, 1)
+
+        ac.release()
+        await waiter
+        self.assertEqual(ac.used, 2)
+        self.assertEqual(ac.queued, 0)
+
+        ac.release()
+        ac.release()
+        self.assertEqual(ac.used, 0)
+
+        with self.assertRaises(RuntimeError):
+            ac.release()
+
+    async def test_server_admission_fairness(self):
+        ac = self.new_controller()
+        await ac.acquire('db1', 'user')
+
+        granted = []
+
+        async def acquire(dbname, user):
+            await ac.acquire(dbname, user)
+            granted.append((dbname, user))
+
+        tasks = []
+        for dbname, user in [('db1', 'user1'), ('db1', 'user1'),
+                             ('db1', 'user1'), ('db1', 'user2'),
+                             ('db2', 'user1')]:
+            tasks.append(asyncio.ensure_future(acquire(dbname, user)))
+            await asyncio.sleep(0)
+
+        for _ in tasks:
+            ac.release()
+            await asyncio.sleep(0)
+
+        await asyncio.gather(*tasks)
+
+        self.assertEqual(granted, [
+            ('db1', 'user1'),
+            ('db2', 'user1'),
+            ('db1', 'user2'),
+            ('db1', 'user1'),
+            ('db1', 'user1'),
+        ])
+
+    async def test_server_admission_timeout(self):
+        ac = self.new_controller(queue_timeout=0.01)
+        await ac.acquire('db', 'user')
+
+        with self.assertRaisesRegex(errors.BackendUnavailableError,
+                                    'timed out'):
+            await ac.acquire('db', 'user')
+
+        self.assertEqual(ac.queued, 0)
+
+        ac.release()
+        self.assertEqual(ac.used, 0)
+
+    async def test_server_admission_queue_full(self):
+        ac = self.new_controller(max_queue_size=1)
+        await ac.acquire('db', 'user')
+
+        waiter = asyncio.ensure_future(ac.acquire('db', 'user'))
+        await asyncio.sleep(0)
+
+        with self.assertRaisesRegex(errors.BackendUnavailableError,
+                                    'too many clients'):
+            await ac.acquire('db', 'other')
+
+        waiter.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiter
+
+        self.assertEqual(ac.queued, 0)
+        ac.release()
+        self.assertEqual(ac.used, 0)
+
+    async def test_server_admission_slots_01(self):
+        with tempfile.TemporaryDirectory() as td:
+            slots = admission.BackendConnectionSlots(
+                dirname=td, size=2, timeout=0.1)
+
+            async with slots.acquire(), slots.acquire():
+                with self.assertRaisesRegex(errors.BackendUnavailableError,
+                                            'timed out'):
+                    async with slots.acquire():
+                        pass
+
+            # Both slots have been released.
+            async with slots.acquire(), slots.acquire():
+                pass
+
+    async def test_server_admission_slots_02(self):
+        with tempfile.TemporaryDirectory() as td:
+            slots = admission.BackendConnectionSlots(
+                dirname=td, size=1, timeout=5.0)
+            # A copy, like the one a compiler worker gets, shares
+            # the slots with the original.
+            copy = pickle.loads(pickle.dumps(slots))
+            self.assertEqual(copy.size, 1)
+
+            acquired = asyncio.Event()
+            release = asyncio.Event()
+
+            async def hold():
+                async with slots.acquire():
+                    acquired.set()
+                    await release.wait()
+
+            async def wait():
+                async with copy.acquire():
+                    pass
+
+            holder = asyncio.ensure_future(hold())
+            await acquired.wait()
+
+            waiter = asyncio.ensure_future(wait())
+            await asyncio.sleep(0.1)
+            self.assertFalse(waiter.done())
+
+            release.set()
+            await holder
+            await asyncio.wait_for(waiter, 1.0)
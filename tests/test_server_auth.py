@@ -153,3 +153,38 @@ class TestServerAuth(tb.ConnectedTestCase):
 
         finally:
             await self.con.query("DROP ROLE bar")
+
+    async def test_server_auth_02(self):
+        # Roles created in a transaction can only be used to
+        # authenticate once the transaction is committed.
+        async with self.con.transaction():
+            await self.con.query('''
+                CREATE SUPERUSER ROLE baz {
+                    SET password := 'baz-pass';
+                }
+            ''')
+
+            with self.assertRaisesRegex(
+                    edgedb.AuthenticationError,
+                    'authentication failed'):
+                await self.connect(
+                    user='baz',
+                    password='baz-pass',
+                )
+
+        try:
+            conn = await self.connect(
+                user='baz',
+                password='baz-pass',
+            )
+            await conn.aclose()
+        finally:
+            await self.con.query("DROP ROLE baz")
+
+        with self.assertRaisesRegex(
+                edgedb.AuthenticationError,
+                'authentication failed'):
+            await self.connect(
+                user='baz',
+                password='baz-pass',
+            )
@@ -17,8 +17,12 @@
 #
 
 
+from edb import _edgeql_rust
+from edb import errors
 from edb.testbase import lang as tb
 from edb.server import compiler as edbcompiler
+from edb.server.compiler import dbstate
+from edb.server.compiler import errormech
 
 
 class TestServerCompiler(tb.BaseSchemaLoadTest):
@@ -27,6 +31,12 @@ class TestServerCompiler(tb.BaseSchemaLoadTest):
         type Foo {
             property bar -> str;
         }
+
+        type Bar {
+            required property name -> str {
+                constraint exclusive;
+            }
+        }
     '''
 
     @classmethod
@@ -50,3 +60,68 @@ class TestServerCompiler(tb.BaseSchemaLoadTest):
                 }
             ''',
         )
+
+    def test_server_compiler_compile_timings(self):
+        compiler = tb.new_compiler()
+        context = edbcompiler.new_compiler_context(
+            modaliases={None: 'test'},
+            schema=self.schema,
+            single_statement=True,
+        )
+
+        units = compiler._compile(
+            ctx=context,
+            tokens=_edgeql_rust.tokenize('SELECT Foo { bar }'),
+        )
+
+        self.assertEqual(len(units), 1)
+        timings = units[0].compile_timings
+        self.assertEqual(
+            set(timings),
+            {
+                dbstate.CompilePhase.PARSE.value,
+                dbstate.CompilePhase.QL_TO_IR.value,
+                dbstate.CompilePhase.IR_TO_SQL.value,
+                dbstate.CompilePhase.DESCRIBE.value,
+            },
+        )
+        self.assertTrue(all(t >= 0 for t in timings.values()))
+
+    def test_server_compiler_backend_name_map(self):
+        schema = self.schema
+        bar = schema.get('test::Bar')
+        constraint = next(iter(
+            bar.getptr(schema, 'name').get_constraints(schema).objects(
+                schema)))
+
+        name_map = errormech.BackendNameMap.from_schema(schema)
+
+        fields = {
+            'C': errormech.PGErrorCode.UniqueViolationError.value,
+            'M': (f'duplicate key value violates unique constraint '
+                  f'"{constraint.id};schemaconstr"'),
+            'n': f'{constraint.id};schemaconstr',
+        }
+        err = errormech.interpret_backend_error_with_names(name_map, fields)
+        self.assertIsInstance(err, errors.ConstraintViolationError)
+        self.assertEqual(
+            str(err),
+            str(errormech.interpret_backend_error(schema, fields)))
+
+        fields = {
+            'C': errormech.PGErrorCode.NotNullViolationError.value,
+            'M': 'null value in column "name" violates not-null constraint',
+            's': 'edgedbpub',
+            't': str(bar.id),
+            'c': 'name',
+        }
+        err = errormech.interpret_backend_error_with_names(name_map, fields)
+        self.assertIsInstance(err, errors.MissingRequiredError)
+        self.assertEqual(
+            str(err), 'missing value for required property test::Bar.name')
+
+        # Objects not in the map require the schema.
+        fields['t'] = str(schema.get('std::Object').id)
+        self.assertIs(
+            errormech.interpret_backend_error_with_names(name_map, fields),
+            errormech.SchemaRequired)
@@ -0,0 +1,164 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2020-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import json
+import os.path
+import struct
+
+from edb.testbase import lang as tb
+
+from edb.edgeql import compiler
+from edb.edgeql import parser as qlparser
+
+from edb.pgsql import compiler as pg_compiler
+
+from edb.server.compiler import explain
+from edb.server.pgcon import pgcon
+
+
+PLAN = [
+    {
+        'Plan': {
+            'Node Type': 'Nested Loop',
+            'Plans': [
+                {
+                    'Node Type': 'Seq Scan',
+                    'Alias': 'rv1',
+                },
+                {
+                    'Node Type': 'CTE Scan',
+                    'CTE Name': 'cte1',
+                    'Alias': 'cte1',
+                    'Plans': [
+                        {
+                            'Node Type': 'Index Scan',
+                            'Alias': 'unknown',
+                        },
+                    ],
+                },
+            ],
+        },
+        'Planning Time': 0.1,
+    },
+]
+
+ALIAS_MAP = {
+    'rv1': {'EdgeQL Path': 'User'},
+    'cte1': {
+        'EdgeQL Path': 'User.todo',
+        'EdgeQL Shape Element': 'todo',
+    },
+}
+
+
+class TestServerExplain(tb.BaseEdgeQLCompilerTest):
+
+    SCHEMA = os.path.join(os.path.dirname(__file__), 'schemas',
+                          'issues.esdl')
+
+    def _compile(self, source, analyze=False):
+        ir = compiler.compile_ast_to_ir(
+            qlparser.parse(source),
+            self.schema,
+            options=compiler.CompilerOptions(
+                modaliases={None: 'test'},
+            ),
+        )
+        sql_text, _, rvar_paths = pg_compiler.compile_ir_to_explain_sql(
+            ir, analyze=analyze)
+        return sql_text, explain.build_alias_map(ir, rvar_paths)
+
+    def test_server_explain_alias_map_01(self):
+        query = '''
+            SELECT User {
+                name,
+                todo: {number}
+            }
+            FILTER .name = 'Elvis'
+        '''
+        sql_text, alias_map = self._compile(query)
+
+        self.assertTrue(
+            sql_text.startswith('EXPLAIN (FORMAT JSON) '), sql_text)
+        self.assertTrue(alias_map)
+        for alias, info in alias_map.items():
+            self.assertIn(alias, sql_text)
+            self.assertIn('EdgeQL Path', info)
+
+        paths = {info['EdgeQL Path'] for info in alias_map.values()}
+        self.assertIn('User', paths)
+
+        # Range variables are mapped back to the query text...
+        sources = {
+            info['EdgeQL Source']: info
+            for info in alias_map.values() if 'EdgeQL Source' in info
+        }
+        self.assertIn('User', sources)
+        self.assertEqual(sources['User']['EdgeQL Source Line'], 2)
+        self.assertIn('EdgeQL Source Column', sources['User'])
+
+        # ...and to the shape elements they were compiled from.
+        self.assertIn(
+            'todo',
+            {info.get('EdgeQL Shape Element') for info in alias_map.values()},
+        )
+
+    def test_server_explain_alias_map_02(self):
+        sql_text, _ = self._compile('SELECT Issue', analyze=True)
+        self.assertTrue(
+            sql_text.startswith('EXPLAIN (FORMAT JSON, ANALYZE, BUFFERS) '),
+            sql_text)
+
+    def test_server_explain_annotate_plan_01(self):
+        plan = explain.annotate_plan(
+            json.dumps(PLAN).encode(), ALIAS_MAP)
+
+        root = json.loads(plan)[0]['Plan']
+        self.assertNotIn('EdgeQL Path', root)
+
+        scan, cte_scan = root['Plans']
+        self.assertEqual(scan['EdgeQL Path'], 'User')
+        self.assertNotIn('EdgeQL Shape Element', scan)
+        self.assertEqual(cte_scan['EdgeQL Shape Element'], 'todo')
+
+        # Nodes with no mapped alias are left intact.
+        self.assertEqual(
+            cte_scan['Plans'],
+            [{'Node Type': 'Index Scan', 'Alias': 'unknown'}])
+        self.assertEqual(json.loads(plan)[0]['Planning Time'], 0.1)
+
+    def test_server_explain_annotate_plan_02(self):
+        plan = json.dumps(PLAN).encode()
+        self.assertEqual(
+            json.loads(explain.annotate_plan(plan, {})), PLAN)
+
+    def test_server_explain_data_row_01(self):
+        plan = json.dumps(PLAN).encode()
+        # DataRow payload: column count, value length, value.
+        data = struct.pack('!hi', 1, len(plan)) + plan
+
+        msg = pgcon.make_explain_data_row(data, ALIAS_MAP)
+
+        self.assertEqual(msg[:1], b'D')
+        mlen, ncol, vlen = struct.unpack('!ihi', msg[1:11])
+        self.assertEqual(mlen, len(msg) - 1)
+        self.assertEqual(ncol, 1)
+        self.assertEqual(vlen, len(msg) - 11)
+        self.assertEqual(
+            msg[11:], explain.annotate_plan(plan, ALIAS_MAP))
@@ -0,0 +1,231 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2020-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import asyncio
+import os
+import signal
+import tempfile
+import time
+
+from edb.server import procpool
+from edb.server.procpool import pool
+from edb.testbase import server as tb
+
+
+class MyWorker:
+
+    def __init__(self, **kwargs):
+        self._busy = False
+
+    async def set_busy(self, busy):
+        self._busy = busy
+
+    async def can_recycle(self):
+        return not self._busy
+
+    async def get_pid(self):
+        return os.getpid()
+
+    async def get_ppid(self):
+        return os.getppid()
+
+    async def exit(self, status):
+        # Exit right after the reply is sent.
+        asyncio.get_running_loop().call_later(0.01, os._exit, status)
+
+
+def is_process_gone(pid):
+    # Orphaned workers may not be reaped if the init process of
+    # a container doesn't do that, so treat zombies as gone as well.
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            return f.read().rpartition(')')[2].split()[0] == 'Z'
+    except FileNotFoundError:
+        return True
+
+
+class TestServerProcPool(tb.TestCase):
+
+    async def wait_for_exit(self, pid, timeout=10.0):
+        deadline = time.monotonic() + timeout
+        while not is_process_gone(pid):
+            if time.monotonic() > deadline:
+                self.fail(f'process {pid} is still running')
+            await asyncio.sleep(0.05)
+
+    async def create_manager(self, **kwargs):
+        td = tempfile.TemporaryDirectory()
+        self.addCleanup(td.cleanup)
+        manager = await procpool.create_manager(
+            runstate_dir=td.name,
+            name='test',
+            worker_cls=MyWorker,
+            worker_args={},
+            pool_size=0,
+            **kwargs,
+        )
+        self.addCleanup(
+            lambda: self.loop.run_until_complete(manager.stop()))
+        return manager
+
+    async def test_server_procpool_fork_01(self):
+        manager = await self.create_manager()
+        template = manager._template
+        self.assertIsNotNone(template)
+
+        worker = await manager.spawn_worker()
+        self.assertIsInstance(worker._proc, pool.ForkedProcess)
+        self.assertEqual(await worker.call('get_pid'), worker.get_pid())
+        # Workers are children of the template, not of the server.
+        self.assertEqual(
+            await worker.call('get_ppid'), template._proc.pid)
+
+    async def test_server_procpool_fork_02(self):
+        # Worker exit statuses are reported by the template.
+        manager = await self.create_manager()
+
+        worker = await manager.spawn_worker()
+        proc = worker._proc
+        await worker.call('exit', 3)
+        self.assertEqual(await asyncio.wait_for(proc.wait(), 10), 3)
+        self.assertEqual(proc.returncode, 3)
+        self.assertTrue(is_process_gone(proc.pid))
+
+        # The PID of a reaped worker is never signalled again.
+        with self.assertRaises(ProcessLookupError):
+            proc.kill()
+
+        # A new process is forked for the next call.
+        await worker.call('get_pid')
+        self.assertIsNot(worker._proc, proc)
+
+    async def test_server_procpool_fork_03(self):
+        manager = await self.create_manager()
+
+        worker = await manager.spawn_worker()
+        proc = worker._proc
+        proc.kill()
+        self.assertEqual(
+            await asyncio.wait_for(proc.wait(), 10), -signal.SIGKILL)
+
+        worker = await manager.spawn_worker()
+        proc = worker._proc
+        await asyncio.wait_for(worker.close(), 10)
+        # Workers exit with os._exit(-1) on SIGTERM.
+        self.assertEqual(proc.returncode, 255)
+        self.assertTrue(is_process_gone(proc.pid))
+
+    async def test_server_procpool_fork_04(self):
+        # Forked workers exit along with the template.
+        manager = await self.create_manager()
+
+        worker = await manager.spawn_worker()
+        proc = worker._proc
+        await manager._template.stop()
+
+        self.assertEqual(await asyncio.wait_for(proc.wait(), 10), -1)
+        with self.assertRaises(ProcessLookupError):
+            proc.kill()
+        await self.wait_for_exit(proc.pid)
+
+    async def test_server_procpool_signal_01(self):
+        # SIGUSR2 toggles the sampling profiler in workers; processes
+        # that don't handle it (yet) must not be killed by it.
+        manager = await self.create_manager()
+        template = manager._template
+
+        template._proc.send_signal(signal.SIGUSR2)
+        await asyncio.sleep(0.1)
+        self.assertTrue(template.is_alive())
+
+        worker = await manager.spawn_worker()
+        self.assertEqual(await worker.call('get_pid'), worker.get_pid())
+
+        # A worker that is being respawned has no process to signal.
+        proc = worker._proc
+        worker._proc = None
+        try:
+            manager.signal_workers(signal.SIGUSR2)
+        finally:
+            worker._proc = proc
+
+    async def wait_for_recycle(self, worker, pid, timeout=10.0):
+        deadline = time.monotonic() + timeout
+        while worker.get_pid() == pid:
+            if time.monotonic() > deadline:
+                self.fail(f'worker process {pid} was not recycled')
+            await worker.call('get_pid')
+            await asyncio.sleep(0.05)
+
+    async def test_server_procpool_recycle_01(self):
+        manager = await self.create_manager(max_worker_requests=3)
+
+        worker = await manager.spawn_worker()
+        await worker.init('get_pid')
+        pid = worker.get_pid()
+        await worker.call('get_pid')
+        self.assertEqual(manager._stats_recycled, 0)
+        await worker.call('get_pid')
+
+        await self.wait_for_recycle(worker, pid)
+        self.assertEqual(manager._stats_recycled, 1)
+        self.assertEqual(await worker.call('get_pid'), worker.get_pid())
+        await self.wait_for_exit(pid)
+
+    async def test_server_procpool_recycle_02(self):
+        interval = pool.WORKER_MEMORY_CHECK_INTERVAL
+        pool.WORKER_MEMORY_CHECK_INTERVAL = 0.05
+        self.addCleanup(
+            setattr, pool, 'WORKER_MEMORY_CHECK_INTERVAL', interval)
+
+        manager = await self.create_manager(max_worker_rss=1)
+
+        worker = await manager.spawn_worker()
+        pid = worker.get_pid()
+        self.assertGreater(pool._get_private_memory(pid), 1)
+        await worker.call('get_pid')
+
+        await self.wait_for_recycle(worker, pid)
+        self.assertEqual(await worker.call('get_pid'), worker.get_pid())
+        await self.wait_for_exit(pid)
+
+    async def test_server_procpool_recycle_03(self):
+        # A worker that can't be recycled right now is asked again
+        # later, not after every call.
+        interval = pool.WORKER_RECYCLE_RETRY_INTERVAL
+        pool.WORKER_RECYCLE_RETRY_INTERVAL = 0.05
+        self.addCleanup(
+            setattr, pool, 'WORKER_RECYCLE_RETRY_INTERVAL', interval)
+
+        manager = await self.create_manager(max_worker_requests=1)
+
+        worker = await manager.spawn_worker()
+        pid = worker.get_pid()
+        await worker.call('set_busy', True)
+        while worker._replacement is None:
+            await asyncio.sleep(0.05)
+
+        for _ in range(3):
+            self.assertEqual(await worker.call('get_pid'), pid)
+        self.assertEqual(manager._stats_recycled, 0)
+
+        await worker.call('set_busy', False)
+        await self.wait_for_recycle(worker, pid)
+        self.assertEqual(manager._stats_recycled, 1)
+        await self.wait_for_exit(pid)